@@ -0,0 +1,67 @@
+import random
+import time
+from datetime import date, timedelta
+
+import click
+
+from work_cal.calendar.autoplan import AutoPlanner, PlanTargets
+from work_cal.calendar.labour_rules import intervals_for_shift_map
+from work_cal.config import ShiftType, WorkCalConfig
+
+TEMPLATES = [
+    ShiftType(name="Morning", start_hour="06:00", end_hour="14:00"),
+    ShiftType(name="Day", start_hour="08:30", end_hour="16:30", allowed_week_days=[0, 1, 2, 3, 4]),
+    ShiftType(name="Evening", start_hour="14:00", end_hour="22:00"),
+    ShiftType(name="Night", start_hour="19:00", default_duration_hours=12),
+    ShiftType(name="Half", start_hour="09:00", end_hour="13:00", allowed_week_days=[5, 6]),
+]
+
+
+def worker_targets(rng: random.Random, start: date, end: date) -> PlanTargets:
+    # every worker gets an own monthly target, two weeks of holiday and a few fixed night shifts
+    span = (end - start).days
+    holiday = start + timedelta(days=rng.randrange(span - 14))
+    days_off = frozenset(holiday + timedelta(days=offset) for offset in range(14))
+    fixed = {start + timedelta(days=rng.randrange(span)): "Night" for _ in range(4)}
+    fixed = {day: template for day, template in fixed.items() if day not in days_off}
+    return PlanTargets(rng.choice((120.0, 140.0, 160.0, 168.0)), days_off, fixed)
+
+
+@click.command()
+@click.option("--workers", type=int, default=50, show_default=True)
+@click.option("--year", type=int, default=2026, show_default=True)
+@click.option("--budget", type=float, default=5.0, show_default=True, help="Seconds per worker")
+@click.option("--seed", type=int, default=0, show_default=True)
+def main(workers: int, year: int, budget: float, seed: int) -> None:
+    config = WorkCalConfig(shift_types=TEMPLATES)
+    start, end = date(year, 1, 1), date(year, 12, 31)
+    rng = random.Random(seed)
+    team = [worker_targets(rng, start, end) for _ in range(workers)]
+
+    started = time.perf_counter()
+    results = []
+    for index, targets in enumerate(team):
+        planner = AutoPlanner(config.shift_types, config.rules, start, end, targets)
+        results.append(planner.solve(seed=seed + index, budget_seconds=budget))
+    elapsed = time.perf_counter() - started
+
+    misses = [
+        abs(result.hours_by_month[month] - result.target_hours_by_month[month])
+        for result in results
+        for month in result.hours_by_month
+    ]
+    violations = sum(len(intervals_for_shift_map(result.shift_map, config).check(config.rules)) for result in results)
+    on_target = sum(miss == 0 for miss in misses)
+
+    print(
+        f"{workers} workers x {year}: solved in {elapsed * 1000:.0f} ms "
+        f"({elapsed / workers * 1000:.1f} ms per worker, slowest {max(r.seconds for r in results) * 1000:.1f} ms)",
+    )
+    print(
+        f"months on target {on_target}/{len(misses)}, mean miss {sum(misses) / len(misses):.2f} h, "
+        f"worst miss {max(misses):.1f} h, labour rule violations {violations}",
+    )
+
+
+if __name__ == "__main__":
+    main()
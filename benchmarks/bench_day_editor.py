@@ -0,0 +1,100 @@
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import click
+from textual.pilot import Pilot
+from textual.screen import Screen
+
+from benchmarks.synthetic import percentile, seed_planner_session
+from work_cal.tui.shift_planner import ShiftPlannerApp
+
+
+class FrameTimer:
+
+    """Adds up the time the screen spends on layout and painting, in what its update timer calls on every frame."""
+
+    def __init__(self, screen: Screen) -> None:
+        self.seconds = 0.0
+        self._update = screen._on_timer_update  # noqa: SLF001
+        screen._update_timer._callback = self._timed_update  # noqa: SLF001  # the timer holds on to the bound method
+
+    def _timed_update(self) -> None:
+        started = time.perf_counter()
+        self._update()
+        self.seconds += time.perf_counter() - started
+
+
+async def timed_switch(app: ShiftPlannerApp, pilot: Pilot, frames: FrameTimer, day: date) -> tuple[float, float]:
+    """Seconds to load ``day`` into the editor and to lay out and paint the frames up to the app going idle.
+
+    Key dispatch, the wait for the next frame tick and the test harness' polling for idle are left out, they cost
+    the same whatever the editor does.
+    """  # noqa: DOC201
+    started = time.perf_counter()
+    app.select_day(day)
+    load = time.perf_counter() - started
+    frames.seconds = 0.0
+    await pilot.pause()
+    return load, frames.seconds
+
+
+async def run(days: int) -> tuple[list[float], list[float]]:
+    """Seconds spent loading each day into the editor and rendering it, going through the days in order."""  # noqa: DOC201
+    start = date(2026, 1, 1)
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+    loads: list[float] = []
+    renders: list[float] = []
+    with tempfile.TemporaryDirectory() as dump_location:
+        # every other day has a shift, so switching alternates between filling and emptying the inputs
+        seed_planner_session(dates, Path(dump_location))
+
+        app = ShiftPlannerApp(dates)
+        async with app.run_test(size=(120, 50)) as pilot:
+            await pilot.pause()
+            frames = FrameTimer(app.screen)
+            for day in dates[1:]:
+                load, render = await timed_switch(app, pilot, frames, day)
+                loads.append(load)
+                renders.append(render)
+    return loads, renders
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f} ms"
+
+
+@click.command()
+@click.option("--days", type=int, default=62, show_default=True)
+@click.option(
+    "--budget-ms",
+    type=float,
+    default=33.0,
+    show_default=True,
+    help="Allowed median of loading a day and rendering it, two frames at 60 Hz",
+)
+@click.option(
+    "--p95-budget-ms",
+    type=float,
+    default=66.0,
+    show_default=True,
+    help="Allowed p95, which covers the switches to a weekday with other templates and so a layout",
+)
+def main(days: int, budget_ms: float, p95_budget_ms: float) -> None:
+    loads, renders = asyncio.run(run(days))
+    switches = [load + render for load, render in zip(loads, renders, strict=True)]
+    median, p95 = statistics.median(switches), percentile(switches, 0.95)
+    print(f"{len(switches)} day switches")
+    print(f"  load:   median {ms(statistics.median(loads))}, p95 {ms(percentile(loads, 0.95))}")
+    print(f"  render: median {ms(statistics.median(renders))}, p95 {ms(percentile(renders, 0.95))}")
+    print(f"  total:  median {ms(median)} (budget {budget_ms:.1f} ms), p95 {ms(p95)} (budget {p95_budget_ms:.1f} ms)")
+    if median * 1000 > budget_ms or p95 * 1000 > p95_budget_ms:
+        print("over budget")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
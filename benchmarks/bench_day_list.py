@@ -0,0 +1,121 @@
+import asyncio
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+import click
+from textual.app import App, ComposeResult
+
+from benchmarks.synthetic import make_shift_map
+from work_cal.config import WorkCalConfig
+from work_cal.models import Shift
+from work_cal.tui.day_list import DayList, DayListItem
+from work_cal.tui.state import PlannerState
+
+OTHER = Shift(name="Other", start_hour=7, start_minute=0, end_hour=15, end_minute=0, from_template="Other")
+
+
+class DayListHost(App):
+    def compose(self) -> ComposeResult:  # noqa: PLR6301
+        yield DayList()
+
+
+def naive_label(state: PlannerState, day: date) -> str:
+    shift = state.get_day_state(day).shift
+    return day.strftime("%a %m/%d") + (f" - {shift.name}" if shift is not None else "")
+
+
+def naive_refresh(day_list: DayList, state: PlannerState, days: set[date]) -> None:
+    # the old way: walk every row and rebuild the label of the ones asked for
+    for item in day_list.children:
+        if not hasattr(item, "day") or item.day not in days:  # pyrefly: ignore
+            continue
+
+        item.children[0].update(naive_label(state, item.day))  # pyrefly: ignore
+
+
+def naive_populate(day_list: DayList, state: PlannerState) -> None:
+    day_list.clear()
+    for day in state.dates:
+        day_list.append(DayListItem(naive_label(state, day), day))
+
+
+class Refresh(NamedTuple):
+    populate: Callable[[DayList, PlannerState], object]
+    days: Callable[[DayList, PlannerState, list[date]], object]
+
+
+REFRESHES = {
+    "naive": Refresh(naive_populate, lambda day_list, state, days: naive_refresh(day_list, state, set(days))),
+    "indexed": Refresh(DayList.set_planner_state, lambda day_list, _state, days: day_list.refresh_days(days)),
+}
+
+
+async def exercise(state: PlannerState, refresh: Refresh, edited: list[date], month: list[date]) -> dict[str, float]:
+    """Time one way of keeping the rows up to date, each step including the repaint."""  # noqa: DOC201
+    timings = dict.fromkeys(("populate", "single", "fill", "all"), 0.0)
+    shift_map = {day: state.get_day_state(day).shift for day in state.dates}
+
+    app = DayListHost()
+    async with app.run_test(size=(120, 50)) as pilot:
+        day_list = app.query_one(DayList)
+        started = time.perf_counter()
+        refresh.populate(day_list, state)
+        await pilot.pause()
+        timings["populate"] = time.perf_counter() - started
+
+        for day in edited:
+            state.set_shift(day, OTHER)
+            started = time.perf_counter()
+            refresh.days(day_list, state, [day])
+            timings["single"] += time.perf_counter() - started
+
+        state.set_shifts(dict.fromkeys(month, OTHER))
+        started = time.perf_counter()
+        refresh.days(day_list, state, month)
+        await pilot.pause()
+        timings["fill"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        refresh.days(day_list, state, state.dates)  # e.g. after a config reload, when only a few rows really change
+        await pilot.pause()
+        timings["all"] = time.perf_counter() - started
+
+    state.set_shifts(shift_map)
+    return timings
+
+
+async def run(days: int, edits: int, seed: int) -> None:
+    start = date(2026, 1, 1)
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+    edited = random.Random(seed).sample(dates, edits)
+    month = [day for day in dates if (day.year, day.month) == (dates[days // 2].year, dates[days // 2].month)]
+
+    with tempfile.TemporaryDirectory() as dump_location:
+        state = PlannerState(WorkCalConfig(month_dump_location=Path(dump_location)), dates)
+        state.set_shifts(dict(make_shift_map(days, start)))  # every month loaded, as after scrolling through them all
+        results = {label: await exercise(state, refresh, edited, month) for label, refresh in REFRESHES.items()}
+
+    naive, indexed = results["naive"], results["indexed"]
+    print(f"{days} days, {edits} single-day edits, a {len(month)} day fill, then a full refresh")
+    for step in ("populate", "single", "fill", "all"):
+        print(
+            f"{step:>8}: naive {naive[step] * 1000:8.1f} ms, indexed {indexed[step] * 1000:8.1f} ms "
+            f"({naive[step] / indexed[step]:.1f}x)",
+        )
+
+
+@click.command()
+@click.option("--days", type=int, default=1096, show_default=True)
+@click.option("--edits", type=int, default=100, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+def main(days: int, edits: int, seed: int) -> None:
+    asyncio.run(run(days, edits, seed))
+
+
+if __name__ == "__main__":
+    main()
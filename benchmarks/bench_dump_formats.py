@@ -0,0 +1,56 @@
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+
+import click
+
+from benchmarks.synthetic import make_shift_state_dump
+from work_cal.storage.binary_dump import BinaryDump
+from work_cal.storage.dump_files import load_dump, save_dump
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@click.command()
+@click.option("--shifts", type=int, default=20_000, show_default=True)
+@click.option("--repeat", type=int, default=5, show_default=True)
+def main(shifts: int, repeat: int) -> None:
+    shift_state = make_shift_state_dump(shifts)
+    middle_day = min(shift_state.shift_map) + timedelta(days=shifts // 2)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = Path(tmp_dir) / "shift_dump.json"
+        binary_path = Path(tmp_dir) / "shift_dump.wcd"
+        save_dump(json_path, shift_state)
+        save_dump(binary_path, shift_state)
+        if load_dump(binary_path) != shift_state:
+            msg = "binary dump does not round trip"
+            raise RuntimeError(msg)
+
+        def json_day() -> None:
+            load_dump(json_path).shift_map.get(middle_day)
+
+        def binary_day() -> None:
+            with BinaryDump(binary_path) as binary_dump:
+                binary_dump.get(middle_day)
+
+        for label, path, day_func in (("json", json_path, json_day), ("binary", binary_path, binary_day)):
+            full = _best_of(repeat, lambda path=path: load_dump(path))
+            one_day = _best_of(repeat, day_func)
+            print(
+                f"{label:>7}: {path.stat().st_size / 1024:9.1f} KiB, full load {full * 1000:8.2f} ms, "
+                f"one day {one_day * 1000:8.3f} ms",
+            )
+
+
+if __name__ == "__main__":
+    main()
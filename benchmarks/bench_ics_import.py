@@ -0,0 +1,57 @@
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+from ics import Calendar
+
+from benchmarks.synthetic import make_shift_state_dump
+from work_cal.calendar.ics_reader import ImportStats, read_shifts
+from work_cal.calendar.ics_writer import write_calendar
+from work_cal.config import get_config
+
+
+def _stream_import(path: Path) -> int:
+    config = get_config()
+    stats = ImportStats()
+    with path.open(encoding="utf-8") as stream:
+        return sum(1 for _ in read_shifts(stream, config.timezone, config.shift_types, stats))
+
+
+def _ics_import(path: Path) -> int:
+    return len(Calendar(path.read_text("utf-8")).events)
+
+
+@click.command()
+@click.option("--events", type=int, default=50_000, show_default=True)
+@click.option("--compare-ics", is_flag=True, help="Also parse the file with ics.Calendar (slow)")
+def main(events: int, compare_ics: bool) -> None:  # noqa: FBT001
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "bench.ics"
+        with path.open("w", encoding="utf-8", newline="") as stream:
+            write_calendar(make_shift_state_dump(events), stream)
+        size_mib = path.stat().st_size / 1024 / 1024
+
+        runs = [("stream", _stream_import)]
+        if compare_ics:
+            runs.append(("ics", _ics_import))
+
+        for label, func in runs:
+            started = time.perf_counter()
+            count = func(path)
+            elapsed = time.perf_counter() - started
+
+            tracemalloc.start()
+            func(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"{label:>8}: {count} events from {size_mib:.1f} MiB in {elapsed * 1000:9.1f} ms "
+                f"({count / elapsed:,.0f} events/s), peak {peak / 1024 / 1024:.2f} MiB",
+            )
+
+
+if __name__ == "__main__":
+    main()
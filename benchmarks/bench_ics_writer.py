@@ -0,0 +1,47 @@
+import io
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import click
+
+from benchmarks.synthetic import make_shift_state_dump
+from work_cal.calendar.ics_writer import write_calendar
+from work_cal.calendar.shift_parsing import shift_state_dump_to_calendar
+from work_cal.models import ShiftStateDump
+
+
+def _ics_path(shift_state: ShiftStateDump) -> None:
+    sink = io.StringIO()
+    sink.write(shift_state_dump_to_calendar(shift_state).serialize())
+
+
+def _stream_path(shift_state: ShiftStateDump) -> None:
+    write_calendar(shift_state, io.StringIO())
+
+
+def _measure(func: Callable[[ShiftStateDump], None], shift_state: ShiftStateDump) -> tuple[float, int]:
+    # timing and memory are measured in separate runs, tracemalloc slows allocations down a lot
+    started = time.perf_counter()
+    func(shift_state)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func(shift_state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+@click.command()
+@click.option("--shifts", type=int, default=12_000, show_default=True)
+def main(shifts: int) -> None:
+    shift_state = make_shift_state_dump(shifts)
+
+    for label, func in (("ics", _ics_path), ("stream", _stream_path)):
+        elapsed, peak = _measure(func, shift_state)
+        print(f"{label:>8}: {elapsed * 1000:9.1f} ms  peak {peak / 1024 / 1024:7.2f} MiB  ({shifts} shifts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from functools import partial
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+import click
+from textual import events
+from textual.pilot import Pilot
+
+from benchmarks.synthetic import percentile, seed_planner_session
+from work_cal.base import DEFAULT_AUTOSAVE_DELAY_SECONDS
+from work_cal.tui.day_editor import DayEditor
+from work_cal.tui.day_list import DayList
+from work_cal.tui.shift_planner import ShiftPlannerApp
+
+SCHEMA_VERSION = 2
+SIZES = {"month": 31, "year": 365, "multi-year": 1096}
+# off: every edit writes its months and fsyncs the journal; on: edits are journaled and a worker writes the months
+AUTOSAVE_DELAYS = {"off": 0, "on": DEFAULT_AUTOSAVE_DELAY_SECONDS}
+START = date(2026, 1, 1)
+PASTE_DAYS = 7  # the yanked day and the six after it
+INTERACTIONS = ("mount", "idle", "navigate", "select", "template", "save", "paste")
+UNTIMED_KEY = "z"  # bound to nothing, the floor every interaction starts from
+WARMUP_ROUNDS = 1  # not counted, the first toast, save and paste set up widgets and styles that are reused after
+SETTLE_POLL_SECONDS = 0.001
+SETTLED_CHECKS = 20  # in a row, longer than a frame, so a frame that is about to be scheduled is not missed
+
+type Samples = dict[str, list[float]]
+type Results = dict[str, Any]
+
+
+def is_settled(app: ShiftPlannerApp) -> bool:
+    screen = app.screen
+    if screen._update_timer._active.is_set():  # noqa: SLF001  # a frame is due
+        return False
+    return all(pump._message_queue.empty() for pump in (app, *screen.walk_children(with_self=True)))  # noqa: SLF001
+
+
+async def settle(app: ShiftPlannerApp) -> float:
+    """CPU seconds the app spends until every message is handled and the frame painted, this wait's checks left out.
+
+    The pilot's own waits post a message to every widget and poll for idle, which on a multi-year list costs more
+    than most interactions. With the autosave on, the CPU time of a save running meanwhile in its worker thread is
+    counted too, as it competes with the event loop for the interpreter.
+    """  # noqa: DOC201
+    busy = 0.0
+    settled_checks = 0
+    while settled_checks < SETTLED_CHECKS:
+        started = time.process_time()
+        await asyncio.sleep(SETTLE_POLL_SECONDS)
+        busy += time.process_time() - started
+        settled_checks = settled_checks + 1 if is_settled(app) else 0
+    return busy
+
+
+async def timed(samples: list[float], app: ShiftPlannerApp, action: Callable[[], object]) -> None:
+    started = time.process_time()
+    action()
+    samples.append(time.process_time() - started + await settle(app))
+
+
+def press(app: ShiftPlannerApp, key: str) -> Callable[[], object]:
+    return partial(app.post_message, events.Key(key, key if len(key) == 1 else None))
+
+
+def apply_template(app: ShiftPlannerApp) -> None:
+    state = app.planner_state
+    template = next(value for _, value in state.template_index.options_for(state.current_day) if value is not None)
+    app.query_one(DayEditor).template_select.value = template
+
+
+async def script_round(app: ShiftPlannerApp, pilot: Pilot, day_list: DayList, samples: Samples) -> None:
+    """Move to the next day, open it, apply a template, save it and paste it over the week from there."""
+    await timed(samples["idle"], app, press(app, UNTIMED_KEY))
+    await timed(samples["navigate"], app, press(app, "down"))
+    await timed(samples["select"], app, press(app, "enter"))
+    await timed(samples["template"], app, partial(apply_template, app))
+    app.query_one("#save-shift").focus()
+    await pilot.pause()
+    await timed(samples["save"], app, press(app, "enter"))
+
+    day_list.focus()
+    await pilot.press("y", "v", *["shift+down"] * (PASTE_DAYS - 1))
+    await timed(samples["paste"], app, press(app, "p"))
+    await pilot.press("escape")  # lets go of the yanked day
+    app.clear_notifications()
+
+
+async def drive(
+    dates: list[date],
+    rounds: int,
+    autosave_delay_seconds: float,
+    *,
+    trace_memory: bool = False,
+) -> tuple[Samples, dict[str, float]]:
+    """Seconds per interaction, and with ``trace_memory`` the MiB allocated once mounted and at the peak."""  # noqa: DOC201
+    samples: Samples = {interaction: [] for interaction in INTERACTIONS}
+    memory: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as dump_location:
+        # the shifts already there are spread over per-month dumps the planner loads as they come into view
+        seed_planner_session(dates, Path(dump_location), autosave_delay_seconds)
+
+        if trace_memory:
+            tracemalloc.start()
+        started = time.process_time()
+        app = ShiftPlannerApp(dates)
+        async with app.run_test(size=(120, 50)) as pilot:
+            samples["mount"].append(time.process_time() - started + await settle(app))
+            if trace_memory:
+                memory["mounted_mib"] = round(tracemalloc.get_traced_memory()[0] / 2**20, 3)
+
+            day_list = app.query_one(DayList)
+            day_list.focus()
+            for round_index in range(-WARMUP_ROUNDS, rounds):
+                # from the middle of the session on, a week further every round and back to the start at the end
+                day_list.index = (len(dates) // 2 + round_index * PASTE_DAYS) % (len(dates) - PASTE_DAYS - 1)
+                await pilot.pause()
+                counted = samples if round_index >= 0 else {interaction: [] for interaction in INTERACTIONS}
+                await script_round(app, pilot, day_list, counted)
+
+        if trace_memory:
+            memory["peak_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+            tracemalloc.stop()
+    return samples, memory
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    milliseconds = [sample * 1000 for sample in samples]
+    return {
+        "count": len(milliseconds),
+        "p50_ms": round(statistics.median(milliseconds), 3),
+        "p95_ms": round(percentile(milliseconds, 0.95), 3),
+        "max_ms": round(max(milliseconds), 3),
+    }
+
+
+def run_size(days: int, rounds: int, memory_rounds: int, autosave: str) -> Results:
+    dates = [START + timedelta(days=offset) for offset in range(days)]
+    delay = AUTOSAVE_DELAYS[autosave]
+    samples, _ = asyncio.run(drive(dates, rounds, delay))
+    _, memory = asyncio.run(drive(dates, memory_rounds, delay, trace_memory=True))  # tracing slows everything down
+    interactions = {interaction: summarize(samples[interaction]) for interaction in INTERACTIONS}
+    return {"days": days, "autosave": autosave, "memory": memory, "interactions": interactions}
+
+
+def run_key(size: str, autosave: str) -> str:
+    return f"{size}, autosave {autosave}"
+
+
+def find_regressions(results: Results, baseline: Results, tolerance: float, noise_ms: float) -> list[str]:
+    """Measurements over the baseline by more than ``tolerance`` (relative, latencies also by ``noise_ms``)."""  # noqa: DOC201
+    regressions: list[str] = []
+    for run, result in results["runs"].items():
+        before = baseline["runs"].get(run)
+        if before is None:
+            continue
+
+        for interaction, stats in result["interactions"].items():
+            old = before["interactions"].get(interaction)
+            if old is None:
+                continue
+
+            for key in ("p50_ms", "p95_ms"):
+                limit = old[key] * (1 + tolerance) + noise_ms
+                if stats[key] > limit:
+                    regressions.append(f"{run} {interaction} {key}: {stats[key]:.1f} > {limit:.1f} ({old[key]:.1f})")
+
+        for key, mib in result["memory"].items():
+            old_mib = before["memory"].get(key)
+            if old_mib is not None and mib > old_mib * (1 + tolerance):
+                regressions.append(f"{run} {key}: {mib:.1f} > {old_mib * (1 + tolerance):.1f} ({old_mib:.1f})")
+    return regressions
+
+
+def print_results(results: Results) -> None:
+    for run, result in results["runs"].items():
+        memory = result["memory"]
+        print(f"{run} ({result['days']} days): {memory['mounted_mib']:.1f} MiB mounted, {memory['peak_mib']:.1f} peak")
+        for interaction, stats in result["interactions"].items():
+            print(
+                f"  {interaction:>8}: p50 {stats['p50_ms']:8.1f} ms, p95 {stats['p95_ms']:8.1f} ms, "
+                f"max {stats['max_ms']:8.1f} ms ({stats['count']}x)",
+            )
+
+
+@click.command()
+@click.option("--size", "sizes", type=click.Choice(list(SIZES)), multiple=True, help="Default: all of them")
+@click.option(
+    "--autosave",
+    "autosaves",
+    type=click.Choice(list(AUTOSAVE_DELAYS)),
+    multiple=True,
+    help="Run with the autosave off and/or at its default delay. Default: both",
+)
+@click.option("--rounds", type=int, default=20, show_default=True, help="Times the interaction script runs")
+@click.option("--memory-rounds", type=int, default=3, show_default=True, help="Rounds of the memory traced run")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), help="Write the results here as JSON")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path), help="Earlier --output")
+@click.option("--tolerance", type=float, default=0.25, show_default=True, help="Allowed slowdown over the baseline")
+@click.option("--noise-ms", type=float, default=5.0, show_default=True, help="Latency jitter allowed on top")
+def main(  # noqa: PLR0913, PLR0917
+    sizes: tuple[str, ...],
+    autosaves: tuple[str, ...],
+    rounds: int,
+    memory_rounds: int,
+    output: Path | None,
+    baseline: Path | None,
+    tolerance: float,
+    noise_ms: float,
+) -> None:
+    results: Results = {
+        "schema_version": SCHEMA_VERSION,
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "textual": version("textual"),
+        "machine": platform.machine(),
+        "rounds": rounds,
+        "runs": {
+            run_key(size, autosave): run_size(SIZES[size], rounds, memory_rounds, autosave)
+            for size in sizes or SIZES
+            for autosave in autosaves or AUTOSAVE_DELAYS
+        },
+    }
+    print_results(results)
+    if output is not None:
+        output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if baseline is None:
+        return
+
+    previous = json.loads(baseline.read_text(encoding="utf-8"))
+    if previous.get("schema_version") != SCHEMA_VERSION:
+        msg = f"{baseline} has schema version {previous.get('schema_version')}, expected {SCHEMA_VERSION}"
+        raise click.BadParameter(msg, param_hint="--baseline")
+
+    regressions = find_regressions(results, previous, tolerance, noise_ms)
+    for regression in regressions:
+        print(f"regression: {regression}")
+    if regressions:
+        raise SystemExit(1)
+    print(f"no regressions against {baseline}")
+
+
+if __name__ == "__main__":
+    main()
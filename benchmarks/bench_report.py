@@ -0,0 +1,85 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import click
+
+from benchmarks.synthetic import make_shift_map
+from work_cal.calendar.report import ShiftColumns
+from work_cal.models import Shift
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+type Totals = dict[tuple[str, str], tuple[int, int, int, int]]
+
+
+def naive_monthly_totals(shift_maps: dict[str, dict[date, Shift]]) -> Totals:
+    # the per-shift way: datetimes for every shift, intersected with the night windows around it
+    totals: dict[tuple[str, str], list[int]] = {}
+    for worker, shift_map in shift_maps.items():
+        for day, shift in shift_map.items():
+            midnight = datetime(day.year, day.month, day.day)  # noqa: DTZ001
+            start = midnight + timedelta(hours=shift.start_hour, minutes=shift.start_minute)
+            end = midnight + timedelta(hours=shift.end_hour, minutes=shift.end_minute)
+            if end < start:
+                end += timedelta(days=1)
+            minutes = int((end - start).total_seconds()) // 60
+            night = 0
+            for offset in range(3):
+                night_end = midnight + timedelta(days=offset, hours=6)
+                night_start = night_end - timedelta(hours=8)
+                overlap = min(end, night_end) - max(start, night_start)
+                night += max(0, int(overlap.total_seconds()) // 60)
+            total = totals.setdefault((worker, day.strftime("%Y-%m")), [0, 0, 0, 0])
+            total[0] += 1
+            total[1] += minutes
+            total[2] += night
+            total[3] += minutes if day.weekday() >= 5 else 0  # noqa: PLR2004
+    return {key: (total[0], total[1], total[2], total[3]) for key, total in totals.items()}
+
+
+def columnar_monthly_totals(shift_maps: dict[str, dict[date, Shift]]) -> Totals:
+    columns = ShiftColumns()
+    for worker, shift_map in shift_maps.items():
+        columns.add_shift_map(worker, shift_map)
+    return {
+        (row.worker, row.key): (row.shifts, row.minutes, row.night_minutes, row.weekend_minutes)
+        for row in columns.aggregate("month")
+    }
+
+
+@click.command()
+@click.option("--workers", type=int, default=20, show_default=True)
+@click.option("--years", type=int, default=5, show_default=True)
+@click.option("--repeat", type=int, default=3, show_default=True)
+def main(workers: int, years: int, repeat: int) -> None:
+    shift_maps = {f"worker {index}": make_shift_map(years * 365) for index in range(workers)}
+    shift_count = sum(len(shift_map) for shift_map in shift_maps.values())
+
+    if naive_monthly_totals(shift_maps) != columnar_monthly_totals(shift_maps):
+        msg = "columnar totals differ from the naive ones"
+        raise RuntimeError(msg)
+
+    timings: dict[str, float] = {}
+    totals: tuple[tuple[str, Callable[[dict[str, dict[date, Shift]]], Totals]], ...] = (
+        ("naive", naive_monthly_totals),
+        ("columnar", columnar_monthly_totals),
+    )
+    for label, compute in totals:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            compute(shift_maps)
+            best = min(best, time.perf_counter() - started)
+        timings[label] = best
+
+    print(
+        f"{workers} workers x {years} years ({shift_count} shifts), monthly totals: "
+        f"naive {timings['naive'] * 1000:8.1f} ms, columnar {timings['columnar'] * 1000:8.1f} ms "
+        f"({timings['naive'] / timings['columnar']:.1f}x)",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import time
+from datetime import UTC, date, datetime
+from datetime import time as dt_time
+
+import click
+
+from benchmarks.synthetic import make_shift_map
+from work_cal.calendar.ics_writer import escape_text, event_uid, iter_event_lines, resolver_for_config
+from work_cal.calendar.timezones import resolve_shift_map
+from work_cal.config import get_config
+from work_cal.models import Shift
+
+
+def _per_shift(shift_map: dict[date, Shift]) -> None:
+    # what shift_parsing used to do: a config lookup and a zoneinfo conversion for every boundary
+    for day, shift in shift_map.items():
+        for hour, minute in ((shift.start_hour, shift.start_minute), (shift.end_hour, shift.end_minute)):
+            tzinfo = get_config().timezone
+            datetime.combine(day, dt_time(hour, minute, tzinfo=tzinfo)).astimezone(UTC)
+
+
+def _batched(shift_map: dict[date, Shift]) -> None:
+    config = get_config()
+    resolve_shift_map(shift_map, config.timezone, config.dst_gap_policy, config.dst_fold_policy)
+
+
+def _per_shift_export(shift_map: dict[date, Shift]) -> None:
+    # the VEVENT rendering of the streaming writer before shift boundaries were resolved in batch
+    for day, shift in shift_map.items():
+        times: list[str] = []
+        for hour, minute in ((shift.end_hour, shift.end_minute), (shift.start_hour, shift.start_minute)):
+            tzinfo = get_config().timezone
+            local = datetime.combine(day, dt_time(hour, minute, tzinfo=tzinfo))
+            times.append(local.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ"))
+        lines = [
+            "BEGIN:VEVENT",
+            f"DTEND:{times[0]}",
+            f"DTSTART:{times[1]}",
+            f"SUMMARY:{escape_text(shift.name)}",
+            f"UID:{event_uid(get_config().worker_name, day)}",
+            "END:VEVENT",
+        ]
+        del lines
+
+
+def _batched_export(shift_map: dict[date, Shift]) -> None:
+    config = get_config()
+    resolver = resolver_for_config(shift_map, config)
+    if resolver is None:
+        return
+    for day, shift in shift_map.items():
+        lines = list(iter_event_lines(resolver.resolve_shift(day, shift), shift, event_uid(config.worker_name, day)))
+        del lines
+
+
+@click.command()
+@click.option("--shifts", type=int, default=3650, show_default=True, help="Consecutive days with a shift")
+@click.option("--repeat", type=int, default=5, show_default=True)
+def main(shifts: int, repeat: int) -> None:
+    shift_map = make_shift_map(shifts)
+    get_config()
+
+    for stage, baseline, batched in (
+        ("conversion", _per_shift, _batched),
+        ("export", _per_shift_export, _batched_export),
+    ):
+        results: dict[str, float] = {}
+        for label, func in (("per-shift", baseline), ("batched", batched)):
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func(shift_map)
+                best = min(best, time.perf_counter() - started)
+            results[label] = best
+            print(f"{stage:>10} {label:>10}: {best * 1000:8.1f} ms  ({shifts} shifts, best of {repeat})")
+
+        print(f"{stage:>10} speedup: {results['per-shift'] / results['batched']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
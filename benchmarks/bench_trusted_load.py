@@ -0,0 +1,45 @@
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from benchmarks.synthetic import make_shift_state_dump
+from work_cal.models import ShiftStateDump
+from work_cal.storage.dump_files import content_hash, load_dump, save_dump
+
+
+@click.command()
+@click.option("--years", type=int, multiple=True, default=(1, 10, 50), show_default=True)
+@click.option("--repeat", type=int, default=5, show_default=True)
+def main(years: tuple[int, ...], repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for year_count in years:
+            path = Path(tmp_dir) / f"shift_dump_{year_count}.json"
+            save_dump(path, make_shift_state_dump(year_count * 365))
+            trusted_hash = content_hash(path.read_bytes())
+
+            if load_dump(path, trusted_hash) != load_dump(path):
+                msg = "trusted load differs from the validated one"
+                raise RuntimeError(msg)
+
+            timings: dict[str, float] = {}
+            for label, load in (
+                ("validated", lambda path=path: ShiftStateDump.model_validate_json(path.read_bytes())),
+                ("trusted", lambda path=path, trusted_hash=trusted_hash: load_dump(path, trusted_hash)),
+            ):
+                best = float("inf")
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    load()
+                    best = min(best, time.perf_counter() - started)
+                timings[label] = best
+
+            print(
+                f"{year_count:>3} years ({year_count * 365} shifts): validated {timings['validated'] * 1000:8.2f} ms, "
+                f"trusted {timings['trusted'] * 1000:8.2f} ms ({timings['validated'] / timings['trusted']:.1f}x)",
+            )
+
+
+if __name__ == "__main__":
+    main()
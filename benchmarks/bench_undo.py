@@ -0,0 +1,90 @@
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import click
+
+from benchmarks.synthetic import make_shift_map
+from work_cal.tui.history import DayEntry, EditHistory
+
+MAX_PASTE_DAYS = 31
+
+
+def make_edits(dates: list[date], edits: int, seed: int) -> list[dict[date, DayEntry]]:
+    """Mostly single-day saves and clears, every tenth edit a paste over a run of up to a month of days."""  # noqa: DOC201
+    rng = random.Random(seed)
+    shifts = [*make_shift_map(8).values(), None]
+    batches: list[dict[date, DayEntry]] = []
+    for edit in range(edits):
+        shift = rng.choice(shifts)
+        entry = (shift, shift.from_template if shift is not None else None)
+        start = rng.randrange(len(dates))
+        length = rng.randint(2, MAX_PASTE_DAYS) if edit % 10 == 0 else 1
+        batches.append(dict.fromkeys(dates[start : start + length], entry))
+    return batches
+
+
+def replay(limit: int, batches: list[dict[date, DayEntry]]) -> tuple[EditHistory, list[float]]:
+    """Seconds each edit took to record, keeping the days' current entries like the planner does."""  # noqa: DOC201
+    history = EditHistory(limit)
+    current: dict[date, DayEntry] = {}
+    record: list[float] = []
+    for batch in batches:
+        before = {day: current.get(day, (None, None)) for day in batch}
+        started = time.perf_counter()
+        history.record(before, batch)
+        record.append(time.perf_counter() - started)
+        current.update(batch)
+    return history, record
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:.3f} ms"
+
+
+@click.command()
+@click.option("--days", type=int, default=1096, show_default=True)
+@click.option("--edits", type=int, default=5000, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+def main(days: int, edits: int, seed: int) -> None:
+    start = date(2026, 1, 1)
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+    batches = make_edits(dates, edits, seed)
+
+    tracemalloc.start()
+    history, record = replay(edits, batches)
+    history_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # against copying every day of the session for every edit, extrapolated from a hundred copies
+    every_day = dict.fromkeys(dates, (None, None))
+    tracemalloc.start()
+    copies = [dict(every_day) for _ in range(100)]
+    full_copy_bytes = tracemalloc.get_traced_memory()[0] * edits // len(copies)
+    tracemalloc.stop()
+
+    undo: list[float] = []
+    while history.can_undo:
+        started = time.perf_counter()
+        history.undo()
+        undo.append(time.perf_counter() - started)
+    redo: list[float] = []
+    while history.can_redo:
+        started = time.perf_counter()
+        history.redo()
+        redo.append(time.perf_counter() - started)
+
+    changed_days = sum(len(batch) for batch in batches)
+    print(f"{days} days, {edits} edits changing {changed_days} days in total")
+    for step, seconds in (("record", record), ("undo", undo), ("redo", redo)):
+        print(f"{step:>8}: median {ms(statistics.median(seconds))}, max {ms(max(seconds))}, total {ms(sum(seconds))}")
+    print(
+        f"  memory: {history_bytes / 2**20:.1f} MiB for the history, "
+        f"about {full_copy_bytes / 2**20:.0f} MiB for a full copy per edit",
+    )
+
+
+if __name__ == "__main__":
+    main()
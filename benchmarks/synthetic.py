@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+from work_cal.config import ConfigSingleton, ShiftType, WorkCalConfig
+from work_cal.models import Shift, ShiftStateDump
+from work_cal.tui.state import PlannerState
+
+SHIFT_PATTERN: list[tuple[str, int, int, int, int]] = [
+    ("Morning", 6, 0, 14, 0),
+    ("Day", 8, 30, 16, 30),
+    ("Evening", 14, 0, 22, 0),
+    ("Long, weekend", 11, 0, 23, 0),
+]
+
+# a template per shift of the pattern, and one only weekends offer so the template options differ between weekdays
+TEMPLATES = [
+    ShiftType(name=name, start_hour=f"{start_hour:02}:{start_minute:02}", end_hour=f"{end_hour:02}:{end_minute:02}")
+    for name, start_hour, start_minute, end_hour, end_minute in SHIFT_PATTERN
+] + [ShiftType(name="Weekend", start_hour="10:00", end_hour="18:00", allowed_week_days=[5, 6])]
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_shift_map(count: int, start: date = date(2000, 1, 1)) -> dict[date, Shift]:
+    shift_map: dict[date, Shift] = {}
+    for offset in range(count):
+        name, start_hour, start_minute, end_hour, end_minute = SHIFT_PATTERN[offset % len(SHIFT_PATTERN)]
+        shift_map[start + timedelta(days=offset)] = Shift(
+            name=name,
+            start_hour=start_hour,
+            start_minute=start_minute,
+            end_hour=end_hour,
+            end_minute=end_minute,
+            from_template=name,
+        )
+    return shift_map
+
+
+def make_shift_state_dump(count: int, start: date = date(2000, 1, 1)) -> ShiftStateDump:
+    return ShiftStateDump(shift_map=make_shift_map(count, start))
+
+
+def seed_planner_session(dates: list[date], dump_location: Path, autosave_delay_seconds: float = 0) -> None:
+    """Configure the templates above, the autosave off by default, and give every other day of ``dates`` a shift.
+
+    The shifts are written as per-month dumps to ``dump_location``, for a planner on ``dates`` to load.
+    """
+    config = WorkCalConfig(
+        shift_types=TEMPLATES,
+        month_dump_location=dump_location,
+        autosave_delay_seconds=autosave_delay_seconds,
+    )
+    ConfigSingleton().set_config(config)
+    shift_map = {day: shift for day, shift in make_shift_map(len(dates), dates[0]).items() if day.toordinal() % 2}
+    PlannerState(config, dates).set_shifts(dict(shift_map))
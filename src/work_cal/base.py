@@ -3,7 +3,13 @@ from zoneinfo import ZoneInfo
 
 DEFAULT_CONFIG_DIR = pathlib.Path.home() / ".config" / "cal_manager"
 DEFAULT_CONFIG_FILENAME: str = "config.toml"
+DEFAULT_CONFIG_CACHE_FILENAME: str = ".config.cache"
 DEFAULT_MONTH_DUMP_LOCATION: pathlib.Path = DEFAULT_CONFIG_DIR / "dumps"
+DEFAULT_SQLITE_PATH: pathlib.Path = DEFAULT_CONFIG_DIR / "shifts.sqlite3"
 DEFAULT_WORKER_NAME: str = "Worker"
 DEFAULT_TIME_ZONE: ZoneInfo = ZoneInfo("Europe/Warsaw")
 DEFAULT_FZF_OPTS: str = "--height=~40%"
+DEFAULT_JOURNAL_COMPACT_EVERY: int = 100
+DEFAULT_AUTOSAVE_DELAY_SECONDS: float = 2.0
+DEFAULT_UNDO_LIMIT: int = 1000
+DEFAULT_CONFIG_POLL_SECONDS: float = 1.0
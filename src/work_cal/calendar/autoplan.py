@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import calendar
+import random
+import time
+from datetime import timedelta
+from itertools import starmap
+from typing import TYPE_CHECKING, NamedTuple
+
+from work_cal.calendar.rotation import shift_from_template
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from work_cal.config import LabourRules, ShiftType
+    from work_cal.models import Shift
+
+type MonthKey = tuple[int, int]
+
+MINUTES_PER_DAY = 24 * 60
+OFF = -1
+# a minute of a broken labour rule costs more than any realistic miss of the hour target
+HARD_PENALTY = 1000
+DEFAULT_ITERATIONS_PER_DAY = 200
+STALL_ITERATIONS_PER_DAY = 30  # give up once this many steps per day brought no improvement
+DEFAULT_BUDGET_SECONDS = 5.0
+
+
+class PlanTargets(NamedTuple):
+    monthly_hours: float
+    days_off: frozenset[date]
+    fixed: dict[date, str]  # day -> shift template name
+
+
+class PlanResult(NamedTuple):
+    shift_map: dict[date, Shift]
+    hours_by_month: dict[MonthKey, float]
+    target_hours_by_month: dict[MonthKey, float]
+    cost: int  # 0 when every month hits its target exactly and no rule is broken
+    iterations: int
+    seconds: float
+
+
+class AutoPlanner:
+
+    """Local search for a shift plan over a range of days.
+
+    A plan gives every day a template or a day off. The cost adds the minutes every month misses its hour target by
+    and heavily weighted minutes of broken labour rules (rest between adjacent days, weekly hours, days in a row).
+    The search starts from an empty plan and keeps random single-day changes that do not raise the cost, tracking
+    all totals incrementally so a change costs a handful of integer operations. Fixed days and days off are never
+    touched. The same seed always gives the same plan unless the time budget ends the search first.
+    """
+
+    def __init__(
+        self,
+        templates: list[ShiftType],
+        rules: LabourRules,
+        start: date,
+        end: date,
+        targets: PlanTargets,
+    ) -> None:
+        self.templates = [
+            template
+            for template in templates
+            if template.start_minute_of_day is not None and template.effective_end_minute_of_day is not None
+        ]
+        template_ids = {template.name: template_id for template_id, template in enumerate(self.templates)}
+        self.shifts = [shift_from_template(template) for template in self.templates]
+        self.starts = [shift.start_hour * 60 + shift.start_minute for shift in self.shifts]
+        self.durations = [
+            (shift.end_hour * 60 + shift.end_minute - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+            for shift, start in zip(self.shifts, self.starts, strict=True)
+        ]
+        self.ends = [start + duration for start, duration in zip(self.starts, self.durations, strict=True)]
+
+        self.min_rest = round(rules.min_rest_hours * 60)
+        self.max_week = round(rules.max_weekly_hours * 60)
+        self.max_run = rules.max_consecutive_days
+
+        self.days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        months = sorted({(day.year, day.month) for day in self.days})
+        weeks = sorted({day.isocalendar()[:2] for day in self.days})
+        month_ids = {month: month_id for month_id, month in enumerate(months)}
+        week_ids = {week: week_id for week_id, week in enumerate(weeks)}
+        self.months = months
+        self.day_month = [month_ids[day.year, day.month] for day in self.days]
+        self.day_week = [week_ids[day.isocalendar()[:2]] for day in self.days]
+
+        # months cut by the range get a share of the target matching their share of days
+        days_in_range = [self.day_month.count(month_id) for month_id in range(len(months))]
+        self.month_targets = [
+            round(targets.monthly_hours * 60 * count / calendar.monthrange(*month)[1])
+            for month, count in zip(months, days_in_range, strict=True)
+        ]
+
+        self.fixed: list[int | None] = [None] * len(self.days)
+        for index, day in enumerate(self.days):
+            if day in targets.days_off:
+                self.fixed[index] = OFF
+            elif day in targets.fixed:
+                if targets.fixed[day] not in template_ids:
+                    msg = f"{day} is fixed to {targets.fixed[day]}, which is not a shift template with start and end"
+                    raise ValueError(msg)
+                self.fixed[index] = template_ids[targets.fixed[day]]
+
+        self.options = [
+            [OFF] + [
+                template_id
+                for template_id, template in enumerate(self.templates)
+                if template.allowed_week_days is None or day.weekday() in template.allowed_week_days
+            ]
+            for day in self.days
+        ]
+        self.plan: list[int] = []  # the search state of the running solve
+        self.month_minutes: list[int] = []
+        self.week_minutes: list[int] = []
+        self.free = [index for index, fixed in enumerate(self.fixed) if fixed is None and len(self.options[index]) > 1]
+
+    def _month_cost(self, month_id: int, minutes: int) -> int:
+        return abs(minutes - self.month_targets[month_id])
+
+    def _week_cost(self, minutes: int) -> int:
+        return HARD_PENALTY * max(0, minutes - self.max_week) if self.max_week else 0
+
+    def _rest_cost(self, first: int, second: int) -> int:
+        # rest between two adjacent days, shifts never reach past the next day so only neighbours can clash
+        if OFF in {first, second} or not self.min_rest:
+            return 0
+        rest = MINUTES_PER_DAY + self.starts[second] - self.ends[first]
+        return HARD_PENALTY * max(0, self.min_rest - rest)
+
+    def _run_cost(self, first: int, last: int) -> int:
+        # days from first to last whose streak of working days is longer than allowed
+        plan = self.plan
+        if not self.max_run:
+            return 0
+        streak = 0
+        index = first - 1
+        while index >= 0 and plan[index] != OFF and streak <= self.max_run:
+            streak += 1
+            index -= 1
+
+        cost = 0
+        for index in range(first, last + 1):
+            streak = streak + 1 if plan[index] != OFF else 0
+            if streak > self.max_run:
+                cost += HARD_PENALTY * 60
+        return cost
+
+    def _total_cost(self) -> int:
+        plan = self.plan
+        cost = sum(starmap(self._month_cost, enumerate(self.month_minutes)))
+        cost += sum(self._week_cost(minutes) for minutes in self.week_minutes)
+        cost += sum(self._rest_cost(plan[index], plan[index + 1]) for index in range(len(plan) - 1))
+        return cost + self._run_cost(0, len(plan) - 1)
+
+    def _change_cost(self, index: int, option: int) -> int:
+        """Cost difference of giving day ``index`` the template ``option``, or a day off."""  # noqa: DOC201
+        plan, month_minutes, week_minutes = self.plan, self.month_minutes, self.week_minutes
+        old = plan[index]
+        minutes = (self.durations[option] if option != OFF else 0) - (self.durations[old] if old != OFF else 0)
+        month_id, week_id = self.day_month[index], self.day_week[index]
+        delta = self._month_cost(month_id, month_minutes[month_id] + minutes)
+        delta -= self._month_cost(month_id, month_minutes[month_id])
+        delta += self._week_cost(week_minutes[week_id] + minutes) - self._week_cost(week_minutes[week_id])
+
+        last = len(plan) - 1
+        if index > 0:
+            delta += self._rest_cost(plan[index - 1], option) - self._rest_cost(plan[index - 1], old)
+        if index < last:
+            delta += self._rest_cost(option, plan[index + 1]) - self._rest_cost(old, plan[index + 1])
+
+        if self.max_run and (old == OFF) != (option == OFF):
+            window_end = min(last, index + self.max_run + 1)
+            before = self._run_cost(index, window_end)
+            plan[index] = option
+            delta += self._run_cost(index, window_end) - before
+            plan[index] = old
+        return delta
+
+    def _apply(self, index: int, option: int) -> None:
+        old = self.plan[index]
+        minutes = (self.durations[option] if option != OFF else 0) - (self.durations[old] if old != OFF else 0)
+        self.month_minutes[self.day_month[index]] += minutes
+        self.week_minutes[self.day_week[index]] += minutes
+        self.plan[index] = option
+
+    def solve(
+        self,
+        seed: int = 0,
+        budget_seconds: float = DEFAULT_BUDGET_SECONDS,
+        max_iterations: int | None = None,
+    ) -> PlanResult:
+        started = time.perf_counter()
+        deadline = started + budget_seconds
+        if max_iterations is None:
+            max_iterations = DEFAULT_ITERATIONS_PER_DAY * len(self.days)
+
+        rng = random.Random(seed)
+        self.plan = [OFF] * len(self.days)
+        self.month_minutes = [0] * len(self.months)
+        self.week_minutes = [0] * (max(self.day_week, default=0) + 1)
+        for index, fixed in enumerate(self.fixed):
+            if fixed is not None:
+                self._apply(index, fixed)
+
+        cost = self._total_cost()
+        iterations = 0
+        last_improvement = 0
+        stall_limit = STALL_ITERATIONS_PER_DAY * len(self.days)
+        while cost and self.free and iterations < max_iterations and iterations - last_improvement < stall_limit:
+            if iterations % 1024 == 0 and time.perf_counter() > deadline:
+                break
+            iterations += 1
+
+            index = rng.choice(self.free)
+            option = rng.choice(self.options[index])
+            if option == self.plan[index]:
+                continue
+
+            delta = self._change_cost(index, option)
+            if delta <= 0:  # sideways moves let the search walk across plateaus
+                self._apply(index, option)
+                cost += delta
+                if delta < 0:
+                    last_improvement = iterations
+
+        return PlanResult(
+            shift_map={
+                day: self.shifts[option] for day, option in zip(self.days, self.plan, strict=True) if option != OFF
+            },
+            hours_by_month={
+                month: minutes / 60 for month, minutes in zip(self.months, self.month_minutes, strict=True)
+            },
+            target_hours_by_month={
+                month: minutes / 60 for month, minutes in zip(self.months, self.month_targets, strict=True)
+            },
+            cost=cost,
+            iterations=iterations,
+            seconds=time.perf_counter() - started,
+        )
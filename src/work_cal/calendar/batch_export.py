@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import calendar
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING
+
+from work_cal.calendar.ics_writer import (
+    ICS_LINE_SEPARATOR,
+    event_uid,
+    iter_calendar_header_lines,
+    iter_calendar_lines,
+    iter_event_lines,
+    resolver_for_config,
+    write_calendar,
+    write_lines,
+)
+from work_cal.calendar.timezones import ONE_DAY, TimezoneResolver
+from work_cal.config import ConfigSingleton, get_config, worker_slug
+from work_cal.models import ShiftStateDump
+from work_cal.storage.catalog import load_cataloged_dump, refresh_catalog
+from work_cal.storage.dump_files import DUMP_GLOBS, load_dump
+from work_cal.storage.sqlite_store import SqliteShiftStore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    from work_cal.config import WorkCalConfig
+    from work_cal.models import Shift
+
+# set once per export process by _init_team_export, shared by every worker that process exports
+_TEAM_EXPORT_RESOLVER: list[TimezoneResolver | None] = [None]
+
+DUMP_FILENAME_REGEX = re.compile(r"^shift_dump_(?P<body>\d{4}(?:_\d{2})+(?:_\d{4}(?:_\d{2})+)*)\.(?:json|wcd)$")
+
+
+@dataclass
+class ExportResult:
+    source: Path
+    target: Path | None
+    shift_count: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+    events: dict[str, list[str]] = field(default_factory=dict)  # lines of each event by UID, for merging
+    duplicates: int = 0  # events left out of a merged calendar, another dump already had them
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def months_from_dump_filename(filename: str) -> set[tuple[int, int]] | None:
+    """Return (year, month) pairs encoded in a dump filename or None if it is not a dump file."""  # noqa: DOC201
+    match = DUMP_FILENAME_REGEX.match(filename)
+    if match is None:
+        return None
+
+    months: set[tuple[int, int]] = set()
+    year: int | None = None
+    for part in match.group("body").split("_"):
+        if len(part) == 4:  # noqa: PLR2004
+            year = int(part)
+            continue
+
+        if year is not None:
+            months.add((year, int(part)))
+
+    return months
+
+
+def filter_dump_files(
+    paths: Iterable[Path],
+    since: tuple[int, int] | None = None,
+    until: tuple[int, int] | None = None,
+) -> list[Path]:
+    selected: list[Path] = []
+    for path in paths:
+        if since is None and until is None:
+            selected.append(path)
+            continue
+
+        months = months_from_dump_filename(path.name)
+        if not months:
+            continue
+
+        if any((since is None or month >= since) and (until is None or month <= until) for month in months):
+            selected.append(path)
+
+    return sorted(selected)
+
+
+def _load_dump(source: Path) -> ShiftStateDump:
+    return load_dump(source)
+
+
+def _export_to_file(source: Path, target: Path, *, use_tzid: bool) -> ExportResult:
+    started = time.perf_counter()
+    try:
+        shift_state = _load_dump(source)
+        with target.open("w", encoding="utf-8", newline="") as stream:
+            write_calendar(shift_state, stream, use_tzid=use_tzid)
+    except (OSError, ValueError) as e:
+        return ExportResult(source, target, seconds=time.perf_counter() - started, error=str(e))
+
+    return ExportResult(source, target, len(shift_state.shift_map), time.perf_counter() - started)
+
+
+def _export_to_lines(source: Path) -> ExportResult:
+    started = time.perf_counter()
+    try:
+        shift_state = _load_dump(source)
+    except (OSError, ValueError) as e:
+        return ExportResult(source, None, seconds=time.perf_counter() - started, error=str(e))
+
+    config = get_config()
+    resolver = resolver_for_config(shift_state.shift_map, config)
+    events: dict[str, list[str]] = {}
+    if resolver is not None:
+        for day, shift in shift_state.shift_map.items():
+            uid = event_uid(config.worker_name, day)
+            events[uid] = list(iter_event_lines(resolver.resolve_shift(day, shift), shift, uid))
+
+    return ExportResult(source, None, len(shift_state.shift_map), time.perf_counter() - started, events=events)
+
+
+def _export_job(job: tuple[Path, Path, bool]) -> ExportResult:
+    source, target, use_tzid = job
+    return _export_to_file(source, target, use_tzid=use_tzid)
+
+
+def _run[Item](func: Callable[[Item], ExportResult], items: list[Item], jobs: int) -> Iterator[ExportResult]:
+    if jobs <= 1 or len(items) <= 1:
+        yield from map(func, items)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(func, items)
+
+
+def export_split(
+    sources: list[Path],
+    target_dir: Path,
+    jobs: int,
+    *,
+    use_tzid: bool = False,
+) -> Iterator[ExportResult]:
+    """Export every dump to its own ICS file in ``target_dir``; results are yielded in ``sources`` order."""  # noqa: DOC402
+    target_dir.mkdir(parents=True, exist_ok=True)
+    jobs_args = [(source, target_dir / f"{source.stem}.ics", use_tzid) for source in sources]
+    yield from _run(_export_job, jobs_args, jobs)
+
+
+def export_merged(sources: list[Path], target: Path, jobs: int) -> Iterator[ExportResult]:
+    """Export all dumps into one calendar; events are written in ``sources`` order as workers finish.
+
+    Dumps can overlap, e.g. a month dump and a multi-month dump of the same days. A day's event is written once, from
+    the first dump in ``sources`` that has it, the UIDs are per worker and day.
+    """  # noqa: DOC402
+    written: set[str] = set()
+    with target.open("w", encoding="utf-8", newline="") as stream:
+        stream.write(ICS_LINE_SEPARATOR.join(iter_calendar_header_lines()))
+
+        for result in _run(_export_to_lines, sources, jobs):
+            for uid, lines in result.events.items():
+                if uid in written:
+                    result.duplicates += 1
+                    continue
+
+                written.add(uid)
+                for line in lines:
+                    stream.write(ICS_LINE_SEPARATOR)
+                    stream.write(line)
+
+            result.target = target
+            result.events = {}
+            yield result
+
+        stream.write(ICS_LINE_SEPARATOR)
+        stream.write("END:VCALENDAR")
+
+
+@dataclass
+class TeamExportJob:
+    worker_name: str
+    dump_location: Path
+    target: Path
+    since: tuple[int, int] | None
+    until: tuple[int, int] | None
+    use_tzid: bool
+
+
+def _init_team_export(config: WorkCalConfig, resolver: TimezoneResolver | None) -> None:
+    # the parsed config (templates included) and the timezone transitions are pickled once per process
+    ConfigSingleton().set_config(config)
+    _TEAM_EXPORT_RESOLVER[0] = resolver
+
+
+def _worker_shift_map(job: TeamExportJob) -> dict[date, Shift]:
+    config = get_config()
+    if config.storage_backend == "sqlite":
+        store = SqliteShiftStore(config.sqlite_path)
+        start = date(*job.since, 1) if job.since is not None else None
+        end = date(*job.until, calendar.monthrange(*job.until)[1]) if job.until is not None else None
+        shift_map = {row.day: row.shift for row in store.query(worker=job.worker_name, start=start, end=end)}
+        store.close()
+        return shift_map
+
+    paths = [path for pattern in DUMP_GLOBS for path in job.dump_location.glob(pattern) if path.is_file()]
+    shift_map = {}
+    for path in filter_dump_files(paths, job.since, job.until):
+        shift_map.update(load_cataloged_dump(path).shift_map)
+    return shift_map
+
+
+def _export_worker(job: TeamExportJob) -> ExportResult:
+    started = time.perf_counter()
+    try:
+        shift_state = ShiftStateDump(shift_map=_worker_shift_map(job))
+        resolver = _TEAM_EXPORT_RESOLVER[0]
+        if resolver is not None and any(not resolver.start <= day < resolver.end for day in shift_state.shift_map):
+            resolver = None  # a dump changed since the span was taken, let the worker build its own
+        lines = iter_calendar_lines(shift_state, use_tzid=job.use_tzid, worker_name=job.worker_name, resolver=resolver)
+        with job.target.open("w", encoding="utf-8", newline="") as stream:
+            write_lines(lines, stream)
+    except (OSError, ValueError) as e:
+        return ExportResult(job.dump_location, job.target, seconds=time.perf_counter() - started, error=str(e))
+
+    return ExportResult(job.dump_location, job.target, len(shift_state.shift_map), time.perf_counter() - started)
+
+
+def team_resolver(config: WorkCalConfig) -> TimezoneResolver | None:
+    """One resolver covering the dumps of the whole team, taken from the catalogs without opening any dump."""  # noqa: DOC201
+    first_days: list[date] = []
+    last_days: list[date] = []
+    for worker_name in config.team:
+        for entry in refresh_catalog(config.dump_location_for(worker_name), worker_name).entries.values():
+            if entry.first_day is not None and entry.last_day is not None:
+                first_days.append(entry.first_day)
+                last_days.append(entry.last_day)
+
+    if not first_days:
+        return None
+    return TimezoneResolver(
+        config.timezone,
+        min(first_days),
+        max(last_days) + ONE_DAY,
+        config.dst_gap_policy,
+        config.dst_fold_policy,
+    )
+
+
+def export_team(  # noqa: PLR0913
+    config: WorkCalConfig,
+    target_dir: Path,
+    jobs: int,
+    *,
+    since: tuple[int, int] | None = None,
+    until: tuple[int, int] | None = None,
+    use_tzid: bool = False,
+) -> Iterator[ExportResult]:
+    """Export one ICS file per team member into ``target_dir``, spread over a pool of ``jobs`` processes.
+
+    Results are yielded in ``config.team`` order.
+    """  # noqa: DOC402
+    target_dir.mkdir(parents=True, exist_ok=True)
+    team_jobs = [
+        TeamExportJob(
+            worker_name,
+            config.dump_location_for(worker_name),
+            target_dir / f"{config.namespace_for(worker_name) or worker_slug(worker_name)}.ics",
+            since,
+            until,
+            use_tzid,
+        )
+        for worker_name in config.team
+    ]
+    resolver = team_resolver(config) if config.storage_backend == "json" else None
+
+    if jobs <= 1 or len(team_jobs) <= 1:
+        _init_team_export(config, resolver)
+        yield from map(_export_worker, team_jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_team_export, initargs=(config, resolver)) as executor:
+        yield from executor.map(_export_worker, team_jobs)
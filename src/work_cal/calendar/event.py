@@ -11,8 +11,9 @@ def create_calendar_event(  # noqa: PLR0913, PLR0917
     location: str | None = None,
     url: str | None = None,
     categories: list | None = None,
+    uid: str | None = None,
 ) -> Event:
-    event = Event()
+    event = Event(uid=uid)
     event.name = title
     event.begin = start
     event.end = end
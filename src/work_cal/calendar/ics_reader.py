@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from work_cal.models import Shift
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import date
+
+    from work_cal.config import ShiftType
+
+DURATION_REGEX = re.compile(
+    r"^P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$",
+)
+UNESCAPE_REGEX = re.compile(r"\\([\\;,nNr])")
+UNESCAPED = {"\\": "\\", ";": ";", ",": ",", "n": "\n", "N": "\n", "r": "\r"}
+
+
+class ContentLine(NamedTuple):
+    name: str
+    params: dict[str, str]
+    value: str
+
+
+class ParsedEvent(NamedTuple):
+    summary: str
+    start: datetime  # timezone aware
+    end: datetime
+
+
+@dataclass
+class ImportStats:
+    events: int = 0
+    imported: int = 0
+    skipped: dict[str, int] = field(default_factory=dict)
+
+    def skip(self, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+
+def unescape_text(value: str) -> str:
+    return UNESCAPE_REGEX.sub(lambda match: UNESCAPED[match.group(1)], value)
+
+
+def iter_unfolded_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded physical lines (continuations start with a space or tab) one logical line at a time."""  # noqa: DOC402
+    pending: str | None = None
+    for raw_line in lines:
+        line = raw_line.rstrip("\r\n")
+        if line[:1] in {" ", "\t"} and pending is not None:
+            pending += line[1:]
+            continue
+
+        if pending:
+            yield pending
+        pending = line
+
+    if pending:
+        yield pending
+
+
+def parse_content_line(line: str) -> ContentLine:
+    # the value starts after the first colon that is not inside a quoted parameter value
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:index], line[index + 1 :]
+            break
+    else:
+        head, value = line, ""
+
+    name, *raw_params = head.split(";")
+    params: dict[str, str] = {}
+    for raw_param in raw_params:
+        param_name, _, param_value = raw_param.partition("=")
+        params[param_name.upper()] = param_value.strip('"')
+
+    return ContentLine(name.upper(), params, value)
+
+
+@lru_cache(maxsize=32)
+def _zone_for_tzid(tzid: str, default_tz: ZoneInfo) -> ZoneInfo:
+    try:
+        return ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):  # e.g. Windows zone names, fall back to the configured zone
+        return default_tz
+
+
+def parse_datetime(line: ContentLine, default_tz: ZoneInfo) -> datetime | None:
+    """Parse DTSTART/DTEND, None for all day (DATE) values which never describe a shift."""  # noqa: DOC201
+    value = line.value
+    if line.params.get("VALUE") == "DATE" or "T" not in value:
+        return None
+
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=UTC)
+
+    tzinfo = _zone_for_tzid(line.params["TZID"], default_tz) if "TZID" in line.params else default_tz
+    return datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=tzinfo)
+
+
+def parse_duration(value: str) -> timedelta | None:
+    match = DURATION_REGEX.match(value.lstrip("+"))
+    if match is None:
+        return None
+
+    parts = {name: int(part) for name, part in match.groupdict().items() if part is not None}
+    return timedelta(**parts)
+
+
+def iter_events(lines: Iterable[str], default_tz: ZoneInfo, stats: ImportStats) -> Iterator[ParsedEvent]:
+    """Stream VEVENTs out of an ICS file, holding only the properties of the current event in memory."""  # noqa: DOC402
+    depth_in_event = 0
+    properties: dict[str, ContentLine] = {}
+
+    for raw_line in iter_unfolded_lines(lines):
+        line = parse_content_line(raw_line)
+
+        if line.name == "BEGIN":
+            if line.value.upper() == "VEVENT":
+                depth_in_event = 1
+                properties = {}
+            elif depth_in_event:
+                depth_in_event += 1  # nested component, e.g. VALARM
+            continue
+
+        if line.name == "END" and depth_in_event:
+            depth_in_event -= 1
+            if depth_in_event == 0:
+                stats.events += 1
+                event = _build_event(properties, default_tz, stats)
+                if event is not None:
+                    yield event
+            continue
+
+        if depth_in_event == 1:
+            properties.setdefault(line.name, line)
+
+
+def _build_event(properties: dict[str, ContentLine], default_tz: ZoneInfo, stats: ImportStats) -> ParsedEvent | None:
+    if "STATUS" in properties and properties["STATUS"].value.upper() == "CANCELLED":
+        stats.skip("cancelled")
+        return None
+
+    try:
+        start = parse_datetime(properties["DTSTART"], default_tz) if "DTSTART" in properties else None
+    except ValueError:
+        stats.skip("unparsable DTSTART")
+        return None
+    if start is None:
+        stats.skip("no start time")
+        return None
+
+    end: datetime | None = None
+    if "DTEND" in properties:
+        try:
+            end = parse_datetime(properties["DTEND"], default_tz)
+        except ValueError:
+            stats.skip("unparsable DTEND")
+            return None
+    elif "DURATION" in properties:
+        duration = parse_duration(properties["DURATION"].value)
+        end = start + duration if duration is not None else None
+
+    if end is None:
+        stats.skip("no end time")
+        return None
+
+    summary = unescape_text(properties["SUMMARY"].value) if "SUMMARY" in properties else ""
+    return ParsedEvent(summary, start, end)
+
+
+type HourMinute = tuple[int, int]
+
+
+def _hour_minute(minute_of_day: int | None) -> HourMinute | None:
+    if minute_of_day is None:
+        return None
+    return divmod(minute_of_day, 60)
+
+
+class TemplateMatcher:
+    def __init__(self, templates: Iterable[ShiftType]) -> None:
+        self._by_name: dict[str, list[tuple[HourMinute | None, HourMinute | None]]] = {}
+        for template in templates:
+            start = _hour_minute(template.start_minute_of_day)
+            end = _hour_minute(template.end_minute_of_day)
+            self._by_name.setdefault(template.name, []).append((start, end))
+
+    def match(self, name: str, start: datetime, end: datetime) -> str | None:
+        """Return ``name`` if a template with that name has the event's hours (where it defines them)."""  # noqa: DOC201
+        for template_start, template_end in self._by_name.get(name, ()):
+            if template_start is not None and template_start != (start.hour, start.minute):
+                continue
+            if template_end is not None and template_end != (end.hour, end.minute):
+                continue
+            return name
+
+        return None
+
+
+def event_to_shift(event: ParsedEvent, tz: ZoneInfo, matcher: TemplateMatcher) -> tuple[date, Shift] | None:
+    start = event.start.astimezone(tz)
+    end = event.end.astimezone(tz)
+    if not timedelta() <= end - start < timedelta(days=1):
+        return None
+
+    shift = Shift(
+        name=event.summary,
+        start_hour=start.hour,
+        start_minute=start.minute,
+        end_hour=end.hour,
+        end_minute=end.minute,
+        from_template=matcher.match(event.summary, start, end),
+    )
+    return start.date(), shift
+
+
+def read_shifts(
+    lines: Iterable[str],
+    tz: ZoneInfo,
+    templates: Iterable[ShiftType],
+    stats: ImportStats,
+) -> Iterator[tuple[date, Shift]]:
+    """Stream ``(day, shift)`` pairs in the order the events appear in the file."""  # noqa: DOC402
+    matcher = TemplateMatcher(templates)
+    for event in iter_events(lines, tz, stats):
+        day_shift = event_to_shift(event, tz, matcher)
+        if day_shift is None:
+            stats.skip("longer than a day")
+            continue
+
+        yield day_shift
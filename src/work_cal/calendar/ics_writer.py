@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from work_cal.calendar.timezones import TimezoneResolver, resolver_for_days
+from work_cal.config import get_config
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import date, datetime
+    from typing import TextIO
+
+    from work_cal.calendar.timezones import ShiftBounds
+    from work_cal.config import WorkCalConfig
+    from work_cal.models import Shift, ShiftStateDump
+
+ICS_LINE_SEPARATOR = "\r\n"
+ICS_PRODID = "ics.py - http://git.io/lLljaA"  # same as the ics serializer so both writers produce equal files
+ISO_TO_ICS = str.maketrans("", "", "-:")
+ICS_UID_DOMAIN = "work-cal"
+
+
+def escape_text(value: str) -> str:
+    return (
+        value
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def event_uid(worker_name: str, day: date, shift_slot: int = 0) -> str:
+    """Deterministic UID, so re-imported calendars update existing events instead of duplicating them.
+
+    The shift is identified by its slot on that day rather than its contents, editing a shift keeps its UID.
+    """  # noqa: DOC201
+    digest = hashlib.sha1(f"{worker_name}|{day.isoformat()}|{shift_slot}".encode(), usedforsecurity=False)
+    return f"{digest.hexdigest()}@{ICS_UID_DOMAIN}"
+
+
+def _format_time(name: str, utc: datetime, local: datetime, tzid: str | None) -> str:
+    # isoformat is several times faster than strftime, the times never carry seconds or microseconds
+    if tzid is None:
+        return f"{name}:{utc.isoformat().translate(ISO_TO_ICS)}Z"
+    return f"{name};TZID={tzid}:{local.isoformat().translate(ISO_TO_ICS)}"
+
+
+def resolver_for_config(shift_map: dict[date, Shift], config: WorkCalConfig) -> TimezoneResolver | None:
+    return resolver_for_days(shift_map, config.timezone, config.dst_gap_policy, config.dst_fold_policy)
+
+
+def iter_event_lines(
+    bounds: ShiftBounds,
+    shift: Shift,
+    uid: str,
+    sequence: int = 0,
+    tzid: str | None = None,
+) -> Iterator[str]:
+    """VEVENT lines with UTC times, or local times referencing the VTIMEZONE ``tzid`` when it is given."""  # noqa: DOC402
+    yield "BEGIN:VEVENT"
+    yield _format_time("DTEND", bounds.end_utc, bounds.end_local, tzid)
+    yield _format_time("DTSTART", bounds.start_utc, bounds.start_local, tzid)
+    if sequence:
+        yield f"SEQUENCE:{sequence}"
+    if shift.name:
+        yield f"SUMMARY:{escape_text(shift.name)}"
+    yield f"UID:{uid}"
+    yield "END:VEVENT"
+
+
+def iter_calendar_header_lines(vtimezone: Iterable[str] = ()) -> Iterator[str]:
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield f"PRODID:{ICS_PRODID}"
+    yield from vtimezone
+
+
+def iter_calendar_lines(
+    shift_state: ShiftStateDump,
+    *,
+    use_tzid: bool = False,
+    worker_name: str | None = None,
+    resolver: TimezoneResolver | None = None,
+) -> Iterator[str]:
+    """Calendar lines of a dump, ``resolver`` may be one shared by many dumps as long as it covers their days."""  # noqa: DOC402
+    config = get_config()
+    if worker_name is None:
+        worker_name = config.worker_name
+    if resolver is None:
+        resolver = resolver_for_config(shift_state.shift_map, config)
+    tzid = config.timezone.key if use_tzid else None
+
+    yield from iter_calendar_header_lines(resolver.vtimezone_lines() if use_tzid and resolver is not None else ())
+    if resolver is not None:
+        for day, shift in shift_state.shift_map.items():
+            bounds = resolver.resolve_shift(day, shift)
+            yield from iter_event_lines(bounds, shift, event_uid(worker_name, day), tzid=tzid)
+    yield "END:VCALENDAR"
+
+
+def write_lines(lines: Iterable[str], stream: TextIO) -> None:
+    """Write content lines; like ``ics`` there is no separator after the last line."""
+    separator = ""
+    for line in lines:
+        stream.write(separator)
+        stream.write(line)
+        separator = ICS_LINE_SEPARATOR
+
+
+def write_calendar(shift_state: ShiftStateDump, stream: TextIO, *, use_tzid: bool = False) -> None:
+    write_lines(iter_calendar_lines(shift_state, use_tzid=use_tzid), stream)
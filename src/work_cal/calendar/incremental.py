@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import date  # noqa: TC003 without this pydantic crashes
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from work_cal.calendar.ics_writer import (
+    event_uid,
+    iter_calendar_header_lines,
+    iter_event_lines,
+    resolver_for_config,
+    write_lines,
+)
+from work_cal.config import get_config
+from work_cal.files import atomic_write_text
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+    from work_cal.models import Shift, ShiftStateDump
+
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+class ManifestEntry(BaseModel):
+    uid: str
+    content_hash: str
+    sequence: int = 0
+    cancelled: bool = False
+    lines: list[str] = Field(default_factory=list)
+
+
+class ExportManifest(BaseModel):
+    version: int = MANIFEST_VERSION
+    worker_name: str
+    timezone: str
+    dst_policy: str
+    use_tzid: bool = False
+    entries: dict[date, ManifestEntry] = Field(default_factory=dict)
+
+
+@dataclass
+class IncrementalExportResult:
+    changed: list[date] = field(default_factory=list)
+    cancelled: list[date] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def manifest_path_for(target: Path) -> Path:
+    return target.with_name(target.name + MANIFEST_SUFFIX)
+
+
+def shift_content_hash(shift: Shift) -> str:
+    content = f"{shift.name}|{shift.start_hour}:{shift.start_minute}|{shift.end_hour}:{shift.end_minute}"
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def _manifest_settings(manifest: ExportManifest) -> tuple[int, str, str, str, bool]:
+    return manifest.version, manifest.worker_name, manifest.timezone, manifest.dst_policy, manifest.use_tzid
+
+
+def load_manifest(path: Path, empty: ExportManifest) -> ExportManifest:
+    """Load the manifest of a previous export, starting over from ``empty`` if it was made with other settings."""  # noqa: DOC201
+    if not path.is_file():
+        return empty
+
+    manifest = ExportManifest.model_validate_json(path.read_text("utf-8"))
+    if _manifest_settings(manifest) != _manifest_settings(empty):
+        return empty
+
+    return manifest
+
+
+def save_manifest(manifest: ExportManifest, path: Path) -> None:
+    atomic_write_text(path, manifest.model_dump_json())
+
+
+def _cancel_entry(entry: ManifestEntry) -> None:
+    lines = [line for line in entry.lines if not line.startswith("SEQUENCE:") and line != "END:VEVENT"]
+    entry.sequence += 1
+    entry.cancelled = True
+    entry.lines = [*lines, f"SEQUENCE:{entry.sequence}", "STATUS:CANCELLED", "END:VEVENT"]
+
+
+def _write_calendar_file(target: Path, vtimezone: Iterable[str], events: Iterator[list[str]]) -> None:
+    def lines() -> Iterator[str]:
+        yield from iter_calendar_header_lines(vtimezone)
+        for event_lines in events:
+            yield from event_lines
+        yield "END:VCALENDAR"
+
+    with target.open("w", encoding="utf-8", newline="") as stream:
+        write_lines(lines(), stream)
+
+
+def incremental_export(
+    shift_state: ShiftStateDump,
+    target: Path,
+    delta_target: Path | None = None,
+    *,
+    use_tzid: bool = False,
+) -> IncrementalExportResult:
+    """Export ``shift_state`` to ``target`` serializing only the days that changed since the last export.
+
+    Unchanged days reuse the VEVENT lines cached in the manifest next to ``target``. When ``delta_target``
+    is given, a second calendar holding only the changed and cancelled events is written there.
+    """  # noqa: DOC201, DOC501
+    config = get_config()
+    manifest_path = manifest_path_for(target)
+    manifest = load_manifest(
+        manifest_path,
+        ExportManifest(
+            worker_name=config.worker_name,
+            timezone=config.timezone.key,
+            dst_policy=f"{config.dst_gap_policy}|{config.dst_fold_policy}",
+            use_tzid=use_tzid,
+        ),
+    )
+    resolver = resolver_for_config(shift_state.shift_map, config)
+    tzid = config.timezone.key if use_tzid else None
+    vtimezone = resolver.vtimezone_lines() if use_tzid and resolver is not None else ()
+    result = IncrementalExportResult()
+
+    for day, shift in shift_state.shift_map.items():
+        content_hash = shift_content_hash(shift)
+        entry = manifest.entries.get(day)
+
+        if entry is not None and not entry.cancelled and entry.content_hash == content_hash:
+            result.unchanged += 1
+            continue
+
+        if resolver is None:  # there is at least one shift, so there is a resolver
+            raise RuntimeError
+
+        uid = event_uid(config.worker_name, day)
+        sequence = 0 if entry is None else entry.sequence + 1
+        lines = list(iter_event_lines(resolver.resolve_shift(day, shift), shift, uid, sequence, tzid))
+        manifest.entries[day] = ManifestEntry(uid=uid, content_hash=content_hash, sequence=sequence, lines=lines)
+        result.changed.append(day)
+
+    for day, entry in manifest.entries.items():
+        if entry.cancelled or day in shift_state.shift_map:
+            continue
+
+        _cancel_entry(entry)
+        result.cancelled.append(day)
+
+    _write_calendar_file(target, vtimezone, (manifest.entries[day].lines for day in shift_state.shift_map))
+
+    if delta_target is not None:
+        delta_days = [*result.changed, *result.cancelled]
+        _write_calendar_file(delta_target, vtimezone, (manifest.entries[day].lines for day in delta_days))
+
+    save_manifest(manifest, manifest_path)
+    return result
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, NamedTuple
+
+from work_cal.calendar.timezones import resolve_shift_map
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from work_cal.calendar.timezones import ShiftBounds
+    from work_cal.config import LabourRules, WorkCalConfig
+    from work_cal.models import Shift
+
+type WeekKey = tuple[int, int]
+type MonthKey = tuple[int, int]
+
+EPOCH = datetime(1970, 1, 1)  # noqa: DTZ001 shift bounds are naive UTC
+ONE_MINUTE = timedelta(minutes=1)
+
+
+class Violation(NamedTuple):
+    rule: str
+    day: date
+    message: str
+
+
+def bounds_to_minutes(bounds: ShiftBounds) -> tuple[int, int]:
+    """Start and end of a shift as minutes since the epoch, in UTC so DST changes do not skew durations."""  # noqa: DOC201
+    return (bounds.start_utc - EPOCH) // ONE_MINUTE, (bounds.end_utc - EPOCH) // ONE_MINUTE
+
+
+def week_key(day: date) -> WeekKey:
+    iso_year, iso_week, _ = day.isocalendar()
+    return iso_year, iso_week
+
+
+def _hours(minutes: int) -> str:
+    return f"{minutes / 60:.1f} h"
+
+
+class ShiftIntervals:
+
+    """Shift intervals of many days as parallel arrays sorted by day, plus running hour totals per week and month.
+
+    A day holds at most one shift and a shift starts on its own day, so sorting by day also sorts by start minute.
+    """
+
+    def __init__(self) -> None:
+        self.ordinals = array("l")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.week_minutes: dict[WeekKey, int] = {}
+        self.month_minutes: dict[MonthKey, int] = {}
+
+    @classmethod
+    def from_minutes(cls, day_minutes: Iterable[tuple[date, tuple[int, int]]]) -> ShiftIntervals:
+        intervals = cls()
+        for day, (start, end) in sorted(day_minutes):
+            intervals.ordinals.append(day.toordinal())
+            intervals.starts.append(start)
+            intervals.ends.append(end)
+            intervals._add_totals(day, end - start)
+        return intervals
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def _add_totals(self, day: date, minutes: int) -> None:
+        week, month = week_key(day), (day.year, day.month)
+        self.week_minutes[week] = self.week_minutes.get(week, 0) + minutes
+        self.month_minutes[month] = self.month_minutes.get(month, 0) + minutes
+
+    def _position(self, day: date) -> int | None:
+        position = bisect_left(self.ordinals, day.toordinal())
+        if position < len(self.ordinals) and self.ordinals[position] == day.toordinal():
+            return position
+        return None
+
+    def remove(self, day: date) -> None:
+        position = self._position(day)
+        if position is None:
+            return
+
+        self._add_totals(day, self.starts[position] - self.ends[position])
+        del self.ordinals[position], self.starts[position], self.ends[position]
+
+    def set(self, day: date, start: int, end: int) -> None:
+        self.remove(day)
+        position = bisect_left(self.ordinals, day.toordinal())
+        self.ordinals.insert(position, day.toordinal())
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self._add_totals(day, end - start)
+
+    def _check_pair(self, position: int, rules: LabourRules) -> Violation | None:
+        # the shift at ``position`` against the one before it
+        previous_end = self.ends[position - 1]
+        day = date.fromordinal(self.ordinals[position])
+        previous_day = date.fromordinal(self.ordinals[position - 1])
+        rest = self.starts[position] - previous_end
+        if rest < 0:
+            return Violation("overlap", day, f"overlaps the shift of {previous_day}")
+        if rules.min_rest_hours and rest < rules.min_rest_hours * 60:
+            return Violation("rest", day, f"only {_hours(rest)} rest after the shift of {previous_day}")
+        return None
+
+    def _check_week(self, week: WeekKey, rules: LabourRules) -> Violation | None:
+        minutes = self.week_minutes.get(week, 0)
+        if not rules.max_weekly_hours or minutes <= rules.max_weekly_hours * 60:
+            return None
+
+        iso_year, iso_week = week
+        monday = date.fromisocalendar(iso_year, iso_week, 1)
+        return Violation("weekly hours", monday, f"{_hours(minutes)} in week {iso_year}-W{iso_week:02d}")
+
+    def _check_month(self, month: MonthKey, rules: LabourRules) -> Violation | None:
+        minutes = self.month_minutes.get(month, 0)
+        if not rules.max_monthly_hours or minutes <= rules.max_monthly_hours * 60:
+            return None
+
+        first = date(*month, 1)
+        return Violation("monthly hours", first, f"{_hours(minutes)} in {first:%Y-%m}")
+
+    def check(self, rules: LabourRules) -> list[Violation]:
+        """Evaluate every rule over the whole index in a single pass, ordered by day."""  # noqa: DOC201
+        violations: list[Violation | None] = []
+        run_length = 0
+        for position, ordinal in enumerate(self.ordinals):
+            if position:
+                violations.append(self._check_pair(position, rules))
+
+            run_length = run_length + 1 if position and self.ordinals[position - 1] == ordinal - 1 else 1
+            if rules.max_consecutive_days and run_length == rules.max_consecutive_days + 1:
+                message = f"more than {rules.max_consecutive_days} days in a row"
+                violations.append(Violation("consecutive days", date.fromordinal(ordinal), message))
+
+        violations.extend(self._check_week(week, rules) for week in self.week_minutes)
+        violations.extend(self._check_month(month, rules) for month in self.month_minutes)
+
+        found = [violation for violation in violations if violation is not None]
+        return sorted(found, key=lambda violation: violation.day)
+
+    def check_day(self, day: date, rules: LabourRules) -> list[Violation]:
+        """Rules touching ``day`` only: its neighbours, its week, its month and the run of days it is part of."""  # noqa: DOC201
+        position = self._position(day)
+        if position is None:
+            return []
+
+        violations = [
+            self._check_pair(pair_position, rules)
+            for pair_position in (position, position + 1)
+            if 0 < pair_position < len(self.ordinals)
+        ]
+        violations += [self._check_week(week_key(day), rules), self._check_month((day.year, day.month), rules)]
+
+        if rules.max_consecutive_days:
+            first, last = position, position
+            while first > 0 and self.ordinals[first - 1] == self.ordinals[first] - 1:
+                first -= 1
+            while last + 1 < len(self.ordinals) and self.ordinals[last + 1] == self.ordinals[last] + 1:
+                last += 1
+            if last - first + 1 > rules.max_consecutive_days:
+                start, end = date.fromordinal(self.ordinals[first]), date.fromordinal(self.ordinals[last])
+                message = f"{last - first + 1} days in a row ({start} .. {end})"
+                violations.append(Violation("consecutive days", day, message))
+
+        return [violation for violation in violations if violation is not None]
+
+
+def intervals_for_shift_map(shift_map: dict[date, Shift], config: WorkCalConfig) -> ShiftIntervals:
+    bounds = resolve_shift_map(shift_map, config.timezone, config.dst_gap_policy, config.dst_fold_policy)
+    return ShiftIntervals.from_minutes((day, bounds_to_minutes(day_bounds)) for day, day_bounds in bounds.items())
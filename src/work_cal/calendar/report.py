@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import csv
+from array import array
+from datetime import date
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from typing import IO
+
+    from work_cal.models import Shift
+
+type Grouping = Literal["week", "month", "template", "weekday"]
+
+GROUPINGS: tuple[Grouping, ...] = ("week", "month", "template", "weekday")
+MINUTES_PER_DAY = 24 * 60
+NIGHT_START_MINUTE = 22 * 60
+NIGHT_END_MINUTE = 6 * 60
+WEEKEND_DAYS = frozenset({5, 6})
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+NO_TEMPLATE = "-"
+CSV_HEADER = ("worker", "grouping", "key", "shifts", "hours", "night_hours", "weekend_hours")
+
+
+class ReportRow(NamedTuple):
+    worker: str
+    grouping: Grouping
+    key: str
+    shifts: int
+    minutes: int
+    night_minutes: int
+    weekend_minutes: int
+
+
+def night_minutes(start: int, end: int) -> int:
+    """Minutes of ``start``..``end`` (minutes from the shift day's midnight) between 22:00 and 06:00."""  # noqa: DOC201
+    total = 0
+    for midnight in range(0, 3 * MINUTES_PER_DAY, MINUTES_PER_DAY):  # a shift ends on its own or the next day
+        window_start = midnight - (MINUTES_PER_DAY - NIGHT_START_MINUTE)
+        window_end = midnight + NIGHT_END_MINUTE
+        total += max(0, min(end, window_end) - max(start, window_start))
+    return total
+
+
+def _intern(names: list[str], index: dict[str, int], name: str) -> int:
+    if name not in index:
+        index[name] = len(names)
+        names.append(name)
+    return index[name]
+
+
+def _week_label(ordinal: int) -> str:
+    iso_year, iso_week, _ = date.fromordinal(ordinal).isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def _month_label(ordinal: int) -> str:
+    return date.fromordinal(ordinal).strftime("%Y-%m")
+
+
+def _weekday_label(ordinal: int) -> str:
+    return WEEKDAY_NAMES[(ordinal - 1) % 7]  # ordinal 1 is a Monday
+
+
+DAY_LABELS: dict[Grouping, Callable[[int], str]] = {
+    "week": _week_label,
+    "month": _month_label,
+    "weekday": _weekday_label,
+}
+
+
+class ShiftColumns:
+
+    """Shifts of any number of workers as parallel columns, names are interned and referenced by index.
+
+    Every column is an ``array``, so a few years of shifts for a whole team take a few hundred kilobytes and the
+    aggregations only touch integers.
+    """
+
+    def __init__(self) -> None:
+        self.workers: list[str] = []
+        self.templates: list[str] = []
+        self.worker_ids = array("H")
+        self.ordinals = array("l")
+        self.starts = array("H")
+        self.ends = array("H")  # past MINUTES_PER_DAY for shifts that end on the next day
+        self.template_ids = array("H")
+        self._worker_index: dict[str, int] = {}
+        self._template_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def add_shift_map(self, worker: str, shift_map: dict[date, Shift]) -> None:
+        worker_id = _intern(self.workers, self._worker_index, worker)
+        for day, shift in shift_map.items():
+            start = shift.start_hour * 60 + shift.start_minute
+            end = shift.end_hour * 60 + shift.end_minute
+            template = shift.from_template if shift.from_template is not None else NO_TEMPLATE
+            self.worker_ids.append(worker_id)
+            self.ordinals.append(day.toordinal())
+            self.starts.append(start)
+            self.ends.append(start + (end - start) % MINUTES_PER_DAY)
+            self.template_ids.append(_intern(self.templates, self._template_index, template))
+
+    def _keys(self, grouping: Grouping) -> list[str]:
+        # every distinct day or template is labelled once, the column is then built by lookup
+        if grouping == "template":
+            return [self.templates[template_id] for template_id in self.template_ids]
+
+        label = DAY_LABELS[grouping]
+        labels = {ordinal: label(ordinal) for ordinal in set(self.ordinals)}
+        return [labels[ordinal] for ordinal in self.ordinals]
+
+    def aggregate(self, grouping: Grouping) -> list[ReportRow]:
+        """Shift count, hours, night hours and weekend hours per worker and group, sorted by worker and key."""  # noqa: DOC201
+        night_by_bounds: dict[tuple[int, int], int] = {}
+        totals: dict[tuple[int, str], list[int]] = {}
+        for worker_id, ordinal, start, end, key in zip(
+            self.worker_ids,
+            self.ordinals,
+            self.starts,
+            self.ends,
+            self._keys(grouping),
+            strict=True,
+        ):
+            night = night_by_bounds.get((start, end))
+            if night is None:
+                night = night_by_bounds[start, end] = night_minutes(start, end)
+
+            total = totals.get((worker_id, key))
+            if total is None:
+                total = totals[worker_id, key] = [0, 0, 0, 0]
+            total[0] += 1
+            total[1] += end - start
+            total[2] += night
+            if (ordinal - 1) % 7 in WEEKEND_DAYS:
+                total[3] += end - start
+
+        rows = [
+            ReportRow(self.workers[worker_id], grouping, key, *total)
+            for (worker_id, key), total in totals.items()
+        ]
+        if grouping == "weekday":
+            return sorted(rows, key=lambda row: (row.worker, WEEKDAY_NAMES.index(row.key)))
+        return sorted(rows, key=lambda row: (row.worker, row.key))
+
+
+def write_report_csv(stream: IO[str], rows: Iterable[ReportRow]) -> None:
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow(
+            (
+                row.worker,
+                row.grouping,
+                row.key,
+                row.shifts,
+                f"{row.minutes / 60:.2f}",
+                f"{row.night_minutes / 60:.2f}",
+                f"{row.weekend_minutes / 60:.2f}",
+            ),
+        )
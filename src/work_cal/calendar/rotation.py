@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, NamedTuple
+
+from work_cal.config import ROTATION_DAY_OFF
+from work_cal.models import Shift
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from work_cal.config import Rotation, ShiftType, TemplateIndex
+
+ONE_DAY = timedelta(days=1)
+
+
+class RotationFill(NamedTuple):
+    shifts: dict[date, Shift | None]  # None clears the day
+    skipped: list[date]  # the template of the day is not allowed on its weekday, the day is left as it is
+
+
+def shift_from_template(template: ShiftType) -> Shift:
+    start = template.start_minute_of_day
+    end = template.effective_end_minute_of_day
+    if start is None or end is None:
+        msg = f"Shift template {template.name} has no start and end time"
+        raise ValueError(msg)
+
+    return Shift(
+        name=template.name,
+        start_hour=start // 60,
+        start_minute=start % 60,
+        end_hour=end // 60,
+        end_minute=end % 60,
+        from_template=template.name,
+    )
+
+
+def expand_rotation(
+    rotation: Rotation,
+    template_index: TemplateIndex,
+    start: date,
+    end: date,
+    anchor: date | None = None,
+) -> RotationFill:
+    """Lay ``rotation`` over ``start``..``end`` (inclusive), its first entry falling on ``anchor`` (default ``start``).
+
+    Every template becomes one shared Shift instance, days off become None so filling over an old schedule clears it.
+    """  # noqa: DOC201, DOC501
+    if anchor is None:
+        anchor = start
+
+    templates: dict[str, ShiftType] = {}
+    for name in set(rotation.pattern) - {ROTATION_DAY_OFF}:
+        template = template_index.get(name)
+        if template is None:
+            msg = f"Rotation {rotation.name} uses the unknown shift template {name}"
+            raise ValueError(msg)
+        templates[name] = template
+    shifts_by_template = {name: shift_from_template(template) for name, template in templates.items()}
+
+    fill = RotationFill({}, [])
+    day = start
+    while day <= end:
+        template_name = rotation.pattern[(day - anchor).days % len(rotation.pattern)]
+        allowed_week_days = templates[template_name].allowed_week_days if template_name in templates else None
+        if template_name == ROTATION_DAY_OFF:
+            fill.shifts[day] = None
+        elif allowed_week_days is not None and day.weekday() not in allowed_week_days:
+            fill.skipped.append(day)
+        else:
+            fill.shifts[day] = shifts_by_template[template_name]
+        day += ONE_DAY
+
+    return fill
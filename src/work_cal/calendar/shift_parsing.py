@@ -1,29 +1,32 @@
-from datetime import date, datetime, time
+from datetime import UTC
 
 from ics import Calendar, Event
 
 from work_cal.calendar.event import create_calendar_event
+from work_cal.calendar.ics_writer import event_uid, resolver_for_config
+from work_cal.calendar.timezones import ShiftBounds
 from work_cal.config import get_config
 from work_cal.models import Shift, ShiftStateDump
 
 
-def _date_to_datetime(day: date, hour: int, minute: int) -> datetime:
-    tzinfo = get_config().timezone
-    return datetime.combine(day, time(hour, minute, 0, 0, tzinfo=tzinfo))
+def shift_to_event(shift: Shift, bounds: ShiftBounds, uid: str | None = None) -> Event:
+    start_date = bounds.start_utc.replace(tzinfo=UTC)
+    end_date = bounds.end_utc.replace(tzinfo=UTC)
 
-
-def shift_to_event(day: date, shift: Shift) -> Event:
-    start_date = _date_to_datetime(day, shift.start_hour, shift.start_minute)
-    end_date = _date_to_datetime(day, shift.end_hour, shift.end_minute)
-
-    return create_calendar_event(start_date, end_date, shift.name)
+    return create_calendar_event(start_date, end_date, shift.name, uid=uid)
 
 
 def shift_state_dump_to_calendar(shift_state: ShiftStateDump, calendar: Calendar | None = None) -> Calendar:
     if calendar is None:
         calendar = Calendar()
 
+    config = get_config()
+    resolver = resolver_for_config(shift_state.shift_map, config)
+    if resolver is None:
+        return calendar
+
     for day, shift in shift_state.shift_map.items():
-        calendar.events.add(shift_to_event(day, shift))
+        bounds = resolver.resolve_shift(day, shift)
+        calendar.events.add(shift_to_event(shift, bounds, event_uid(config.worker_name, day)))
 
     return calendar
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+from work_cal.config import DstFoldPolicy, DstGapPolicy
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from zoneinfo import ZoneInfo
+
+    from work_cal.models import Shift
+
+ONE_DAY = timedelta(days=1)
+MINUTES_OF_DAY = tuple(timedelta(minutes=minute) for minute in range(24 * 60))  # building timedeltas is slow
+ICS_LOCAL_FORMAT = "%Y%m%dT%H%M%S"
+
+
+class NonExistentLocalTimeError(ValueError):
+    pass
+
+
+class AmbiguousLocalTimeError(ValueError):
+    pass
+
+
+class Transition(NamedTuple):
+    utc: datetime  # naive, in UTC
+    offset_before: timedelta
+    offset_after: timedelta
+    is_dst_after: bool
+    name_after: str
+
+    @property
+    def wall_before(self) -> datetime:
+        """Local wall time at which the clocks change, as read on the clock before the change."""
+        return self.utc + self.offset_before
+
+    @property
+    def wall_after(self) -> datetime:
+        return self.utc + self.offset_after
+
+
+class ShiftBounds(NamedTuple):
+    start_utc: datetime  # naive, in UTC
+    end_utc: datetime
+    start_local: datetime  # naive wall time after applying the DST policies
+    end_local: datetime
+
+
+def _utc_offset(tz: ZoneInfo, utc: datetime) -> timedelta:
+    return tz.utcoffset(utc.replace(tzinfo=UTC).astimezone(tz)) or timedelta()
+
+
+def _find_transition_instant(tz: ZoneInfo, low: datetime, high: datetime) -> datetime:
+    # the offset differs at low and high, bisect down to the minute the offset changes
+    offset_low = _utc_offset(tz, low)
+    while high - low > timedelta(minutes=1):
+        middle = low + (high - low) / 2
+        middle = middle.replace(second=0, microsecond=0)
+        if _utc_offset(tz, middle) == offset_low:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+@lru_cache(maxsize=64)
+def find_transitions(tz: ZoneInfo, start: date, end: date) -> tuple[Transition, ...]:
+    """Return every UTC offset change between ``start`` and ``end``, scanning the span once per day."""  # noqa: DOC201
+    transitions: list[Transition] = []
+    cursor = datetime.combine(start - ONE_DAY, datetime.min.time())
+    stop = datetime.combine(end + ONE_DAY, datetime.min.time())
+    offset = _utc_offset(tz, cursor)
+
+    while cursor < stop:
+        following = cursor + ONE_DAY
+        following_offset = _utc_offset(tz, following)
+        if following_offset != offset:
+            instant = _find_transition_instant(tz, cursor, following)
+            aware = instant.replace(tzinfo=UTC).astimezone(tz)
+            transitions.append(
+                Transition(instant, offset, following_offset, bool(aware.dst()), aware.tzname() or str(tz)),
+            )
+            offset = following_offset
+        cursor = following
+
+    return tuple(transitions)
+
+
+class TimezoneResolver:
+
+    """Converts local shift times to UTC for a whole date span at once.
+
+    Offsets are looked up from the precomputed transition list, only days on which the clocks change
+    need any extra work and those follow the configured gap and fold policies.
+    """
+
+    def __init__(
+        self,
+        tz: ZoneInfo,
+        start: date,
+        end: date,
+        gap_policy: DstGapPolicy = DstGapPolicy.SHIFT_FORWARD,
+        fold_policy: DstFoldPolicy = DstFoldPolicy.EARLIER,
+    ) -> None:
+        self.tz = tz
+        self.start = start
+        self.end = end
+        self.gap_policy = gap_policy
+        self.fold_policy = fold_policy
+        self.transitions = find_transitions(tz, start, end)
+        self.initial_offset = _utc_offset(tz, datetime.combine(start - ONE_DAY, datetime.min.time()))
+
+        self._transition_walls = [transition.wall_before for transition in self.transitions]
+        self._transition_instants = [transition.utc for transition in self.transitions]
+        self._offsets = [self.initial_offset, *(transition.offset_after for transition in self.transitions)]
+        self._transition_days: dict[date, Transition] = {}
+        for transition in self.transitions:
+            self._transition_days[transition.wall_before.date()] = transition
+            self._transition_days[transition.wall_after.date()] = transition
+
+    def _resolve_on_transition_day(self, wall: datetime, transition: Transition) -> timedelta:
+        before, after = transition.offset_before, transition.offset_after
+        low, high = sorted((transition.wall_before, transition.wall_after))
+
+        if wall < low:
+            return before
+        if wall >= high:
+            return after
+
+        if after > before:  # spring forward, wall time does not exist
+            if self.gap_policy is DstGapPolicy.RAISE:
+                msg = f"{wall} does not exist in {self.tz}"
+                raise NonExistentLocalTimeError(msg)
+            return before if self.gap_policy is DstGapPolicy.SHIFT_FORWARD else after
+
+        if self.fold_policy is DstFoldPolicy.RAISE:
+            msg = f"{wall} is ambiguous in {self.tz}"
+            raise AmbiguousLocalTimeError(msg)
+        return before if self.fold_policy is DstFoldPolicy.EARLIER else after
+
+    def vtimezone_lines(self) -> tuple[str, ...]:
+        return vtimezone_lines(self.tz, self.start, self.end)
+
+    def offset_for(self, wall: datetime) -> timedelta:
+        transition = self._transition_days.get(wall.date())
+        if transition is not None:
+            return self._resolve_on_transition_day(wall, transition)
+
+        return self._offsets[bisect_right(self._transition_walls, wall)]
+
+    def to_utc(self, wall: datetime) -> tuple[datetime, datetime]:
+        """Return the UTC instant and the wall time it shows on the clock (they differ only inside DST gaps)."""  # noqa: DOC201
+        offset = self.offset_for(wall)
+        utc = wall - offset
+        if wall.date() not in self._transition_days:
+            return utc, wall
+
+        return utc, utc + self._offsets[bisect_right(self._transition_instants, utc)]
+
+    def resolve_shift(self, day: date, shift: Shift) -> ShiftBounds:
+        midnight = datetime(day.year, day.month, day.day)  # noqa: DTZ001
+        start = midnight + MINUTES_OF_DAY[shift.start_hour * 60 + shift.start_minute]
+        end = midnight + MINUTES_OF_DAY[shift.end_hour * 60 + shift.end_minute]
+        if end < start:  # overnight shift, ends on the next day
+            end += ONE_DAY
+        elif day not in self._transition_days:  # fast path, both ends share one offset
+            offset = self._offsets[bisect_right(self._transition_walls, midnight)]
+            return ShiftBounds(start - offset, end - offset, start, end)
+
+        try:
+            start_utc, start_local = self.to_utc(start)
+            end_utc, end_local = self.to_utc(end)
+        except (NonExistentLocalTimeError, AmbiguousLocalTimeError) as e:
+            msg = f"shift on {day}: {e}"
+            raise type(e)(msg) from e
+        return ShiftBounds(start_utc, end_utc, start_local, end_local)
+
+
+def date_span(days: Iterable[date]) -> tuple[date, date] | None:
+    first: date | None = None
+    last: date | None = None
+    for day in days:
+        if first is None or day < first:
+            first = day
+        if last is None or day > last:
+            last = day
+
+    if first is None or last is None:
+        return None
+    return first, last + ONE_DAY  # overnight shifts may end on the day after the last one
+
+
+def resolver_for_days(
+    days: Iterable[date],
+    tz: ZoneInfo,
+    gap_policy: DstGapPolicy = DstGapPolicy.SHIFT_FORWARD,
+    fold_policy: DstFoldPolicy = DstFoldPolicy.EARLIER,
+) -> TimezoneResolver | None:
+    span = date_span(days)
+    if span is None:
+        return None
+
+    return TimezoneResolver(tz, *span, gap_policy=gap_policy, fold_policy=fold_policy)
+
+
+def resolve_shift_map(
+    shift_map: dict[date, Shift],
+    tz: ZoneInfo,
+    gap_policy: DstGapPolicy = DstGapPolicy.SHIFT_FORWARD,
+    fold_policy: DstFoldPolicy = DstFoldPolicy.EARLIER,
+) -> dict[date, ShiftBounds]:
+    """Resolve all shift boundaries of a dump in one pass over a resolver built for the dump's date span."""  # noqa: DOC201
+    resolver = resolver_for_days(shift_map, tz, gap_policy, fold_policy)
+    if resolver is None:
+        return {}
+
+    return {day: resolver.resolve_shift(day, shift) for day, shift in shift_map.items()}
+
+
+def _format_offset(offset: timedelta) -> str:
+    minutes = int(offset.total_seconds()) // 60
+    sign = "-" if minutes < 0 else "+"
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{sign}{hours:02d}{minutes:02d}"
+
+
+def _component_lines(
+    wall: datetime,
+    offset_from: timedelta,
+    offset_to: timedelta,
+    *,
+    dst: bool,
+    name: str,
+) -> list[str]:
+    component = "DAYLIGHT" if dst else "STANDARD"
+    return [
+        f"BEGIN:{component}",
+        f"DTSTART:{wall.strftime(ICS_LOCAL_FORMAT)}",
+        f"TZOFFSETFROM:{_format_offset(offset_from)}",
+        f"TZOFFSETTO:{_format_offset(offset_to)}",
+        f"TZNAME:{name}",
+        f"END:{component}",
+    ]
+
+
+@lru_cache(maxsize=64)
+def vtimezone_lines(tz: ZoneInfo, start: date, end: date) -> tuple[str, ...]:
+    """VTIMEZONE block covering ``start``..``end`` with every transition listed explicitly."""  # noqa: DOC201
+    first = datetime.combine(start - ONE_DAY, datetime.min.time())
+    aware_first = first.replace(tzinfo=tz)
+    initial_offset = _utc_offset(tz, first)
+
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tz.key}"]
+    lines += _component_lines(
+        first, initial_offset, initial_offset, dst=bool(aware_first.dst()), name=aware_first.tzname() or tz.key,
+    )
+    for transition in find_transitions(tz, start, end):
+        lines += _component_lines(
+            transition.wall_before,
+            transition.offset_before,
+            transition.offset_after,
+            dst=transition.is_dst_after,
+            name=transition.name_after,
+        )
+    lines.append("END:VTIMEZONE")
+    return tuple(lines)
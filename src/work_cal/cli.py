@@ -1,14 +1,36 @@
 import calendar
-from datetime import date, datetime
+import os
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import click
 from pyfzf.pyfzf import FzfPrompt
 
+from work_cal.calendar.autoplan import DEFAULT_BUDGET_SECONDS, AutoPlanner, PlanTargets
+from work_cal.calendar.batch_export import ExportResult, export_merged, export_split, filter_dump_files
+from work_cal.calendar.batch_export import export_team as export_team_calendars
+from work_cal.calendar.ics_reader import ImportStats, read_shifts
+from work_cal.calendar.ics_writer import write_calendar
+from work_cal.calendar.incremental import incremental_export
+from work_cal.calendar.labour_rules import Violation, intervals_for_shift_map
+from work_cal.calendar.report import GROUPINGS, Grouping, ShiftColumns, write_report_csv
+from work_cal.calendar.rotation import expand_rotation
 from work_cal.calendar.shift_parsing import shift_state_dump_to_calendar
+from work_cal.calendar.timezones import AmbiguousLocalTimeError, NonExistentLocalTimeError
 from work_cal.config import get_config
-from work_cal.models import ShiftStateDump
+from work_cal.models import Shift, ShiftStateDump
+from work_cal.storage.catalog import (
+    CatalogEntry,
+    load_cataloged_dump,
+    make_catalog_entry,
+    record_entries,
+    refresh_catalog,
+    select_entries,
+)
+from work_cal.storage.dump_files import DUMP_GLOBS, DUMP_SUFFIXES, DumpFormat, load_dump, save_dump
+from work_cal.storage.sqlite_store import SqliteShiftStore
 from work_cal.tui.shift_planner import ShiftPlannerApp
+from work_cal.tui.state import PlannerState, determine_dump_filename
 
 
 def get_dates_for_month(year: int, month: int) -> list[date]:
@@ -21,51 +43,609 @@ def main() -> None:
     pass
 
 
+def _selected_dates(month: int | None, year: int, since: datetime | None, until: datetime | None) -> list[date]:
+    if since is not None or until is not None:
+        if since is None or until is None or until < since:
+            msg = "--since and --until must be given together, --until not before --since"
+            raise click.UsageError(msg)
+        return [since.date() + timedelta(days=offset) for offset in range((until - since).days + 1)]
+    if month is None:
+        return [day for month_of_year in range(1, 13) for day in get_dates_for_month(year, month_of_year)]
+    return get_dates_for_month(year, month)
+
+
+def _validate_worker(_ctx: click.Context, _param: click.Parameter, value: str | None) -> str | None:
+    if value is not None and value not in get_config().team:
+        msg = f"{value} is not on the roster: {', '.join(get_config().team)}"
+        raise click.BadParameter(msg)
+    return value
+
+
 @main.command()
-@click.argument("month", type=click.IntRange(1, 12))
+@click.argument("month", type=click.IntRange(1, 12), required=False)
 @click.option("--year", "-y", type=int, default=datetime.now().year, help="Year (default: current year)")  # noqa: DTZ005
-def planner(month: int, year: int) -> None:
-    dates = get_dates_for_month(year, month)
-    app = ShiftPlannerApp(dates)
+@click.option("--since", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First day of a custom range")
+@click.option("--until", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last day of a custom range")
+@click.option("--worker", type=str, default=None, callback=_validate_worker, help="Roster member to plan for")
+def planner(month: int | None, year: int, since: datetime | None, until: datetime | None, worker: str | None) -> None:
+    """Plan MONTH of --year, the whole year when MONTH is left out, or the days from --since to --until."""
+    app = ShiftPlannerApp(_selected_dates(month, year, since, until), worker)
     app.planner_state.attempt_shift_dump_load()
     app.title = "Shift Planner"
     app.sub_title = "Shift Planner"
     app.run()
-    app.planner_state.dump_shift_state()
+    app.dump_shift_states()
+
+
+def _available_dump_files(pattern: str | None = None, dump_location: Path | None = None) -> list[Path]:
+    if dump_location is None:
+        config = get_config()
+        dump_location = config.dump_location_for(config.worker_name)
+    patterns = DUMP_GLOBS if pattern is None else (pattern,)
+    return [path for pattern in patterns for path in dump_location.glob(pattern) if path.is_file()]
+
+
+def _parse_year_month(_ctx: click.Context, _param: click.Parameter, value: str | None) -> tuple[int, int] | None:
+    if value is None:
+        return None
+
+    try:
+        year, month = (int(part) for part in value.split("-"))
+    except ValueError as e:
+        msg = f"Expected YYYY-MM, got {value}"
+        raise click.BadParameter(msg) from e
+
+    if not 1 <= month <= 12:  # noqa: PLR2004
+        msg = f"Invalid month: {month}"
+        raise click.BadParameter(msg)
+
+    return year, month
+
+
+def _month_range_days(
+    since: tuple[int, int] | None,
+    until: tuple[int, int] | None,
+) -> tuple[date | None, date | None]:
+    start = date(*since, 1) if since is not None else None
+    end = date(*until, calendar.monthrange(*until)[1]) if until is not None else None
+    return start, end
+
+
+def _report_export_result(result: ExportResult) -> None:
+    elapsed_ms = result.seconds * 1000
+    if result.ok:
+        duplicates = f", {result.duplicates} already exported from another dump" if result.duplicates else ""
+        click.echo(f"{result.source.name}: {result.shift_count} shifts in {elapsed_ms:.1f} ms{duplicates}")
+    else:
+        click.echo(f"{result.source.name}: FAILED after {elapsed_ms:.1f} ms - {result.error}", err=True)
+
+
+def _batch_dump(filename: str, sources: list[Path], *, split: bool, jobs: int, use_tzid: bool) -> None:
+    if not sources:
+        click.echo("No dump files matched", err=True)
+        return
+
+    if use_tzid and not split:
+        msg = "--tzid is only supported together with --split in batch mode"
+        raise click.UsageError(msg)
+
+    target = Path(filename)
+    results = export_split(sources, target, jobs, use_tzid=use_tzid) if split else export_merged(sources, target, jobs)
+
+    failed = 0
+    for result in results:
+        _report_export_result(result)
+        if not result.ok:
+            failed += 1
+
+    click.echo(f"Exported {len(sources) - failed}/{len(sources)} dump files to {target}")
+    if failed:
+        raise SystemExit(1)
 
 
 @main.command()
 @click.argument("filename", type=str)
-def dump(filename: str) -> None:
-    available_dump_files: list[Path] = []
-    for path in get_config().month_dump_location.iterdir():
-        if not path.is_file():
+@click.option(
+    "--writer",
+    type=click.Choice(["ics", "stream"]),
+    default="ics",
+    show_default=True,
+    help="Build the calendar with the ics library or stream it straight to the file",
+)
+@click.option("--all", "all_dumps", is_flag=True, help="Export every dump file instead of picking one")
+@click.option("--glob", "pattern", type=str, default=None, help="Export dump files matching this glob")
+@click.option("--since", type=str, default=None, callback=_parse_year_month, help="First month to export (YYYY-MM)")
+@click.option("--until", type=str, default=None, callback=_parse_year_month, help="Last month to export (YYYY-MM)")
+@click.option(
+    "--select",
+    type=str,
+    default=None,
+    help="Pick dumps without fzf: a month (YYYY-MM), a year (YYYY) or a worker name",
+)
+@click.option("--split", is_flag=True, help="Write one ICS file per dump into the FILENAME directory")
+@click.option("--jobs", "-j", type=click.IntRange(1), default=os.cpu_count() or 1, help="Export processes")
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only re-serialize days that changed since the last export, tracked in FILENAME.manifest.json",
+)
+@click.option("--delta", type=click.Path(dir_okay=False), default=None, help="Also write changed/cancelled events here")
+@click.option(
+    "--tzid",
+    "use_tzid",
+    is_flag=True,
+    help="Write local times with a VTIMEZONE block instead of UTC times (streaming writer only)",
+)
+def dump(  # noqa: PLR0913, PLR0917
+    filename: str,
+    writer: str,
+    all_dumps: bool,  # noqa: FBT001
+    pattern: str | None,
+    since: tuple[int, int] | None,
+    until: tuple[int, int] | None,
+    select: str | None,
+    split: bool,  # noqa: FBT001
+    jobs: int,
+    incremental: bool,  # noqa: FBT001
+    delta: str | None,
+    use_tzid: bool,  # noqa: FBT001
+) -> None:
+    if all_dumps or pattern is not None or since is not None or until is not None:
+        sources = filter_dump_files(_available_dump_files(pattern), since, until)
+        _batch_dump(filename, sources, split=split, jobs=jobs, use_tzid=use_tzid)
+        return
+
+    config = get_config()
+    dump_location = config.dump_location_for(config.worker_name)
+    catalog = refresh_catalog(dump_location, config.worker_name)
+
+    if select is not None:
+        entries = select_entries(catalog.entries.values(), select)
+        sources = [dump_location / entry.filename for entry in entries]
+        if len(sources) != 1:
+            _batch_dump(filename, sources, split=split, jobs=jobs, use_tzid=use_tzid)
+            return
+
+        [selected_dump_file] = sources
+    else:
+        rows = {entry.describe(): entry for entry in catalog.entries.values()}
+
+        fzf = FzfPrompt()
+
+        selected_rows: list[str] = fzf.prompt(list(rows), fzf_options=config.fzf_options)
+
+        if len(selected_rows) != 1:
+            return
+
+        [selected_row] = selected_rows
+
+        if selected_row not in rows:
+            msg = "Something went wrong"
+            raise RuntimeError(msg)
+
+        selected_dump_file = dump_location / rows[selected_row].filename
+
+    entry = catalog.entries.get(selected_dump_file.name)
+    shift_state_dump = load_dump(selected_dump_file, entry.content_hash if entry is not None else None)
+
+    try:
+        _export_dump(shift_state_dump, Path(filename), writer, incremental=incremental, delta=delta, use_tzid=use_tzid)
+    except (NonExistentLocalTimeError, AmbiguousLocalTimeError) as e:
+        msg = f"Cannot export {selected_dump_file.name}, {e} (see dst_gap_policy and dst_fold_policy)"
+        raise click.ClickException(msg) from e
+
+
+def _export_dump(  # noqa: PLR0913
+    shift_state_dump: ShiftStateDump,
+    target: Path,
+    writer: str,
+    *,
+    incremental: bool,
+    delta: str | None,
+    use_tzid: bool,
+) -> None:
+    if incremental or delta is not None:
+        delta_path = Path(delta) if delta is not None else None
+        result = incremental_export(shift_state_dump, target, delta_path, use_tzid=use_tzid)
+        click.echo(
+            f"{len(result.changed)} changed, {result.unchanged} unchanged, {len(result.cancelled)} cancelled events",
+        )
+        return
+
+    if writer == "stream" or use_tzid:
+        try:
+            with target.open("w", encoding="utf-8", newline="") as stream:
+                write_calendar(shift_state_dump, stream, use_tzid=use_tzid)
+        except ValueError:
+            target.unlink()  # the events before the failing one are already written
+            raise
+        return
+
+    calendar_obj = shift_state_dump_to_calendar(shift_state_dump)
+
+    target.write_text(calendar_obj.serialize(), encoding="utf-8")
+
+
+@main.command(name="import")
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+@click.option("--overwrite", is_flag=True, help="Replace existing month dumps instead of merging the events into them")
+def import_(filename: str, overwrite: bool) -> None:  # noqa: FBT001
+    config = get_config()
+    stats = ImportStats()
+
+    # only one Shift per day is kept, so memory is bounded by the days covered, not the size of the file
+    month_to_shift_map: dict[str, dict[date, Shift]] = {}
+    with Path(filename).open(encoding="utf-8") as stream:
+        for day, shift in read_shifts(stream, config.timezone, config.shift_types, stats):
+            dump_filename = determine_dump_filename((day,), DUMP_SUFFIXES[config.dump_format])
+            shift_map = month_to_shift_map.setdefault(dump_filename, {})
+            if day in shift_map:
+                stats.skip("second event on the same day")
+                continue
+
+            shift_map[day] = shift
+            stats.imported += 1
+
+    dump_location = config.dump_location_for(config.worker_name)
+    dump_location.mkdir(parents=True, exist_ok=True)
+    entries: list[CatalogEntry] = []
+    for dump_filename, shift_map in sorted(month_to_shift_map.items()):
+        dump_path = dump_location / dump_filename
+        merged_shift_map: dict[date, Shift] = {}
+        if dump_path.is_file() and not overwrite:
+            merged_shift_map = load_dump(dump_path).shift_map
+        merged_shift_map.update(shift_map)
+
+        merged_shift_map = dict(sorted(merged_shift_map.items()))
+        save_dump(dump_path, ShiftStateDump(shift_map=merged_shift_map))
+        entries.append(make_catalog_entry(dump_path, merged_shift_map, config.worker_name))
+        click.echo(f"{dump_filename}: {len(shift_map)} shifts")
+    record_entries(dump_location, entries)
+
+    click.echo(f"Imported {stats.imported} of {stats.events} events into {len(month_to_shift_map)} dump files")
+    for reason, count in sorted(stats.skipped.items()):
+        click.echo(f"  skipped {count}: {reason}")
+
+
+@main.command()
+@click.option("--to", "target_format", type=click.Choice(list(DUMP_SUFFIXES)), required=True, help="Target format")
+@click.option("--keep", is_flag=True, help="Keep the source files instead of replacing them")
+def convert(target_format: DumpFormat, keep: bool) -> None:  # noqa: FBT001
+    config = get_config()
+    suffix = DUMP_SUFFIXES[target_format]
+    entries: list[CatalogEntry] = []
+    for source in sorted(_available_dump_files()):
+        if source.suffix == suffix:
             continue
 
-        available_dump_files.append(path)
+        target = source.with_suffix(suffix)
+        shift_state = load_dump(source)
+        save_dump(target, shift_state)
+        entries.append(make_catalog_entry(target, shift_state.shift_map, config.worker_name))
+        click.echo(f"{source.name} ({source.stat().st_size} B) -> {target.name} ({target.stat().st_size} B)")
+        if not keep:
+            source.unlink()
+    record_entries(config.dump_location_for(config.worker_name), entries)
+
+
+@main.command(name="migrate-sqlite")
+def migrate_sqlite() -> None:
+    config = get_config()
+    store = SqliteShiftStore(config.sqlite_path)
+    total = 0
+    for worker in config.team:  # roster members keep their dumps in their own namespace
+        for dump_path in _available_dump_files(dump_location=config.dump_location_for(worker)):
+            shift_map = load_dump(dump_path).shift_map
+            store.bulk_insert(worker, shift_map)
+            total += len(shift_map)
+            click.echo(f"{worker}: {dump_path.name}: {len(shift_map)} shifts")
+
+    store.close()
+    click.echo(f"Migrated {total} shifts into {config.sqlite_path}")
+
+
+@main.command()
+@click.option("--since", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First day (YYYY-MM-DD)")
+@click.option("--until", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last day (YYYY-MM-DD)")
+@click.option("--template", type=str, default=None, help="Only shifts created from this template")
+@click.option("--name", type=str, default=None, help="Only shifts with this name")
+@click.option("--all-workers", is_flag=True, help="Include shifts of every worker, not only the configured one")
+def query(
+    since: datetime | None,
+    until: datetime | None,
+    template: str | None,
+    name: str | None,
+    all_workers: bool,  # noqa: FBT001
+) -> None:
+    config = get_config()
+    store = SqliteShiftStore(config.sqlite_path)
+    rows = store.query(
+        worker=None if all_workers else config.worker_name,
+        start=since.date() if since is not None else None,
+        end=until.date() if until is not None else None,
+        template=template,
+        name=name,
+    )
+    for row in rows:
+        shift = row.shift
+        hours = f"{shift.start_hour:02d}:{shift.start_minute:02d}-{shift.end_hour:02d}:{shift.end_minute:02d}"
+        click.echo(f"{row.day.isoformat()}  {row.worker}  {hours}  {shift.name}")
+    store.close()
+
+
+@main.command()
+@click.option("--since", type=str, default=None, callback=_parse_year_month, help="First month to check (YYYY-MM)")
+@click.option("--until", type=str, default=None, callback=_parse_year_month, help="Last month to check (YYYY-MM)")
+def check(since: tuple[int, int] | None, until: tuple[int, int] | None) -> None:
+    """Report overlapping shifts, dumps that disagree about a day and broken labour rules."""  # noqa: DOC501
+    config = get_config()
+    shift_map: dict[date, Shift] = {}
+    violations: list[Violation] = []
+    if config.storage_backend == "sqlite":
+        store = SqliteShiftStore(config.sqlite_path)
+        start, end = _month_range_days(since, until)
+        shift_map = {row.day: row.shift for row in store.query(worker=config.worker_name, start=start, end=end)}
+        store.close()
+    else:
+        sources: dict[date, Path] = {}
+        for dump_path in sorted(filter_dump_files(_available_dump_files(), since, until)):
+            for day, shift in load_dump(dump_path).shift_map.items():
+                if day in shift_map and shift_map[day] != shift:
+                    message = f"{sources[day].name} and {dump_path.name} hold different shifts"
+                    violations.append(Violation("conflict", day, message))
+                    continue
+                shift_map[day] = shift
+                sources[day] = dump_path
+
+    try:
+        intervals = intervals_for_shift_map(shift_map, config)
+    except (NonExistentLocalTimeError, AmbiguousLocalTimeError) as e:
+        msg = f"Cannot check the shifts, {e} (see dst_gap_policy and dst_fold_policy)"
+        raise click.ClickException(msg) from e
+    violations += intervals.check(config.rules)
+    for violation in sorted(violations, key=lambda violation: violation.day):
+        click.echo(f"{violation.day.isoformat()}  {violation.rule:<16}  {violation.message}")
 
-    fzf = FzfPrompt()
+    click.echo(f"{len(violations)} problems in {len(shift_map)} shifts")
+    if violations:
+        raise SystemExit(1)
 
-    selected_dump_file_list: list[str] = fzf.prompt(available_dump_files, fzf_options=get_config().fzf_options)
 
-    if len(selected_dump_file_list) != 1:
+def _worker_shift_maps(
+    since: tuple[int, int] | None,
+    until: tuple[int, int] | None,
+    *,
+    all_workers: bool,
+) -> dict[str, dict[date, Shift]]:
+    config = get_config()
+    start, end = _month_range_days(since, until)
+    shift_maps: dict[str, dict[date, Shift]] = {}
+    if config.storage_backend == "sqlite":
+        store = SqliteShiftStore(config.sqlite_path)
+        for row in store.query(worker=None if all_workers else config.worker_name, start=start, end=end):
+            shift_maps.setdefault(row.worker, {})[row.day] = row.shift
+        store.close()
+    else:
+        for namespace_worker in config.team if all_workers else [config.worker_name]:
+            dump_location = config.dump_location_for(namespace_worker)
+            catalog = refresh_catalog(dump_location, namespace_worker)
+            for dump_path in filter_dump_files(_available_dump_files(dump_location=dump_location), since, until):
+                entry = catalog.entries.get(dump_path.name)
+                worker = entry.worker_name if entry is not None else namespace_worker
+                if not all_workers and worker != config.worker_name:
+                    continue
+                shift_map = shift_maps.setdefault(worker, {})
+                shift_map.update(
+                    (day, shift)
+                    for day, shift in load_cataloged_dump(dump_path).shift_map.items()
+                    if (start is None or day >= start) and (end is None or day <= end)
+                )
+
+    return shift_maps
+
+
+@main.command()
+@click.option(
+    "--by",
+    "groupings",
+    type=click.Choice(GROUPINGS),
+    multiple=True,
+    default=("month",),
+    show_default=True,
+    help="Group totals by this, can be given more than once",
+)
+@click.option("--since", type=str, default=None, callback=_parse_year_month, help="First month (YYYY-MM)")
+@click.option("--until", type=str, default=None, callback=_parse_year_month, help="Last month (YYYY-MM)")
+@click.option(
+    "--csv",
+    "csv_path",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default=None,
+    help="Write the totals as CSV to this file, - for stdout",
+)
+@click.option("--all-workers", is_flag=True, help="Include shifts of every worker, not only the configured one")
+def report(
+    groupings: tuple[Grouping, ...],
+    since: tuple[int, int] | None,
+    until: tuple[int, int] | None,
+    csv_path: str | None,
+    all_workers: bool,  # noqa: FBT001
+) -> None:
+    """Total hours, night hours (22:00-06:00) and weekend hours per week, month, template or weekday."""
+    columns = ShiftColumns()
+    for worker, shift_map in _worker_shift_maps(since, until, all_workers=all_workers).items():
+        columns.add_shift_map(worker, shift_map)
+    rows = [row for grouping in groupings for row in columns.aggregate(grouping)]
+
+    if csv_path is not None:
+        with click.open_file(csv_path, "w", encoding="utf-8") as stream:
+            write_report_csv(stream, rows)
+        if csv_path != "-":
+            click.echo(f"Wrote {len(rows)} rows for {len(columns)} shifts to {csv_path}")
         return
 
-    [selected_dump_file] = selected_dump_file_list
+    for row in rows:
+        click.echo(
+            f"{row.worker}  {row.grouping:<8}  {row.key:<10}  {row.shifts:4d} shifts  {row.minutes / 60:7.1f} h  "
+            f"night {row.night_minutes / 60:6.1f} h  weekend {row.weekend_minutes / 60:6.1f} h",
+        )
 
-    selected_dump_file = Path(selected_dump_file)
 
-    if selected_dump_file not in available_dump_files:
-        msg = "Something went wrong"
-        raise RuntimeError(msg)
+@main.command()
+@click.argument("rotation_name", type=str)
+@click.argument("month", type=click.IntRange(1, 12), required=False)
+@click.option("--year", "-y", type=int, default=datetime.now().year, help="Year (default: current year)")  # noqa: DTZ005
+@click.option("--since", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First day of a custom range")
+@click.option("--until", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last day of a custom range")
+@click.option(
+    "--anchor",
+    type=click.DateTime(["%Y-%m-%d"]),
+    default=None,
+    help="Day the rotation's first entry falls on (default: the first filled day)",
+)
+@click.option("--worker", type=str, default=None, callback=_validate_worker, help="Roster member to plan for")
+def fill(  # noqa: PLR0913, PLR0917
+    rotation_name: str,
+    month: int | None,
+    year: int,
+    since: datetime | None,
+    until: datetime | None,
+    anchor: datetime | None,
+    worker: str | None,
+) -> None:
+    """Fill MONTH of --year, the whole year or --since..--until with the rotation ROTATION_NAME."""  # noqa: DOC501
+    config = get_config()
+    rotation = config.get_rotation(rotation_name)
+    if rotation is None:
+        msg = f"No rotation named {rotation_name}, configured: {', '.join(r.name for r in config.rotations) or 'none'}"
+        raise click.BadParameter(msg, param_hint="ROTATION_NAME")
 
-    json_dump = selected_dump_file.read_text("utf-8")
+    dates = _selected_dates(month, year, since, until)
+    shift_fill = expand_rotation(
+        rotation,
+        config.template_index,
+        dates[0],
+        dates[-1],
+        anchor.date() if anchor is not None else None,
+    )
+    PlannerState(config, dates, worker_name=worker).set_shifts(shift_fill.shifts)
 
-    shift_state_dump: ShiftStateDump = ShiftStateDump.model_validate_json(json_dump)
+    shift_count = sum(shift is not None for shift in shift_fill.shifts.values())
+    click.echo(f"{rotation.name}: {shift_count} shifts from {dates[0]} to {dates[-1]}")
+    for day in shift_fill.skipped:
+        click.echo(f"{day.isoformat()}  skipped, template not allowed on {day:%A}", err=True)
 
-    calendar_obj = shift_state_dump_to_calendar(shift_state_dump)
 
-    Path(filename).write_text(calendar_obj.serialize(), encoding="utf-8")
+def _parse_fixed_days(_ctx: click.Context, _param: click.Parameter, values: tuple[str, ...]) -> dict[date, str]:
+    fixed: dict[date, str] = {}
+    for value in values:
+        day_str, separator, template_name = value.partition("=")
+        try:
+            day = date.fromisoformat(day_str)
+        except ValueError as e:
+            msg = f"Expected YYYY-MM-DD=TEMPLATE, got {value}"
+            raise click.BadParameter(msg) from e
+        if not separator or not template_name:
+            msg = f"Expected YYYY-MM-DD=TEMPLATE, got {value}"
+            raise click.BadParameter(msg)
+        fixed[day] = template_name
+    return fixed
+
+
+@main.command()
+@click.argument("month", type=click.IntRange(1, 12), required=False)
+@click.option("--year", "-y", type=int, default=datetime.now().year, help="Year (default: current year)")  # noqa: DTZ005
+@click.option("--since", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First day of a custom range")
+@click.option("--until", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last day of a custom range")
+@click.option("--hours", type=click.FloatRange(0), required=True, help="Hours to plan per month")
+@click.option("--off", "days_off", type=click.DateTime(["%Y-%m-%d"]), multiple=True, help="A day off, repeatable")
+@click.option(
+    "--fixed",
+    type=str,
+    multiple=True,
+    callback=_parse_fixed_days,
+    help="A day with a given template, YYYY-MM-DD=TEMPLATE, repeatable",
+)
+@click.option("--seed", type=int, default=0, show_default=True, help="Seed of the search, same seed same plan")
+@click.option("--budget", type=click.FloatRange(0), default=DEFAULT_BUDGET_SECONDS, show_default=True, help="Seconds")
+@click.option("--write", is_flag=True, help="Save the plan into the month dumps, replacing the days it covers")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Save the plan as a dump file here")
+@click.option("--worker", type=str, default=None, callback=_validate_worker, help="Roster member to plan for")
+def autoplan(  # noqa: PLR0913, PLR0917
+    month: int | None,
+    year: int,
+    since: datetime | None,
+    until: datetime | None,
+    hours: float,
+    days_off: tuple[datetime, ...],
+    fixed: dict[date, str],
+    seed: int,
+    budget: float,
+    write: bool,  # noqa: FBT001
+    output: str | None,
+    worker: str | None,
+) -> None:
+    """Propose shifts for MONTH of --year, the whole year or --since..--until that add up to --hours a month.
+
+    Only templates with a start and an end (or a default duration) are used, on the weekdays they allow. The labour
+    rules of the config are treated as hard limits.
+    """  # noqa: DOC501
+    config = get_config()
+    dates = _selected_dates(month, year, since, until)
+    targets = PlanTargets(hours, frozenset(day.date() for day in days_off), fixed)
+    try:
+        planner = AutoPlanner(config.shift_types, config.rules, dates[0], dates[-1], targets)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--fixed") from e
+
+    result = planner.solve(seed=seed, budget_seconds=budget)
+    for (plan_year, plan_month), planned in result.hours_by_month.items():
+        target = result.target_hours_by_month[plan_year, plan_month]
+        click.echo(f"{plan_year}-{plan_month:02d}  {planned:6.1f} h of {target:6.1f} h")
+
+    # the planner counts wall clock hours, the checker also sees DST changes
+    for violation in intervals_for_shift_map(result.shift_map, config).check(config.rules):
+        click.echo(f"{violation.day.isoformat()}  {violation.rule:<16}  {violation.message}", err=True)
+
+    elapsed_ms = result.seconds * 1000
+    click.echo(f"{len(result.shift_map)} shifts, cost {result.cost}, {result.iterations} steps in {elapsed_ms:.0f} ms")
+
+    if output is not None:
+        save_dump(Path(output), ShiftStateDump(shift_map=result.shift_map))
+    if write:
+        PlannerState(config, dates, worker_name=worker).set_shifts({day: result.shift_map.get(day) for day in dates})
+
+
+@main.command(name="export-team")
+@click.argument("target_dir", type=click.Path(file_okay=False))
+@click.option("--since", type=str, default=None, callback=_parse_year_month, help="First month to export (YYYY-MM)")
+@click.option("--until", type=str, default=None, callback=_parse_year_month, help="Last month to export (YYYY-MM)")
+@click.option("--jobs", "-j", type=click.IntRange(1), default=os.cpu_count() or 1, help="Export processes")
+@click.option("--tzid", "use_tzid", is_flag=True, help="Write local times with a VTIMEZONE instead of UTC times")
+def export_team(
+    target_dir: str,
+    since: tuple[int, int] | None,
+    until: tuple[int, int] | None,
+    jobs: int,
+    use_tzid: bool,  # noqa: FBT001
+) -> None:
+    """Write one ICS file per team member (worker_name and the roster) into TARGET_DIR."""  # noqa: DOC501
+    config = get_config()
+    failed = 0
+    for worker_name, result in zip(
+        config.team,
+        export_team_calendars(config, Path(target_dir), jobs, since=since, until=until, use_tzid=use_tzid),
+        strict=True,
+    ):
+        elapsed_ms = result.seconds * 1000
+        if result.ok:
+            click.echo(f"{worker_name}: {result.shift_count} shifts in {elapsed_ms:.1f} ms -> {result.target}")
+        else:
+            failed += 1
+            click.echo(f"{worker_name}: FAILED after {elapsed_ms:.1f} ms - {result.error}", err=True)
+
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -1,25 +1,51 @@
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import pickle  # noqa: S403 only for the config cache, see _read_config_cache
 import re
 import tomllib
-from pathlib import Path  # noqa: TC003 without this pydantic crashes
-from typing import Self
+from enum import StrEnum
+from functools import cache, cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, Self
 from zoneinfo import ZoneInfo  # noqa: TC003 without this pydantic crashes
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from work_cal.base import (
+    DEFAULT_AUTOSAVE_DELAY_SECONDS,
+    DEFAULT_CONFIG_CACHE_FILENAME,
     DEFAULT_CONFIG_DIR,
     DEFAULT_CONFIG_FILENAME,
     DEFAULT_FZF_OPTS,
+    DEFAULT_JOURNAL_COMPACT_EVERY,
     DEFAULT_MONTH_DUMP_LOCATION,
+    DEFAULT_SQLITE_PATH,
     DEFAULT_TIME_ZONE,
+    DEFAULT_UNDO_LIMIT,
     DEFAULT_WORKER_NAME,
 )
+from work_cal.files import atomic_write_bytes
+
+if TYPE_CHECKING:
+    from datetime import date
+
+CONFIG_CACHE_VERSION = 1
+
+type ConfigFileKey = tuple[str, int, int]
 
 HOUR_MINUTE_REGEX = re.compile(r"^([01]\d|2[0-3]):([0-5]\d)$")
 
 
+def _minute_of_day(hour_minute: str | None) -> int | None:
+    if hour_minute is None:
+        return None
+
+    hour, minute = hour_minute.split(":")
+    return int(hour) * 60 + int(minute)
+
+
 def _validate_hour_minute(v: str) -> str:
     parts = v.split(":")
 
@@ -37,7 +63,7 @@ def _validate_hour_minute(v: str) -> str:
 
 class ShiftType(BaseModel):
     model_config = {"arbitrary_types_allowed": True}
-    name: str = "Shift"  # should be unique
+    name: str = "Shift"  # unique, WorkCalConfig rejects duplicates
     end_hour: str | None = None
     start_hour: str | None = None
     default_duration_hours: int | None = None
@@ -51,29 +77,142 @@ class ShiftType(BaseModel):
 
         return _validate_hour_minute(v)
 
+    @cached_property
+    def start_minute_of_day(self) -> int | None:
+        return _minute_of_day(self.start_hour)
+
+    @cached_property
+    def end_minute_of_day(self) -> int | None:
+        return _minute_of_day(self.end_hour)
+
+    @property
+    def effective_end_minute_of_day(self) -> int | None:
+        """``end_hour``, or else ``default_duration_hours`` after the start, wrapped past midnight."""
+        if self.end_minute_of_day is not None:
+            return self.end_minute_of_day
+        if self.start_minute_of_day is None or self.default_duration_hours is None:
+            return None
+        return (self.start_minute_of_day + self.default_duration_hours * 60) % (24 * 60)
+
     @property
     def end_hour_minute(self) -> int | None:
-        if self.end_hour is None:
+        if self.end_minute_of_day is None:
             return None
-        return int(self.end_hour.split(":")[1])
+        return self.end_minute_of_day % 60
 
     @property
     def end_hour_hour(self) -> int | None:
-        if self.end_hour is None:
+        if self.end_minute_of_day is None:
             return None
-        return int(self.end_hour.split(":")[0])
+        return self.end_minute_of_day // 60
 
     @property
     def start_hour_minute(self) -> int | None:
-        if self.start_hour is None:
+        if self.start_minute_of_day is None:
             return None
-        return int(self.start_hour.split(":")[1])
+        return self.start_minute_of_day % 60
 
     @property
     def start_hour_hour(self) -> int | None:
-        if self.start_hour is None:
+        if self.start_minute_of_day is None:
             return None
-        return int(self.start_hour.split(":")[0])
+        return self.start_minute_of_day // 60
+
+
+type TemplateOption = tuple[str, str | None]
+
+NO_TEMPLATE_OPTION: TemplateOption = ("No Template", None)
+DAYS_IN_WEEK = 7
+
+
+class TemplateIndex:
+
+    """Shift templates looked up by name, and the template select options of every weekday, built once per config."""
+
+    def __init__(self, templates: list[ShiftType]) -> None:
+        self.templates = templates
+        self.by_name: dict[str, ShiftType] = {template.name: template for template in templates}
+        # weekdays with the same templates share one list, so the editor can tell by identity that nothing changed
+        shared: dict[tuple[TemplateOption, ...], list[TemplateOption]] = {}
+        self.options_by_weekday: tuple[list[TemplateOption], ...] = tuple(
+            shared.setdefault(tuple(options), options)
+            for options in (
+                [
+                    NO_TEMPLATE_OPTION,
+                    *(
+                        (template.name, template.name)
+                        for template in templates
+                        if template.allowed_week_days is None or weekday in template.allowed_week_days
+                    ),
+                ]
+                for weekday in range(DAYS_IN_WEEK)
+            )
+        )
+
+    def get(self, name: str) -> ShiftType | None:
+        return self.by_name.get(name)
+
+    def options_for(self, day: date) -> list[TemplateOption]:
+        """Options for the template select on ``day``, the same list object for all weekdays with the same templates."""  # noqa: DOC201
+        return self.options_by_weekday[day.weekday()]
+
+
+class DstGapPolicy(StrEnum):
+
+    """How to treat a local time skipped by a DST change, e.g. 02:30 on the spring forward night."""
+
+    SHIFT_FORWARD = "shift_forward"  # 02:30 becomes 03:30
+    SHIFT_BACKWARD = "shift_backward"  # 02:30 becomes 01:30
+    RAISE = "raise"
+
+
+class DstFoldPolicy(StrEnum):
+
+    """How to treat a local time that happens twice when the clocks go back."""
+
+    EARLIER = "earlier"
+    LATER = "later"
+    RAISE = "raise"
+
+
+class LabourRules(BaseModel):
+
+    """Limits checked by ``work_cal check`` and after every edit in the planner, 0 disables a rule."""
+
+    min_rest_hours: float = Field(default=11, ge=0)
+    max_weekly_hours: float = Field(default=48, ge=0)
+    max_monthly_hours: float = Field(default=0, ge=0)
+    max_consecutive_days: int = Field(default=6, ge=0)
+
+
+ROTATION_DAY_OFF = ""
+NAMESPACE_REGEX = re.compile(r"[^\w-]+")
+
+
+def worker_slug(worker_name: str) -> str:
+    return NAMESPACE_REGEX.sub("_", worker_name).strip("_").lower()
+
+
+class RosterWorker(BaseModel):
+
+    """A team member whose dumps live in their own directory under ``month_dump_location``."""
+
+    name: str
+    namespace: str | None = None  # directory name, derived from the name when left out
+
+    @property
+    def dump_namespace(self) -> str:
+        if self.namespace is not None:
+            return self.namespace
+        return worker_slug(self.name)
+
+
+class Rotation(BaseModel):
+
+    """A repeating sequence of shift template names, an empty entry is a day off."""
+
+    name: str
+    pattern: list[str] = Field(min_length=1)
 
 
 def _default_shit_types_factory() -> list[ShiftType]:
@@ -88,13 +227,148 @@ class WorkCalConfig(BaseModel):
     timezone: ZoneInfo = Field(default=DEFAULT_TIME_ZONE)
     fzf_options: str = Field(default=DEFAULT_FZF_OPTS)
     month_dump_location: Path = Field(default=DEFAULT_MONTH_DUMP_LOCATION)
+    dst_gap_policy: DstGapPolicy = DstGapPolicy.SHIFT_FORWARD
+    dst_fold_policy: DstFoldPolicy = DstFoldPolicy.EARLIER
+    journal_compact_every: int = Field(default=DEFAULT_JOURNAL_COMPACT_EVERY, ge=1)
+    autosave_delay_seconds: float = Field(default=DEFAULT_AUTOSAVE_DELAY_SECONDS, ge=0)  # 0 saves on exit only
+    undo_limit: int = Field(default=DEFAULT_UNDO_LIMIT, ge=0)  # planner edits that can be undone, 0 turns undo off
+    storage_backend: Literal["json", "sqlite"] = "json"
+    dump_format: Literal["json", "binary"] = "json"
+    sqlite_path: Path = Field(default=DEFAULT_SQLITE_PATH)
+    rules: LabourRules = Field(default_factory=LabourRules)
+    rotations: list[Rotation] = Field(default_factory=list)
+    roster: list[RosterWorker] = Field(default_factory=list)
+
+    @field_validator("shift_types")  # pyrefly: ignore
+    @classmethod
+    def validate_unique_template_names(cls, v: list[ShiftType]) -> list[ShiftType]:
+        names = [template.name for template in v]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            msg = f"Shift template names must be unique, duplicated: {', '.join(duplicates)}"
+            raise ValueError(msg)
+
+        return v
+
+    @model_validator(mode="after")
+    def validate_rotations(self) -> Self:
+        names = [rotation.name for rotation in self.rotations]
+        if len(set(names)) != len(names):
+            msg = "Rotation names must be unique"
+            raise ValueError(msg)
+
+        for rotation in self.rotations:
+            for template_name in set(rotation.pattern) - {ROTATION_DAY_OFF}:
+                template = self.template_index.get(template_name)
+                if template is None:
+                    msg = f"Rotation {rotation.name} uses the unknown shift template {template_name}"
+                    raise ValueError(msg)
+                if template.start_minute_of_day is None or template.effective_end_minute_of_day is None:
+                    msg = f"Rotation {rotation.name} uses {template_name}, which has no start and end time"
+                    raise ValueError(msg)
+
+        return self
+
+    @model_validator(mode="after")
+    def validate_roster(self) -> Self:
+        for values, what in (
+            ([worker.name for worker in self.roster], "names"),
+            ([worker.dump_namespace for worker in self.roster], "namespaces"),
+        ):
+            if len(set(values)) != len(values):
+                msg = f"Roster {what} must be unique"
+                raise ValueError(msg)
+        if any(not worker.dump_namespace or worker.dump_namespace.startswith(".") for worker in self.roster):
+            msg = "Roster namespaces must be plain directory names"
+            raise ValueError(msg)
+
+        return self
+
+    @property
+    def team(self) -> list[str]:
+        """Everyone with dumps: the configured worker (whose dumps stay in ``month_dump_location``) and the roster."""
+        roster_names = [worker.name for worker in self.roster]
+        return roster_names if self.worker_name in roster_names else [self.worker_name, *roster_names]
+
+    def namespace_for(self, worker_name: str) -> str | None:
+        """Dump directory name of a roster member, None for anyone else."""  # noqa: DOC201
+        for worker in self.roster:
+            if worker.name == worker_name:
+                return worker.dump_namespace
+        return None
+
+    def dump_location_for(self, worker_name: str) -> Path:
+        namespace = self.namespace_for(worker_name)
+        return self.month_dump_location / namespace if namespace is not None else self.month_dump_location
+
+    @cached_property
+    def template_index(self) -> TemplateIndex:
+        return TemplateIndex(self.shift_types)
+
+    def get_rotation(self, name: str) -> Rotation | None:
+        return next((rotation for rotation in self.rotations if rotation.name == name), None)
+
+
+def default_config_path() -> Path:
+    return DEFAULT_CONFIG_DIR / DEFAULT_CONFIG_FILENAME
 
 
-def load_config() -> WorkCalConfig:
-    config_path = DEFAULT_CONFIG_DIR / DEFAULT_CONFIG_FILENAME
-    toml_data = tomllib.loads(config_path.read_text("utf-8")) if config_path.exists() else {}
+def config_file_key(config_path: Path) -> ConfigFileKey | None:
+    """Identify a version of the config file by path, mtime and size; None when there is no config file."""  # noqa: DOC201
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        return None
 
-    return WorkCalConfig(**toml_data)
+    return str(config_path), stat.st_mtime_ns, stat.st_size
+
+
+@cache
+def _config_model_hash() -> str:
+    # the modules defining the config models: a cached config is stale once their fields, defaults or validators change
+    digest = hashlib.blake2b(digest_size=16)
+    for module_path in (Path(__file__), Path(__file__).with_name("base.py")):
+        digest.update(module_path.read_bytes())
+    return digest.hexdigest()
+
+
+def _config_cache_key(file_key: ConfigFileKey) -> tuple[object, ...]:
+    return CONFIG_CACHE_VERSION, *file_key, _config_model_hash()
+
+
+def _read_config_cache(cache_path: Path, cache_key: tuple[object, ...]) -> WorkCalConfig | None:
+    try:
+        with cache_path.open("rb") as stream:
+            cached_key, config = pickle.load(stream)  # noqa: S301 the cache lives next to the config, same trust
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+        return None
+
+    if cached_key != cache_key or not isinstance(config, WorkCalConfig):
+        return None
+
+    return config
+
+
+def load_config(config_path: Path | None = None) -> WorkCalConfig:
+    """Load the config, reusing the validated config cached for this exact version of the file."""  # noqa: DOC201
+    if config_path is None:
+        config_path = default_config_path()
+
+    file_key = config_file_key(config_path)
+    if file_key is None:
+        return WorkCalConfig()
+
+    cache_path = config_path.with_name(DEFAULT_CONFIG_CACHE_FILENAME)
+    cache_key = _config_cache_key(file_key)
+    config = _read_config_cache(cache_path, cache_key)
+    if config is not None:
+        return config
+
+    config = WorkCalConfig(**tomllib.loads(config_path.read_text("utf-8")))
+    with contextlib.suppress(OSError):  # the cache is only an optimization
+        atomic_write_bytes(cache_path, pickle.dumps((cache_key, config)))
+
+    return config
 
 
 class ConfigSingleton:
@@ -105,20 +379,35 @@ class ConfigSingleton:
             cls.instance = super().__new__(cls)
         return cls.instance
 
+    _config_file_key: ConfigFileKey | None = None
+
     def get_config(self) -> WorkCalConfig:
         if self._config is None:
-            self._config = load_config()
+            return self.reload_config()
         return self._config
 
     def reload_config(self) -> WorkCalConfig:
+        self._config_file_key = config_file_key(default_config_path())
         self._config = load_config()
         return self._config
 
+    def set_config(self, config: WorkCalConfig) -> None:
+        """Use an already loaded config, e.g. one handed to a worker process by its parent."""
+        self._config_file_key = config_file_key(default_config_path())
+        self._config = config
+
+    def reload_if_changed(self) -> WorkCalConfig | None:
+        """Reload the config when the file changed since it was last loaded, otherwise return None."""  # noqa: DOC201
+        if self._config is not None and config_file_key(default_config_path()) == self._config_file_key:
+            return None
+        return self.reload_config()
+
     @classmethod
     def reset(cls) -> None:
         if hasattr(cls, "instance"):
             delattr(cls, "instance")
         cls._config = None
+        cls._config_file_key = None
 
 
 def get_config() -> WorkCalConfig:
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` to a temporary file next to ``path`` and rename it over ``path``.
+
+    Readers see either the old or the new contents, never a partially written file.
+    """
+    with tempfile.NamedTemporaryFile(
+        "wb",
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as tmp_file:
+        tmp_file.write(data)
+        tmp_file.flush()
+        os.fsync(tmp_file.fileno())
+
+    os.replace(tmp_file.name, path)  # noqa: PTH105
+
+
+def append_lines(path: Path, lines: Iterable[str], *, durable: bool = True) -> None:
+    """Append ``lines`` to ``path`` in one write, fsynced once when ``durable``."""
+    with path.open("a", encoding="utf-8") as stream:
+        stream.write("".join(line + "\n" for line in lines))
+        if durable:
+            stream.flush()
+            os.fsync(stream.fileno())
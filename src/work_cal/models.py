@@ -1,9 +1,11 @@
 from datetime import date
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Shift(BaseModel):
+    model_config = ConfigDict(frozen=True)  # equal shifts can share one instance, e.g. when decoding binary dumps
+
     name: str
     start_hour: int
     start_minute: int
@@ -13,4 +15,5 @@ class Shift(BaseModel):
 
 
 class ShiftStateDump(BaseModel):
+    schema_version: int | None = None  # set when this tool writes the dump, older dumps do not have it
     shift_map: dict[date, Shift] = Field(default_factory=dict)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import itertools
+import mmap
+import os
+import struct
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Self
+
+from work_cal.files import atomic_write_bytes
+from work_cal.models import Shift
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from types import TracebackType
+
+BINARY_DUMP_SUFFIX = ".wcd"
+BINARY_DUMP_MAGIC = b"WCSD"
+BINARY_DUMP_VERSION = 1
+
+# magic, version, reserved, ordinal of the first day, number of day records, number of strings
+HEADER = struct.Struct("<4sHHIII")
+# start hour, start minute, end hour, end minute, name string index, template string index
+RECORD = struct.Struct("<BBBBHH")
+STRING_OFFSET = struct.Struct("<I")
+ONE_DAY = timedelta(days=1)
+NO_STRING = 0xFFFF  # as name index: no shift on that day, as template index: not created from a template
+
+
+class BinaryDumpError(ValueError):
+    pass
+
+
+def encode_shift_map(shift_map: dict[date, Shift]) -> bytes:
+    """Encode shifts as a header, one fixed-width record per day from the first to the last day and a string table.
+
+    Days without a shift get an empty record, so the record of any day is found by its offset from the first day.
+    """  # noqa: DOC201
+    strings: dict[str, int] = {}
+
+    def string_index(value: str) -> int:
+        if value not in strings:
+            if len(strings) >= NO_STRING:
+                msg = f"A binary dump holds at most {NO_STRING} distinct names"
+                raise BinaryDumpError(msg)
+            strings[value] = len(strings)
+        return strings[value]
+
+    first_ordinal = min(shift_map).toordinal() if shift_map else 0
+    day_count = max(shift_map).toordinal() - first_ordinal + 1 if shift_map else 0
+    empty_record = RECORD.pack(0, 0, 0, 0, NO_STRING, NO_STRING)
+    records = [empty_record] * day_count
+    for day, shift in shift_map.items():
+        template_index = NO_STRING if shift.from_template is None else string_index(shift.from_template)
+        records[day.toordinal() - first_ordinal] = RECORD.pack(
+            shift.start_hour,
+            shift.start_minute,
+            shift.end_hour,
+            shift.end_minute,
+            string_index(shift.name),
+            template_index,
+        )
+
+    encoded_strings = [value.encode() for value in strings]
+    offsets = [0]
+    for encoded in encoded_strings:
+        offsets.append(offsets[-1] + len(encoded))
+
+    return b"".join(
+        (
+            HEADER.pack(BINARY_DUMP_MAGIC, BINARY_DUMP_VERSION, 0, first_ordinal, day_count, len(strings)),
+            *records,
+            *(STRING_OFFSET.pack(offset) for offset in offsets),
+            *encoded_strings,
+        ),
+    )
+
+
+def write_binary_dump(path: Path, shift_map: dict[date, Shift]) -> None:
+    atomic_write_bytes(path, encode_shift_map(shift_map))
+
+
+class BinaryDump:
+
+    """Memory-mapped binary dump, days are decoded only when they are asked for."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as stream:
+            if os.fstat(stream.fileno()).st_size < HEADER.size:  # also an empty file can not be mapped
+                msg = f"{path} is too short to be a binary dump"
+                raise BinaryDumpError(msg)
+            self._buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, first_ordinal, self.day_count, self.string_count = HEADER.unpack_from(self._buffer)
+        self._offsets_start = HEADER.size + self.day_count * RECORD.size
+        self._strings_start = self._offsets_start + (self.string_count + 1) * STRING_OFFSET.size
+        try:
+            self._check_layout(magic, version, first_ordinal)
+        except BinaryDumpError:
+            self.close()
+            raise
+
+        self.first_day = date.fromordinal(first_ordinal) if self.day_count else None
+        self._strings: list[str | None] = [None] * self.string_count
+        self._shifts: dict[tuple[int, ...], Shift] = {}
+
+    def _check_layout(self, magic: bytes, version: int, first_ordinal: int) -> None:
+        """Reject files whose header does not match their size, so a truncated dump fails here and not halfway."""  # noqa: DOC501
+        if magic != BINARY_DUMP_MAGIC or version != BINARY_DUMP_VERSION:
+            msg = f"{self.path} is not a version {BINARY_DUMP_VERSION} binary dump"
+            raise BinaryDumpError(msg)
+
+        if self.day_count and not 1 <= first_ordinal <= date.max.toordinal() - self.day_count + 1:
+            msg = f"{self.path} has days outside the calendar"
+            raise BinaryDumpError(msg)
+
+        if len(self._buffer) < self._strings_start:
+            msg = f"{self.path} is truncated, {len(self._buffer)} of at least {self._strings_start} bytes"
+            raise BinaryDumpError(msg)
+
+        table = self._buffer[self._offsets_start : self._strings_start]
+        offsets = [offset for (offset,) in STRING_OFFSET.iter_unpack(table)]
+        if offsets[0] != 0 or any(start > end for start, end in itertools.pairwise(offsets)):
+            msg = f"{self.path} has a broken string table"
+            raise BinaryDumpError(msg)
+
+        if len(self._buffer) < self._strings_start + offsets[-1]:
+            msg = f"{self.path} is truncated, {len(self._buffer)} of {self._strings_start + offsets[-1]} bytes"
+            raise BinaryDumpError(msg)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def _string(self, index: int) -> str:
+        cached = self._strings[index]
+        if cached is None:
+            position = self._offsets_start + index * STRING_OFFSET.size
+            (start,) = STRING_OFFSET.unpack_from(self._buffer, position)
+            (end,) = STRING_OFFSET.unpack_from(self._buffer, position + STRING_OFFSET.size)
+            cached = self._buffer[self._strings_start + start : self._strings_start + end].decode()
+            self._strings[index] = cached
+        return cached
+
+    def _shift(self, record: tuple[int, int, int, int, int, int]) -> Shift | None:
+        if record[4] == NO_STRING:
+            return None
+
+        # shifts repeat a handful of templates, so each distinct record is built (and validated) only once
+        shift = self._shifts.get(record)
+        if shift is None:
+            start_hour, start_minute, end_hour, end_minute, name_index, template_index = record
+            if name_index >= self.string_count or (template_index != NO_STRING and template_index >= self.string_count):
+                msg = f"{self.path} has a day naming string {max(name_index, template_index)} of {self.string_count}"
+                raise BinaryDumpError(msg)
+
+            shift = Shift(
+                name=self._string(name_index),
+                start_hour=start_hour,
+                start_minute=start_minute,
+                end_hour=end_hour,
+                end_minute=end_minute,
+                from_template=None if template_index == NO_STRING else self._string(template_index),
+            )
+            self._shifts[record] = shift
+        return shift
+
+    def _index(self, day: date) -> int:
+        if self.first_day is None:
+            return -1
+        return day.toordinal() - self.first_day.toordinal()
+
+    def get(self, day: date) -> Shift | None:
+        index = self._index(day)
+        if not 0 <= index < self.day_count:
+            return None
+
+        return self._shift(RECORD.unpack_from(self._buffer, HEADER.size + index * RECORD.size))
+
+    def iter_range(self, start: date, end: date) -> Iterator[tuple[date, Shift]]:
+        """Stream the shifts from ``start`` to ``end`` (inclusive), decoding only the records in that range."""  # noqa: DOC402
+        if self.first_day is None:
+            return
+
+        first = max(self._index(start), 0)
+        last = min(self._index(end), self.day_count - 1)
+        if first > last:
+            return
+
+        records = self._buffer[HEADER.size + first * RECORD.size : HEADER.size + (last + 1) * RECORD.size]
+        day = self.first_day + timedelta(days=first)
+        for record in RECORD.iter_unpack(records):
+            shift = self._shift(record)
+            if shift is not None:
+                yield day, shift
+            day += ONE_DAY
+
+    def shift_map(self) -> dict[date, Shift]:
+        if self.first_day is None:
+            return {}
+
+        last_day = self.first_day + timedelta(days=self.day_count - 1)
+        return dict(self.iter_range(self.first_day, last_day))
+
+
+def read_binary_dump(path: Path) -> dict[date, Shift]:
+    with BinaryDump(path) as binary_dump:
+        return binary_dump.shift_map()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from datetime import date  # noqa: TC003 without this pydantic crashes
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field, ValidationError
+
+from work_cal.files import atomic_write_text
+from work_cal.storage.dump_files import DUMP_GLOBS, content_hash, load_dump
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from work_cal.models import Shift, ShiftStateDump
+
+CATALOG_FILENAME = "catalog.json"
+CATALOG_VERSION = 2
+MINUTES_PER_DAY = 24 * 60
+
+
+class CatalogEntry(BaseModel):
+    filename: str
+    worker_name: str
+    first_day: date | None
+    last_day: date | None
+    months: list[tuple[int, int]]  # (year, month) of every month with shifts, a dump may skip some
+    shift_count: int
+    templates: list[str]
+    total_hours: float
+    mtime_ns: int
+    content_hash: str
+
+    def describe(self) -> str:
+        """One line picker row; the filename comes first so the selection can be mapped back to the file."""  # noqa: DOC201
+        span = f"{self.first_day} .. {self.last_day}" if self.first_day is not None else "empty"
+        templates = ", ".join(self.templates) or "-"
+        return (
+            f"{self.filename}  |  {self.worker_name}  |  {span}  |  {self.shift_count:3d} shifts  |  "
+            f"{self.total_hours:6.1f} h  |  {templates}"
+        )
+
+
+class DumpCatalog(BaseModel):
+    version: int = CATALOG_VERSION
+    entries: dict[str, CatalogEntry] = Field(default_factory=dict)
+
+
+def shift_minutes(shift: Shift) -> int:
+    # overnight shifts end on the next day
+    return (shift.end_hour * 60 + shift.end_minute - shift.start_hour * 60 - shift.start_minute) % MINUTES_PER_DAY
+
+
+def catalog_path_for(dump_location: Path) -> Path:
+    return dump_location / CATALOG_FILENAME
+
+
+def load_catalog(dump_location: Path) -> DumpCatalog:
+    path = catalog_path_for(dump_location)
+    if not path.is_file():
+        return DumpCatalog()
+
+    try:
+        catalog = DumpCatalog.model_validate_json(path.read_text("utf-8"))
+    except ValidationError:
+        return DumpCatalog()  # a broken catalog is rebuilt from the dumps
+
+    return catalog if catalog.version == CATALOG_VERSION else DumpCatalog()
+
+
+def save_catalog(dump_location: Path, catalog: DumpCatalog) -> None:
+    atomic_write_text(catalog_path_for(dump_location), catalog.model_dump_json())
+
+
+def make_catalog_entry(path: Path, shift_map: dict[date, Shift], worker_name: str) -> CatalogEntry:
+    """Describe the dump at ``path``, ``shift_map`` must be its current contents."""  # noqa: DOC201
+    templates = {shift.from_template for shift in shift_map.values() if shift.from_template is not None}
+    return CatalogEntry(
+        filename=path.name,
+        worker_name=worker_name,
+        first_day=min(shift_map, default=None),
+        last_day=max(shift_map, default=None),
+        months=sorted({(day.year, day.month) for day in shift_map}),
+        shift_count=len(shift_map),
+        templates=sorted(templates),
+        total_hours=sum(shift_minutes(shift) for shift in shift_map.values()) / 60,
+        mtime_ns=path.stat().st_mtime_ns,
+        content_hash=content_hash(path.read_bytes()),
+    )
+
+
+def record_entries(dump_location: Path, entries: list[CatalogEntry]) -> None:
+    """Update the catalog entries of dumps that were just written there, rewriting the catalog once for all of them."""
+    if not entries:
+        return
+
+    catalog = load_catalog(dump_location)
+    for entry in entries:
+        catalog.entries[entry.filename] = entry
+    save_catalog(dump_location, catalog)
+
+
+def refresh_catalog(dump_location: Path, worker_name: str) -> DumpCatalog:
+    """Bring the catalog in line with the dump directory and return it.
+
+    Only dumps that are new or whose mtime changed since they were cataloged (e.g. edited by hand) are opened,
+    for everything else a ``stat`` is enough.
+    """  # noqa: DOC201
+    catalog = load_catalog(dump_location)
+    paths = [path for pattern in DUMP_GLOBS for path in dump_location.glob(pattern) if path.is_file()]
+    changed = False
+
+    entries: dict[str, CatalogEntry] = {}
+    for path in paths:
+        entry = catalog.entries.get(path.name)
+        if entry is None or entry.mtime_ns != path.stat().st_mtime_ns:
+            try:
+                shift_map = load_dump(path).shift_map
+            except (OSError, ValueError):
+                continue  # unreadable dumps are left out of the catalog
+
+            entry = make_catalog_entry(path, shift_map, entry.worker_name if entry is not None else worker_name)
+            changed = True
+        entries[path.name] = entry
+
+    if changed or entries.keys() != catalog.entries.keys():
+        catalog.entries = dict(sorted(entries.items()))
+        save_catalog(dump_location, catalog)
+
+    return catalog
+
+
+def load_cataloged_dump(path: Path) -> ShiftStateDump:
+    """Load a dump, trusting it when it is byte for byte the file the catalog recorded."""  # noqa: DOC201
+    entry = load_catalog(path.parent).entries.get(path.name)
+    return load_dump(path, entry.content_hash if entry is not None else None)
+
+
+def select_entries(entries: Iterable[CatalogEntry], query: str) -> list[CatalogEntry]:
+    """Entries matching ``query``: a month (``YYYY-MM``), a year (``YYYY``) or otherwise a worker name."""  # noqa: DOC201
+    year_str, _, month_str = query.partition("-")
+    if year_str.isdigit() and len(year_str) == 4 and (not month_str or month_str.isdigit()):  # noqa: PLR2004
+        year = int(year_str)
+        if month_str:
+            month = int(month_str)
+            return [entry for entry in entries if (year, month) in entry.months]
+        return [entry for entry in entries if any(entry_year == year for entry_year, _ in entry.months)]
+
+    return [entry for entry in entries if entry.worker_name == query]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import date
+from typing import TYPE_CHECKING, Literal
+
+from work_cal.files import atomic_write_bytes
+from work_cal.models import Shift, ShiftStateDump
+from work_cal.storage.binary_dump import BINARY_DUMP_SUFFIX, read_binary_dump, write_binary_dump
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+type DumpFormat = Literal["json", "binary"]
+
+JSON_DUMP_SUFFIX = ".json"
+DUMP_SUFFIXES: dict[DumpFormat, str] = {"json": JSON_DUMP_SUFFIX, "binary": BINARY_DUMP_SUFFIX}
+DUMP_GLOBS = tuple(f"shift_dump_*{suffix}" for suffix in DUMP_SUFFIXES.values())
+DUMP_SCHEMA_VERSION = 1
+TRUSTED_DUMP_PREFIX = f'{{"schema_version":{DUMP_SCHEMA_VERSION},"shift_map":{{'
+TRUSTED_DAY_SEPARATOR = '},"'
+ISO_DATE_LENGTH = len("YYYY-MM-DD")
+
+
+def dump_format_for(path: Path) -> DumpFormat:
+    return "binary" if path.suffix == BINARY_DUMP_SUFFIX else "json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _decode_trusted_json(data: bytes) -> ShiftStateDump | None:
+    """Decode a dump laid out exactly as ``save_dump`` writes it, None when the layout is any different.
+
+    The days are cut apart with ``str.split`` instead of a JSON parser and every distinct shift object is validated
+    once and then shared, so a day costs little more than a dictionary lookup. A separator inside a shift name can
+    only produce fragments that fail to validate, which makes the caller fall back to full validation.
+    """  # noqa: DOC201
+    text = data.decode("utf-8")
+    if not text.startswith(TRUSTED_DUMP_PREFIX) or not text.endswith("}}"):
+        return None
+
+    body = text[len(TRUSTED_DUMP_PREFIX) : -2]  # '"<day>":{<shift>},"<day>":{<shift>}' or empty
+    if not body:
+        return ShiftStateDump.model_construct(schema_version=DUMP_SCHEMA_VERSION, shift_map={})
+
+    shifts: dict[str, Shift] = {}
+    shift_map: dict[date, Shift] = {}
+    for item in body[1:-1].split(TRUSTED_DAY_SEPARATOR):  # '<day>":{<shift fields>'
+        if item[ISO_DATE_LENGTH : ISO_DATE_LENGTH + 3] != '":{':
+            return None
+
+        shift_fields = item[ISO_DATE_LENGTH + 2 :]
+        shift = shifts.get(shift_fields)
+        if shift is None:
+            shift = shifts[shift_fields] = Shift.model_validate_json(shift_fields + "}")
+        shift_map[date.fromisoformat(item[:ISO_DATE_LENGTH])] = shift
+
+    return ShiftStateDump.model_construct(schema_version=DUMP_SCHEMA_VERSION, shift_map=shift_map)
+
+
+def load_dump(path: Path, trusted_hash: str | None = None) -> ShiftStateDump:
+    """Load a dump in either format, picked by the file suffix.
+
+    A JSON dump whose content hash equals ``trusted_hash`` (recorded when this tool wrote it) and which carries the
+    current schema version skips the per-day validation, anything else gets fully validated.
+    """  # noqa: DOC201
+    if dump_format_for(path) == "binary":
+        return ShiftStateDump(shift_map=read_binary_dump(path))
+
+    data = path.read_bytes()
+    if trusted_hash is not None and content_hash(data) == trusted_hash:
+        try:
+            shift_state = _decode_trusted_json(data)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            shift_state = None
+        if shift_state is not None:
+            return shift_state
+
+    return ShiftStateDump.model_validate_json(data)
+
+
+def save_dump(path: Path, shift_state: ShiftStateDump) -> None:
+    if dump_format_for(path) == "binary":
+        write_binary_dump(path, shift_state.shift_map)
+        return
+
+    shift_state = shift_state.model_copy(update={"schema_version": DUMP_SCHEMA_VERSION})
+    atomic_write_bytes(path, shift_state.model_dump_json().encode("utf-8"))
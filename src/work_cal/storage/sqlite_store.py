@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from datetime import date
+from typing import TYPE_CHECKING, NamedTuple
+
+from work_cal.models import Shift
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shifts (
+    worker TEXT NOT NULL,
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    start_hour INTEGER NOT NULL,
+    start_minute INTEGER NOT NULL,
+    end_hour INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL,
+    from_template TEXT,
+    PRIMARY KEY (worker, day)
+);
+CREATE INDEX IF NOT EXISTS shifts_by_day ON shifts (day, worker);
+CREATE INDEX IF NOT EXISTS shifts_by_template ON shifts (from_template, day);
+"""
+
+UPSERT_SQL = """
+INSERT INTO shifts (worker, day, name, start_hour, start_minute, end_hour, end_minute, from_template)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (worker, day) DO UPDATE SET
+    name = excluded.name,
+    start_hour = excluded.start_hour,
+    start_minute = excluded.start_minute,
+    end_hour = excluded.end_hour,
+    end_minute = excluded.end_minute,
+    from_template = excluded.from_template
+"""
+
+SELECT_COLUMNS = "worker, day, name, start_hour, start_minute, end_hour, end_minute, from_template"
+
+
+class ShiftRow(NamedTuple):
+    worker: str
+    day: date
+    shift: Shift
+
+
+def _row_to_shift_row(row: tuple) -> ShiftRow:
+    worker, day, name, start_hour, start_minute, end_hour, end_minute, from_template = row
+    shift = Shift(
+        name=name,
+        start_hour=start_hour,
+        start_minute=start_minute,
+        end_hour=end_hour,
+        end_minute=end_minute,
+        from_template=from_template,
+    )
+    return ShiftRow(worker, date.fromisoformat(day), shift)
+
+
+def _shift_params(worker: str, day: date, shift: Shift) -> tuple:
+    return (
+        worker,
+        day.isoformat(),
+        shift.name,
+        shift.start_hour,
+        shift.start_minute,
+        shift.end_hour,
+        shift.end_minute,
+        shift.from_template,
+    )
+
+
+class SqliteShiftStore:
+
+    """Shifts of every worker in one SQLite database, indexed by day, worker and template."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def load_range(self, worker: str, start: date, end: date) -> dict[date, Shift]:
+        rows = self.query(worker=worker, start=start, end=end)
+        return {row.day: row.shift for row in rows}
+
+    def save_days(self, worker: str, days: Iterable[date], shift_map: dict[date, Shift]) -> None:
+        """Make the stored shifts of ``days`` equal ``shift_map``, in a single transaction."""
+        emptied = [(worker, day.isoformat()) for day in days if day not in shift_map]
+        with self._connection:
+            self._connection.executemany("DELETE FROM shifts WHERE worker = ? AND day = ?", emptied)
+            self._connection.executemany(
+                UPSERT_SQL,
+                (_shift_params(worker, day, shift) for day, shift in shift_map.items()),
+            )
+
+    def bulk_insert(self, worker: str, shift_map: dict[date, Shift]) -> None:
+        self.save_days(worker, (), shift_map)
+
+    def query(
+        self,
+        *,
+        worker: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        template: str | None = None,
+        name: str | None = None,
+    ) -> Iterator[ShiftRow]:
+        """Stream stored shifts ordered by day; every filter is optional and ``start``/``end`` are inclusive."""  # noqa: DOC402
+        clauses: list[str] = []
+        params: list[str] = []
+        for clause, value in (
+            ("worker = ?", worker),
+            ("day >= ?", start.isoformat() if start is not None else None),
+            ("day <= ?", end.isoformat() if end is not None else None),
+            ("from_template = ?", template),
+            ("name = ?", name),
+        ):
+            if value is None:
+                continue
+            clauses.append(clause)
+            params.append(value)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {SELECT_COLUMNS} FROM shifts {where} ORDER BY day, worker"  # noqa: S608 only fixed clauses
+        with closing(self._connection.execute(sql, params)) as cursor:
+            for row in cursor:
+                yield _row_to_shift_row(row)
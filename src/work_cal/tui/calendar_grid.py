@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, ClassVar
+
+from rich.segment import Segment
+from textual.binding import Binding, BindingType
+from textual.cache import LRUCache
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from work_cal.tui.errors import PlannerStateNotSetError
+from work_cal.tui.state import month_key
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from textual import events
+
+    from work_cal.tui.state import MonthKey, PlannerState
+
+ONE_WEEK = timedelta(days=7)
+THURSDAY = timedelta(days=3)
+LABEL_WIDTH = 4  # month name in front of the week it starts in, the year in the header
+CELL_WIDTH = 6  # "dd Sh "
+WEEKDAY_HEADER = "".join(f"{name:<{CELL_WIDTH}}" for name in ("Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"))
+CACHED_WEEKS = 128  # cell labels kept around, a few screens' worth, so memory does not grow with the range
+
+
+class CalendarGrid(ScrollView, can_focus=True):
+
+    """Weeks of the planner session as rows of seven day cells, rendered line by line.
+
+    Only the weeks in view are rendered. Cell labels are cached per day in a bounded cache and dropped again by
+    ``refresh_days`` when a day changes. Months that scroll into view are drawn as placeholders and loaded from their
+    dumps after the frame; months scrolled out of view are unloaded again, unless they have unsaved edits.
+    """
+
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("left", "move_cursor(-1)", "Previous day", show=False),
+        Binding("right", "move_cursor(1)", "Next day", show=False),
+        Binding("up", "move_cursor(-7)", "Previous week", show=False),
+        Binding("down", "move_cursor(7)", "Next week", show=False),
+        Binding("pageup", "move_cursor(-28)", "Four weeks back", show=False),
+        Binding("pagedown", "move_cursor(28)", "Four weeks on", show=False),
+        Binding("enter", "select_cursor", "Edit day", show=False),
+    ]
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        "calendar-grid--header",
+        "calendar-grid--month",
+        "calendar-grid--shift",
+        "calendar-grid--cursor",
+        "calendar-grid--outside",
+    }
+
+    DEFAULT_CSS = """
+    CalendarGrid {
+        overflow-x: hidden;
+    }
+
+    CalendarGrid > .calendar-grid--header {
+        text-style: bold;
+        color: $secondary;
+    }
+
+    CalendarGrid > .calendar-grid--month {
+        text-style: bold;
+        color: $accent;
+    }
+
+    CalendarGrid > .calendar-grid--shift {
+        color: $success;
+    }
+
+    CalendarGrid > .calendar-grid--cursor {
+        background: $primary;
+        color: $foreground;
+    }
+
+    CalendarGrid > .calendar-grid--outside {
+        color: $foreground-muted;
+    }
+    """
+
+    def __init__(self, *, id: str | None = None) -> None:  # noqa: A002
+        super().__init__(id=id)
+        self._planner_state: PlannerState | None = None
+        self.first_monday = date.min
+        self.last_day = date.min
+        self.week_count = 0
+        self.cursor_day = date.min
+        self._labels: LRUCache[date, tuple[str, bool]] = LRUCache(CACHED_WEEKS * 7)  # day -> (label, has a shift)
+        self._months_to_load: dict[MonthKey, date] = {}  # months drawn as placeholders, by a day of each
+
+    def set_planner_state(self, state: PlannerState) -> None:
+        self._planner_state = state
+        first_day, self.last_day = state.dates[0], state.dates[-1]
+        self.first_monday = first_day - timedelta(days=first_day.weekday())
+        self.week_count = (self.last_day - self.first_monday).days // 7 + 1
+        self.virtual_size = Size(LABEL_WIDTH + 7 * CELL_WIDTH, self.week_count + 1)  # + the weekday header
+        self._labels.clear()
+        self.move_cursor_to(state.current_day)
+        self.refresh()
+
+    @property
+    def planner_state(self) -> PlannerState:
+        if self._planner_state is None:
+            raise PlannerStateNotSetError
+
+        return self._planner_state
+
+    def _in_session(self, day: date) -> bool:
+        return self.planner_state.dates[0] <= day <= self.last_day
+
+    def _cell_label(self, day: date) -> tuple[str, bool]:
+        cell = self._labels.get(day)
+        if cell is not None:
+            return cell
+
+        if not self.planner_state.is_loaded(day):  # reading the dump is left for after the frame
+            if not self._months_to_load:
+                self.call_after_refresh(self._load_months)
+            self._months_to_load.setdefault(month_key(day), day)
+            return f"{day.day:>2} …  ", False
+
+        shift = self.planner_state.get_day_state(day).shift
+        name = shift.name[:2] if shift is not None else ""
+        cell = (f"{day.day:>2} {name:<2} ", shift is not None)
+        self._labels.set(day, cell)
+        return cell
+
+    def _load_months(self) -> None:
+        """Load the months drawn as placeholders and unload those no longer in view."""
+        if self._planner_state is None:
+            self._months_to_load.clear()
+            return
+
+        state = self.planner_state
+        months, self._months_to_load = self._months_to_load, {}
+        for day in months.values():
+            state.get_day_state(day)
+
+        top = self.first_monday + ONE_WEEK * self.scroll_offset.y
+        bottom = top + ONE_WEEK * max(self.size.height - 1, 1)
+        keep = {month_key(state.current_day), month_key(self.cursor_day)}
+        for key, shard in state.shards.items():
+            if key not in keep and (shard.last_day < top or shard.first_day >= bottom):
+                shard.unload()
+
+        self.refresh_days(day for day in months.values() for day in state.month_days(day))
+
+    def _week_row(self, day: date) -> int:
+        return (day - self.first_monday).days // 7
+
+    def _visible_line(self, row: int) -> int | None:
+        """Line of the widget showing week ``row``, None when it is scrolled out of view."""  # noqa: DOC201
+        line = row - self.scroll_offset.y + 1
+        return line if 1 <= line < self.size.height else None
+
+    def refresh_days(self, days: Iterable[date]) -> None:
+        """Drop the cached labels of ``days`` and repaint the weeks of them that are in view."""
+        days = list(days)
+        for day in days:
+            self._labels.discard(day)
+        self._repaint_days(days)
+
+    def _repaint_days(self, days: Iterable[date]) -> None:
+        lines: set[int] = set()
+        for day in days:
+            line = self._visible_line(self._week_row(day))
+            if line is not None:
+                lines.add(line)
+
+        for line in lines:
+            self.refresh(Region(0, line, self.size.width, 1))
+
+    def refresh_all(self) -> None:
+        self._labels.clear()
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        if self._planner_state is None:
+            return Strip.blank(self.size.width, self.rich_style)
+
+        if y == 0:  # the weekday header stays put while the weeks scroll under it
+            top_week = self.first_monday + ONE_WEEK * min(self.scroll_offset.y, max(self.week_count - 1, 0))
+            header = str((top_week + THURSDAY).year).ljust(LABEL_WIDTH) + WEEKDAY_HEADER  # ISO week year
+            style = self.get_component_rich_style("calendar-grid--header")
+            return Strip([Segment(header, style)]).adjust_cell_length(self.size.width, self.rich_style)
+
+        row = self.scroll_offset.y + y - 1
+        if row >= self.week_count:
+            return Strip.blank(self.size.width, self.rich_style)
+
+        return self._render_week(self.first_monday + ONE_WEEK * row).adjust_cell_length(
+            self.size.width, self.rich_style,
+        )
+
+    def _render_week(self, monday: date) -> Strip:
+        days = [monday + timedelta(days=offset) for offset in range(7)]
+        month_start = next((day for day in days if day.day == 1), monday if monday == self.first_monday else None)
+        label = month_start.strftime("%b") if month_start is not None else ""
+        segments = [Segment(label.ljust(LABEL_WIDTH), self.get_component_rich_style("calendar-grid--month"))]
+
+        for day in days:
+            if not self._in_session(day):
+                outside_style = self.get_component_rich_style("calendar-grid--outside")
+                segments.append(Segment(f"{day.day:>2}".ljust(CELL_WIDTH), outside_style))
+                continue
+
+            cell_label, has_shift = self._cell_label(day)
+            if day == self.cursor_day:
+                style = self.get_component_rich_style("calendar-grid--cursor")
+            elif has_shift:
+                style = self.get_component_rich_style("calendar-grid--shift")
+            else:
+                style = self.rich_style
+            segments.append(Segment(cell_label, style))
+
+        return Strip(segments)
+
+    def move_cursor_to(self, day: date) -> None:
+        previous = self.cursor_day
+        self.cursor_day = min(max(day, self.planner_state.dates[0]), self.last_day)
+        self._repaint_days((previous, self.cursor_day))
+
+        row = self._week_row(self.cursor_day)
+        rows_in_view = max(self.size.height - 1, 1)
+        if row < self.scroll_offset.y:
+            self.scroll_to(y=row, animate=False)
+        elif row >= self.scroll_offset.y + rows_in_view:
+            self.scroll_to(y=row - rows_in_view + 1, animate=False)
+
+    def action_move_cursor(self, days: int) -> None:
+        self.move_cursor_to(self.cursor_day + timedelta(days=days))
+
+    def action_select_cursor(self) -> None:
+        self.post_message(self.DaySelected(self.cursor_day))
+
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None or offset.y == 0 or offset.x < LABEL_WIDTH:
+            return
+
+        row = self.scroll_offset.y + offset.y - 1
+        column = (offset.x - LABEL_WIDTH) // CELL_WIDTH
+        day = self.first_monday + ONE_WEEK * row + timedelta(days=column)
+        if row < self.week_count and column < 7 and self._in_session(day):  # noqa: PLR2004
+            self.move_cursor_to(day)
+            self.post_message(self.DaySelected(day))
+
+    class DaySelected(Message):
+
+        """The user picked ``day`` in the grid to edit it."""
+
+        def __init__(self, day: date) -> None:
+            super().__init__()
+            self.day = day
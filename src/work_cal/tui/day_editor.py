@@ -19,6 +19,7 @@ from work_cal.tui.errors import PlannerStateNotSetError
 if TYPE_CHECKING:
     from textual.app import ComposeResult
 
+    from work_cal.config import TemplateOption
     from work_cal.tui.state import PlannerState
 
 
@@ -34,7 +35,8 @@ class ShiftBuilder:
     """Validate Shift Data before building.
 
     After each setter call the relevant internal data is validated. After an error is
-    thrown the whole objcet is no longer valid and therefore cannot be used
+    thrown the whole objcet is no longer valid and therefore cannot be used. An end before the start is an
+    overnight shift that ends on the next day.
     """
 
     name: str | None = None
@@ -56,26 +58,6 @@ class ShiftBuilder:
             msg = "Minutes must be between 0 and 23"
             raise ShiftParameterError(msg)
 
-    def _validate_timeline(self) -> None:
-        if self.end_hour is None or self.start_hour is None:
-            return
-
-        msg = "End hour must come after start hour"
-
-        if self.end_hour < self.start_hour:
-            raise ShiftParameterError(msg)
-
-        if self.end_hour > self.start_hour:
-            return
-
-        # hours are equal
-
-        if self.end_minute is None or self.start_minute is None:
-            return
-
-        if self.end_minute < self.start_minute:
-            raise ShiftParameterError(msg)
-
     def set_name(self, name: str) -> ShiftBuilder:
         if len(name) == 0:
             msg = "Name is required"
@@ -87,25 +69,21 @@ class ShiftBuilder:
     def set_start_hour(self, hour: int) -> ShiftBuilder:
         self._validate_hour(hour)
         self.start_hour = hour
-        self._validate_timeline()
         return self
 
     def set_end_hour(self, hour: int) -> ShiftBuilder:
         self._validate_hour(hour)
         self.end_hour = hour
-        self._validate_timeline()
         return self
 
     def set_start_minute(self, minute: int) -> ShiftBuilder:
         self._validate_minute(minute)
         self.start_minute = minute
-        self._validate_timeline()
         return self
 
     def set_end_minute(self, minute: int) -> ShiftBuilder:
         self._validate_minute(minute)
         self.end_minute = minute
-        self._validate_timeline()
         return self
 
     def set_from_template(self, from_template: str) -> ShiftBuilder:
@@ -126,10 +104,36 @@ class ShiftBuilder:
         )
 
 
+INPUT_IDS = ("shift-name", "start-hour", "start-minute", "end-hour", "end-minute")
+EMPTY_INPUT_VALUES = ("",) * len(INPUT_IDS)
+
+
 class DayEditor(Static):
+    DEFAULT_CSS = """
+    DayEditor #selected-date {
+        height: 1;
+    }
+    """
+
     def __init__(self) -> None:
         super().__init__()
         self._planner_state: PlannerState | None = None
+        self._template_options: list[TemplateOption] | None = None
+        # created here and kept, so switching days needs no selector lookups
+        self.date_display = Static("No day selected", id="selected-date")
+        self.template_select: Select[str | None] = Select(
+            options=[("No Template", None)],
+            id="template-select",
+            allow_blank=False,
+        )
+        self.inputs: dict[str, Input] = {
+            "shift-name": Input(placeholder="Enter shift name", id="shift-name"),
+            "start-hour": Input(placeholder="HH", id="start-hour", max_length=2),
+            "start-minute": Input(placeholder="MM", id="start-minute", max_length=2),
+            "end-hour": Input(placeholder="HH", id="end-hour", max_length=2),
+            "end-minute": Input(placeholder="MM", id="end-minute", max_length=2),
+        }
+        self._date_text = ""
 
     def set_planner_state(self, state: PlannerState) -> None:
         self._planner_state = state
@@ -142,82 +146,89 @@ class DayEditor(Static):
 
         return self._planner_state
 
-    def compose(self) -> ComposeResult:  # noqa: PLR6301
+    def compose(self) -> ComposeResult:
         with Vertical():
-            yield Static("No day selected", id="selected-date")
+            yield self.date_display
 
-            yield Select(
-                options=[("No Template", None)],
-                id="template-select",
-                allow_blank=False,
-            )
+            yield self.template_select
 
             yield Static("Shift Name:")
-            yield Input(placeholder="Enter shift name", id="shift-name")
+            yield self.inputs["shift-name"]
 
             with Horizontal():
                 with Vertical():
                     yield Static("Start Hour:")
-                    yield Input(placeholder="HH", id="start-hour", max_length=2)
+                    yield self.inputs["start-hour"]
                 with Vertical():
                     yield Static("Start Minute:")
-                    yield Input(placeholder="MM", id="start-minute", max_length=2)
+                    yield self.inputs["start-minute"]
 
             with Horizontal():
                 with Vertical():
                     yield Static("End Hour:")
-                    yield Input(placeholder="HH", id="end-hour", max_length=2)
+                    yield self.inputs["end-hour"]
                 with Vertical():
                     yield Static("End Minute:")
-                    yield Input(placeholder="MM", id="end-minute", max_length=2)
+                    yield self.inputs["end-minute"]
 
             with Horizontal():
                 yield Button("Save Shift", id="save-shift", variant="primary")
                 yield Button("Clear Shift", id="clear-shift", variant="error")
 
-    def _update_template_select_for_day(self) -> None:
-        day = self.planner_state.current_day
-        options: list[tuple[str, str | None]] = [("No Template", None)]
-
-        weekday = day.weekday()
+    def _update_template_select_for_day(self) -> list[TemplateOption]:
+        options = self.planner_state.template_index.options_for(self.planner_state.current_day)
 
-        for tmpl in self.planner_state.templates:
-            if tmpl.allowed_week_days is not None and weekday not in tmpl.allowed_week_days:
-                continue
-
-            options.append((tmpl.name, tmpl.name))
-
-        template_select = self.query_one("#template-select", Select)
-        template_select.set_options(options)
+        template_select = self.template_select
+        if options is self._template_options:  # same weekday bucket, just reset the selection like set_options would
+            if template_select.value is not None:
+                template_select.value = None
+        else:
+            template_select.set_options(options)
+            self._template_options = options
+        return options
+
+    def refresh_templates(self) -> None:
+        """Rebuild the template options after the templates changed, keeping whatever is typed in the inputs."""
+        template_select = self.template_select
+        selected = template_select.value
+        with template_select.prevent(Select.Changed):  # a change event would overwrite the inputs with the template
+            options = self._update_template_select_for_day()
+            if any(value == selected for _, value in options):
+                template_select.value = selected
 
     def reload_day(self) -> None:
-        date_display = self.query_one("#selected-date", Static)
-        date_display.update(f"Editing: {self.planner_state.current_day.strftime('%A, %B %d, %Y')}")
+        """Show the current day, only touching the widgets whose content differs from the day shown before."""
+        date_text = f"Editing: {self.planner_state.current_day.strftime('%A, %B %d, %Y')}"
+        if date_text != self._date_text:
+            self.date_display.update(date_text, layout=False)  # always one line, no need to lay out the editor
+            self._date_text = date_text
 
         self._update_template_select_for_day()
 
-        day_state = self.planner_state.get_current_day_state()
-
-        shift = day_state.shift
+        shift = self.planner_state.get_current_day_state().shift
+        values = EMPTY_INPUT_VALUES
         if shift is not None:
-            self._update_input("#shift-name", str(shift.name))
-            self._update_input("#start-hour", str(shift.start_hour))
-            self._update_input("#start-minute", str(shift.start_minute))
-            self._update_input("#end-hour", str(shift.end_hour))
-            self._update_input("#end-minute", str(shift.end_minute))
-        else:
-            for selector in ("#shift-name", "#start-hour", "#start-minute", "#end-hour", "#end-minute"):
-                self._update_input(selector, "")
+            values = (
+                str(shift.name),
+                str(shift.start_hour),
+                str(shift.start_minute),
+                str(shift.end_hour),
+                str(shift.end_minute),
+            )
+        for input_id, value in zip(INPUT_IDS, values, strict=True):
+            self._update_input(input_id, value)
 
-    def _update_input(self, input_selector: str, value: str) -> None:
-        self.query_one(input_selector, Input).value = value
+    def _update_input(self, input_id: str, value: str) -> None:
+        input_widget = self.inputs[input_id]
+        if input_widget.value != value:  # an unchanged input costs no watcher run, layout or Changed message
+            input_widget.value = value
 
     def _read_input[ParsedType](
         self,
-        input_selector: str,
+        input_id: str,
         factory: typing.Callable[[str], ParsedType],
     ) -> ParsedType | None:
-        value = self.query_one(input_selector, Input).value
+        value = self.inputs[input_id].value
         if value is None:
             return None
 
@@ -225,11 +236,11 @@ class DayEditor(Static):
 
     def _read_input_with_default[ParsedType](
         self,
-        input_selector: str,
+        input_id: str,
         factory: typing.Callable[[str], ParsedType],
         default: ParsedType,
     ) -> ParsedType:
-        input_value_res = self._read_input(input_selector, factory)
+        input_value_res = self._read_input(input_id, factory)
 
         if input_value_res is not None:
             return input_value_res
@@ -250,15 +261,15 @@ class DayEditor(Static):
 
         self.planner_state.get_current_day_state().selected_template = template.name
 
-        self._update_input("#shift-name", template.name)
+        self._update_input("shift-name", template.name)
         if template.start_hour_hour is not None:
-            self._update_input("#start-hour", str(template.start_hour_hour))
+            self._update_input("start-hour", str(template.start_hour_hour))
         if template.start_hour_minute is not None:
-            self._update_input("#start-minute", str(template.start_hour_minute))
-        if template.end_hour_hour is not None:
-            self._update_input("#end-hour", str(template.end_hour_hour))
-        if template.end_hour_minute is not None:
-            self._update_input("#end-minute", str(template.end_hour_minute))
+            self._update_input("start-minute", str(template.start_hour_minute))
+        end = template.effective_end_minute_of_day  # also for templates with only a duration
+        if end is not None:
+            self._update_input("end-hour", str(end // 60))
+            self._update_input("end-minute", str(end % 60))
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "save-shift":
@@ -273,17 +284,15 @@ class DayEditor(Static):
 
     def _save_shift(self) -> None:
         try:
-            name = self.query_one("#shift-name", Input).value.strip()
-            start_hour = self._read_input_with_default("#start-hour", self._str_to_int, 0)
-            start_minute = self._read_input_with_default("#start-minute", self._str_to_int, 0)
-            end_hour = self._read_input_with_default("#end-hour", self._str_to_int, 0)
-            end_minute = self._read_input_with_default("#end-minute", self._str_to_int, 0)
+            name = self.inputs["shift-name"].value.strip()
+            start_hour = self._read_input_with_default("start-hour", self._str_to_int, 0)
+            start_minute = self._read_input_with_default("start-minute", self._str_to_int, 0)
+            end_hour = self._read_input_with_default("end-hour", self._str_to_int, 0)
+            end_minute = self._read_input_with_default("end-minute", self._str_to_int, 0)
         except ValueError:
             self.notify("Invalid time values entered", severity="error")
             return
 
-        current_day_state = self.planner_state.get_current_day_state()
-
         builder = ShiftBuilder()
         try:
             builder \
@@ -297,16 +306,14 @@ class DayEditor(Static):
             return
 
         shift = builder.build()
-        current_day_state.shift = shift
+        current_day_state = self.planner_state.get_current_day_state()
+        self.planner_state.set_shift(self.planner_state.current_day, shift, current_day_state.selected_template)
         self.notify(f"Shift saved: {shift.name}", severity="information")
 
         self.post_message(self.ShiftUpdated())
 
     def _clear_shift(self) -> None:
-        day_state = self.planner_state.get_current_day_state()
-
-        day_state.shift = None
-        day_state.selected_template = None
+        self.planner_state.clear_shift(self.planner_state.current_day)
 
         self.notify("Shift cleared", severity="information")
         self.post_message(self.ShiftUpdated())
@@ -1,35 +1,48 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING
 
+from textual.message import Message
 from textual.widgets import (
     ListItem,
     ListView,
     Static,
 )
 
+from work_cal.calendar.rotation import shift_from_template
 from work_cal.tui.errors import PlannerStateNotSetError
+from work_cal.tui.template_pick import TemplatePickScreen
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from datetime import date
 
     from textual import events
 
+    from work_cal.models import Shift
     from work_cal.tui.state import PlannerState
 
+MAX_LISTED_VIOLATIONS = 5
+
 
 class DayListItem(ListItem):
 
-    def __init__(self, representation: Static, day: date) -> None:
-        super().__init__(representation)
+    def __init__(self, label: str, day: date) -> None:
+        self.label: Static = Static(label)
+        super().__init__(self.label)
         self.day: date = day
 
 
 class DayList(ListView):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, *, id: str | None = None) -> None:  # noqa: A002
+        super().__init__(id=id)
         self._planner_state: PlannerState | None = None
         self.day_selected_for_copying: ListItem | None = None
+        self._items: dict[date, DayListItem] = {}  # every row by its day
+        self._labels: dict[date, str] = {}  # what each row shows right now
+        self.selection_anchor: int | None = None  # list index the range selection started at
+        self._selected: set[date] = set()
 
     def set_planner_state(self, state: PlannerState) -> None:
         self._planner_state = state
@@ -42,53 +55,158 @@ class DayList(ListView):
 
         return self._planner_state
 
+    def _describe_day(self, day: date) -> str:
+        day_str = day.strftime("%a %m/%d")
+        if not self.planner_state.is_loaded(day):
+            return f"{day_str} …"  # the month is read once the user moves into it
+
+        day_data = self.planner_state.get_day_state(day)
+        shift_info = f" - {day_data.shift.name}" if day_data.shift is not None else ""
+        return f"{day_str}{shift_info}"
+
     def _populate_list(self) -> None:
-        self.clear()
-        for target_date in self.planner_state.dates:
-            day_data = self.planner_state.get_day_state(target_date)
-            day_str = target_date.strftime("%a %m/%d")
-            shift_info = f" - {day_data.shift.name}" if day_data.shift is not None else ""
-            list_item = DayListItem(Static(f"{day_str}{shift_info}"), target_date)
+        self.day_selected_for_copying = None  # the yanked item goes away with the old list
+        self.clear_selection()
+        dates = self.planner_state.dates
+        if list(self._items) == dates:  # same days, e.g. another worker: only relabel what differs
+            self.refresh_days(dates)
+            return
 
-            self.append(list_item)
+        self.clear()
+        self._labels = {day: self._describe_day(day) for day in dates}
+        self._items = {day: DayListItem(label, day) for day, label in self._labels.items()}
+        self.extend(self._items.values())  # one mount for all rows
 
     def refresh_item(self, day: date) -> None:
-        for item in self.children:
-            if not hasattr(item, "day"):
-                continue
+        self.refresh_days((day,))
 
-            if item.day != day:  # pyrefly: ignore
+    def refresh_days(self, days: Iterable[date]) -> int:
+        """Relabel the rows of ``days``, touching only rows whose text changed; returns how many did."""  # noqa: DOC201
+        changed: dict[date, str] = {}
+        for day in days:
+            if day not in self._items:
                 continue
 
-            day_str = day.strftime("%a %m/%d")
-            day_data = self.planner_state.get_day_state(day)
-            shift_info = f" - {day_data.shift.name}" if day_data.shift else ""
-            item.children[0].update(f"{day_str}{shift_info}")  # pyrefly: ignore
-            break
+            label = self._describe_day(day)
+            if self._labels.get(day) != label:
+                changed[day] = label
 
-    def on_paste_key_pressed(self) -> None:
-        if self.day_selected_for_copying is None:
+        if not changed:
+            return 0
+
+        with self.app.batch_update():  # one repaint for the whole diff
+            for day, label in changed.items():
+                self._items[day].label.update(label)
+        self._labels.update(changed)
+        return len(changed)
+
+    def refresh_all(self) -> int:
+        return self.refresh_days(self._items)
+
+    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+        self._update_selection()
+        if not isinstance(event.item, DayListItem) or self.planner_state.is_loaded(event.item.day):
             return
 
-        current_item = self.highlighted_child
+        self.planner_state.get_day_state(event.item.day)  # loads the whole month
+        self.refresh_days(self.planner_state.month_days(event.item.day))
+
+    def _update_selection(self) -> None:
+        """Mark the days from the anchor to the highlighted day, touching only rows that enter or leave the range."""
+        selected: set[date] = set()
+        if self.selection_anchor is not None and self.index is not None:
+            first, last = sorted((self.selection_anchor, self.index))
+            selected = set(self.planner_state.dates[first : last + 1])
+
+        changed = [self._items[day].remove_class("selected", update=False) for day in self._selected - selected]
+        changed += [self._items[day].add_class("selected", update=False) for day in selected - self._selected]
+        self._selected = selected
+        if changed:  # restyled together, the rows share one stylesheet lookup instead of a full pass each
+            nodes = (node for item in changed for node in item.walk_children(with_self=True))
+            self.app.stylesheet.update_nodes(nodes, animate=True)
+
+    def start_selection(self) -> None:
+        if self.selection_anchor is None and self.index is not None:
+            self.selection_anchor = self.index
+            self._update_selection()
+
+    def clear_selection(self) -> None:
+        self.selection_anchor = None
+        self._update_selection()
+
+    def target_days(self) -> list[date]:
+        """Days a paste, template or clear applies to: the selected range, otherwise the highlighted day."""  # noqa: DOC201
+        if self._selected:
+            return sorted(self._selected)
+        if isinstance(self.highlighted_child, DayListItem):
+            return [self.highlighted_child.day]
+        return []
+
+    def apply_shift(self, days: list[date], shift: Shift | None, done: str) -> None:
+        """Put ``shift`` (None clears) on all ``days`` as one edit, with one refresh and one notification."""
+        if len(days) == 1:
+            self.planner_state.set_shift(days[0], shift, shift.from_template if shift is not None else None)
+        else:
+            self.planner_state.set_shifts(dict.fromkeys(days, shift))
 
-        if current_item is None:
+        self.clear_selection()
+        self.refresh_days(days)
+        self.post_message(self.DaysChanged(days))
+
+        violations = {violation.message: violation for day in days for violation in self.planner_state.check_day(day)}
+        if not violations:
+            self.app.notify(done)
             return
 
-        if self.day_selected_for_copying == current_item:
+        listed = list(violations.values())[:MAX_LISTED_VIOLATIONS]
+        lines = [f"{violation.rule}: {violation.message}" for violation in listed]
+        if len(violations) > MAX_LISTED_VIOLATIONS:
+            lines.append(f"and {len(violations) - MAX_LISTED_VIOLATIONS} more, see work_cal check")
+        self.app.notify("\n".join([done, *lines]), title="Labour rules", severity="warning")
+
+    def on_paste_key_pressed(self) -> None:
+        if not isinstance(self.day_selected_for_copying, DayListItem):
             return
 
-        if not hasattr(self.day_selected_for_copying, "day") or not hasattr(current_item, "day"):
+        source_day = self.day_selected_for_copying.day
+        days = [day for day in self.target_days() if day != source_day]
+        if not days:
             return
 
-        selected_for_copy_date = self.day_selected_for_copying.day  # pyrefly: ignore
-        selected_for_pasting_into_date = current_item.day  # pyrefly: ignore
+        shift = self.planner_state.get_day_state(source_day).shift
+        self.apply_shift(days, shift, "Shift pasted" if len(days) == 1 else f"Shift pasted into {len(days)} days")
+
+    def on_clear_key_pressed(self) -> None:
+        days = self.target_days()
+        if days:
+            self.apply_shift(days, None, "Shift cleared" if len(days) == 1 else f"Cleared {len(days)} days")
+
+    def on_template_key_pressed(self) -> None:
+        days = self.target_days()
+        templates = [
+            template
+            for template in self.planner_state.template_index.templates
+            if template.start_minute_of_day is not None and template.effective_end_minute_of_day is not None
+        ]
+        if days and templates:
+            self.app.push_screen(TemplatePickScreen(templates, len(days)), partial(self.apply_template, days))
+
+    def apply_template(self, days: list[date], template_name: str | None) -> None:
+        template = self.planner_state.get_template_from_name(template_name) if template_name else None
+        if template is None:
+            return
 
-        shift = self.planner_state.get_day_state(selected_for_copy_date).shift
-        self.planner_state.get_day_state(selected_for_pasting_into_date).shift = shift
+        allowed_week_days = template.allowed_week_days
+        allowed = [day for day in days if allowed_week_days is None or day.weekday() in allowed_week_days]
+        if not allowed:
+            self.app.notify(f"{template.name} is not allowed on any of the days", severity="warning")
+            return
 
-        self.refresh_item(selected_for_pasting_into_date)
-        self.app.notify("Shift pasted")
+        skipped = len(days) - len(allowed)
+        done = f"{template.name} on {len(allowed)} days"
+        if skipped:
+            done += f", {skipped} skipped (not allowed that weekday)"
+        self.apply_shift(allowed, shift_from_template(template), done)
 
     def on_yank_key_pressed(self) -> None:
         current_item = self.highlighted_child
@@ -106,15 +224,53 @@ class DayList(ListView):
             self.day_selected_for_copying = current_item
 
     def on_deselect_key_pressed(self) -> None:
+        if self.selection_anchor is not None:  # the range goes first, the yanked day with a second escape
+            self.clear_selection()
+            return
+
         if self.day_selected_for_copying is None:
             return
         self.day_selected_for_copying.remove_class("highlighted")
         self.day_selected_for_copying = None
 
-    def on_key(self, event: events.Key) -> None:
+    def on_key(self, event: events.Key) -> None:  # noqa: C901
         if event.key == "y":
             self.on_yank_key_pressed()
         elif event.key == "p":
             self.on_paste_key_pressed()
+        elif event.key == "x":
+            self.on_clear_key_pressed()
+        elif event.key == "t":
+            self.on_template_key_pressed()
+        elif event.key == "v":
+            if self.selection_anchor is None:
+                self.start_selection()
+            else:
+                self.clear_selection()
+        elif event.key in {"shift+up", "shift+down"}:
+            event.prevent_default()
+            self.start_selection()
+            if event.key == "shift+up":
+                self.action_cursor_up()
+            else:
+                self.action_cursor_down()
         elif event.key == "escape":
             self.on_deselect_key_pressed()
+        elif event.key == "r" and isinstance(self.highlighted_child, DayListItem):
+            self.post_message(self.RotationFillRequested(self.highlighted_child.day))
+
+    class DaysChanged(Message):
+
+        """Shifts of ``days`` were changed from the list, for the other views to catch up."""
+
+        def __init__(self, days: list[date]) -> None:
+            super().__init__()
+            self.days = days
+
+    class RotationFillRequested(Message):
+
+        """Ask the app to fill days with a rotation, starting from ``day``."""
+
+        def __init__(self, day: date) -> None:
+            super().__init__()
+            self.day = day
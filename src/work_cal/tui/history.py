@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import date
+
+    from work_cal.models import Shift
+
+type MonthKey = tuple[int, int]
+type DayEntry = tuple[Shift | None, str | None]  # the shift and the selected template of a day
+type Snapshot = dict[MonthKey, dict[date, DayEntry]]  # never changed once built, later snapshots share its months
+
+
+def _month_key(day: date) -> MonthKey:
+    return day.year, day.month
+
+
+class EditHistory:
+
+    """Undo and redo over the edits of a planner session.
+
+    Every edit adds a snapshot of the edited days as a map from month to day to entry. A new snapshot copies the
+    month map and the maps of the months the edit touched, every other month's map is shared with the snapshot
+    before it. Each snapshot also keeps the days it changed, so stepping back or forth only visits those.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit  # edits that can be undone, the oldest ones are forgotten first
+        self._original: dict[date, DayEntry] = {}  # days before their first edit, for days no snapshot holds yet
+        self._snapshots: list[Snapshot] = [{}]
+        self._changed: list[frozenset[date]] = [frozenset()]  # days each snapshot changed over the one before it
+        self._position = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._position < len(self._snapshots) - 1
+
+    def record(self, before: Mapping[date, DayEntry], after: Mapping[date, DayEntry]) -> None:
+        """Add an edit from ``before`` to ``after`` and drop whatever could be redone; unchanged days are skipped."""
+        changed = {day: entry for day, entry in after.items() if before[day] != entry}
+        if not changed or not self.limit:
+            return
+
+        for day in changed:
+            self._original.setdefault(day, before[day])
+
+        del self._snapshots[self._position + 1 :]
+        del self._changed[self._position + 1 :]
+
+        current = self._snapshots[self._position]
+        snapshot = dict(current)
+        for day, entry in changed.items():
+            key = _month_key(day)
+            month = snapshot.get(key)
+            if month is None:
+                month = snapshot[key] = {}
+            elif month is current.get(key):
+                month = snapshot[key] = dict(month)
+            month[day] = entry
+
+        self._snapshots.append(snapshot)
+        self._changed.append(frozenset(changed))
+        self._position += 1
+
+        if len(self._snapshots) > self.limit + 1:
+            del self._snapshots[0]
+            del self._changed[0]
+            self._position -= 1
+
+    def _entries(self, snapshot: Snapshot, days: frozenset[date]) -> dict[date, DayEntry]:
+        return {day: snapshot.get(_month_key(day), {}).get(day, self._original[day]) for day in days}
+
+    def undo(self) -> dict[date, DayEntry]:
+        """Step back one edit, the entries to put back on the days it changed; empty with nothing to undo."""  # noqa: DOC201
+        if not self.can_undo:
+            return {}
+
+        days = self._changed[self._position]
+        self._position -= 1
+        return self._entries(self._snapshots[self._position], days)
+
+    def redo(self) -> dict[date, DayEntry]:
+        """Step forward one undone edit, the entries it had set; empty with nothing to redo."""  # noqa: DOC201
+        if not self.can_redo:
+            return {}
+
+        self._position += 1
+        return self._entries(self._snapshots[self._position], self._changed[self._position])
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import date  # noqa: TC003 without this pydantic crashes
+from typing import TYPE_CHECKING, Literal
+
+from pydantic import BaseModel, ValidationError
+
+from work_cal.files import append_lines
+from work_cal.models import Shift  # noqa: TC001 without this pydantic crashes
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class JournalRecord(BaseModel):
+    op: Literal["set", "clear"]
+    day: date
+    shift: Shift | None = None
+    selected_template: str | None = None
+
+    @classmethod
+    def for_edit(cls, day: date, shift: Shift | None, selected_template: str | None) -> JournalRecord:
+        if shift is None:
+            return cls(op="clear", day=day)
+
+        return cls(op="set", day=day, shift=shift, selected_template=selected_template)
+
+
+class ShiftJournal:
+
+    """Write-ahead log of planner edits kept next to a dump file.
+
+    Every edit is appended as one JSON line, a batch of edits in one write. A ``durable`` journal fsyncs every append,
+    so even a power cut loses at most the edits being written; otherwise the lines are only handed to the OS, which
+    still keeps them when the planner is killed or crashes. The journal is emptied whenever the dump itself is
+    rewritten.
+    """
+
+    def __init__(self, path: Path, *, durable: bool = True) -> None:
+        self.path = path
+        self.durable = durable
+        self.record_count = 0
+
+    @classmethod
+    def for_dump(cls, dump_path: Path, *, durable: bool = True) -> ShiftJournal:
+        return cls(dump_path.with_name(dump_path.name + JOURNAL_SUFFIX), durable=durable)
+
+    def append(self, record: JournalRecord) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: list[JournalRecord]) -> None:
+        if not records:
+            return
+
+        append_lines(self.path, (record.model_dump_json() for record in records), durable=self.durable)
+        self.record_count += len(records)
+
+    def replay(self) -> Iterator[JournalRecord]:
+        """Yield the journaled records in order, stopping at a torn last line left by a crash."""  # noqa: DOC402
+        if not self.path.is_file():
+            return
+
+        with self.path.open(encoding="utf-8") as stream:
+            for line in stream:
+                try:
+                    record = JournalRecord.model_validate_json(line)
+                except ValidationError:
+                    return
+
+                self.record_count += 1
+                yield record
+
+    def truncate(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.record_count = 0
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING, NamedTuple
+
+from textual.containers import Horizontal, Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Button, Input, Select, Static
+
+if TYPE_CHECKING:
+    from textual import events
+    from textual.app import ComposeResult
+
+    from work_cal.config import Rotation
+
+
+class RotationRequest(NamedTuple):
+    rotation: str
+    start: date
+    end: date
+
+
+class RotationFillScreen(ModalScreen[RotationRequest | None]):
+
+    """Ask which rotation to lay over which days; dismissed with None when cancelled."""
+
+    DEFAULT_CSS = """
+    RotationFillScreen {
+        align: center middle;
+    }
+
+    RotationFillScreen > Vertical {
+        width: 60;
+        height: auto;
+        border: solid $primary;
+        padding: 1 2;
+        background: $surface;
+    }
+    """
+
+    def __init__(self, rotations: list[Rotation], start: date, end: date, first_day: date, last_day: date) -> None:
+        super().__init__()
+        self.rotations = rotations
+        self.start = start
+        self.end = end
+        self.first_day = first_day
+        self.last_day = last_day
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Static("Fill with rotation:")
+            yield Select(
+                [(f"{rotation.name} ({len(rotation.pattern)} days)", rotation.name) for rotation in self.rotations],
+                id="rotation-select",
+                allow_blank=False,
+            )
+            yield Static("From (YYYY-MM-DD, first day of the rotation):")
+            yield Input(self.start.isoformat(), id="rotation-start")
+            yield Static("Until (YYYY-MM-DD):")
+            yield Input(self.end.isoformat(), id="rotation-end")
+            with Horizontal():
+                yield Button("Fill", id="rotation-fill", variant="primary")
+                yield Button("Cancel", id="rotation-cancel")
+
+    def _read_request(self) -> RotationRequest | None:
+        try:
+            start = date.fromisoformat(self.query_one("#rotation-start", Input).value.strip())
+            end = date.fromisoformat(self.query_one("#rotation-end", Input).value.strip())
+        except ValueError:
+            self.notify("Dates must be YYYY-MM-DD", severity="warning")
+            return None
+
+        if not self.first_day <= start <= end <= self.last_day:
+            self.notify(f"Pick days between {self.first_day} and {self.last_day}", severity="warning")
+            return None
+
+        rotation = self.query_one("#rotation-select", Select).value
+        if not isinstance(rotation, str):
+            return None
+
+        return RotationRequest(rotation, start, end)
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "rotation-cancel":
+            self.dismiss(None)
+        elif event.button.id == "rotation-fill":
+            request = self._read_request()
+            if request is not None:
+                self.dismiss(request)
+
+    def on_key(self, event: events.Key) -> None:
+        if event.key == "escape":
+            self.dismiss(None)
@@ -1,25 +1,52 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+import tomllib
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, ClassVar
 
+from pydantic import ValidationError
 from textual.app import App, ComposeResult
+from textual.binding import Binding, BindingType
 from textual.containers import Horizontal, Vertical
 from textual.widgets import (
+    ContentSwitcher,
     Footer,
     ListView,
+    Select,
+    Static,
 )
+from textual.worker import Worker, WorkerState
 
-from work_cal.config import get_config
+from work_cal.base import DEFAULT_CONFIG_POLL_SECONDS
+from work_cal.calendar.rotation import expand_rotation
+from work_cal.config import ConfigSingleton, get_config
+from work_cal.tui.calendar_grid import CalendarGrid
 from work_cal.tui.day_editor import DayEditor
 from work_cal.tui.day_list import DayList, DayListItem
-from work_cal.tui.state import PlannerState
+from work_cal.tui.rotation_fill import RotationFillScreen, RotationRequest
+from work_cal.tui.state import PlannerState, ShardSnapshot
 from work_cal.tui.themes import themes
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from datetime import date
 
+    from textual.timer import Timer
+
+type PendingSnapshots = list[tuple[PlannerState, ShardSnapshot]]
+
+AUTOSAVE_MAX_DELAYS = 5  # under constant editing, save at the latest after this many autosave delays
+
+
+class ShiftPlannerApp(App):  # noqa: PLR0904
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("g", "toggle_view", "Day list / year grid"),
+        Binding("ctrl+z", "undo", "Undo"),
+        Binding("ctrl+y", "redo", "Redo"),
+    ]
 
-class ShiftPlannerApp(App):
     CSS = """
     Screen {
         layout: horizontal;
@@ -52,22 +79,65 @@ class ShiftPlannerApp(App):
     .highlighted {
         background: yellow;
     }
+
+    .selected {
+        background: $accent 40%;
+    }
+
+    #status-bar {
+        dock: bottom;
+        height: 1;
+    }
+
+    #status-bar Footer {
+        dock: none;
+        width: 1fr;
+    }
+
+    #save-status {
+        width: auto;
+        padding: 0 1;
+        background: $footer-background;
+        color: $footer-foreground;
+    }
     """
 
-    def __init__(self, dates: list[date]) -> None:
+    def __init__(self, dates: list[date], worker_name: str | None = None) -> None:
         super().__init__()
         self.config = get_config()
-        self.planner_state = PlannerState(self.config, dates)
+        self.planner_state = self._new_planner_state(dates, worker_name)
+        # one state per roster member visited, switching back keeps unsaved edits and loaded months
+        self.planner_states: dict[str, PlannerState] = {self.planner_state.worker_name: self.planner_state}
+        self._autosave_timer: Timer | None = None
+        self._first_unsaved_edit: float | None = None
+        self._saving: PendingSnapshots | None = None  # snapshots the autosave worker is writing
+        self._save_again = False  # edits came in while it was
+        self.save_status = Static("", id="save-status")  # kept at hand, modal screens hide it from query_one
+
+    def _new_planner_state(self, dates: list[date], worker_name: str | None) -> PlannerState:
+        deferred_writes = self.config.autosave_delay_seconds > 0
+        return PlannerState(self.config, dates, worker_name=worker_name, deferred_writes=deferred_writes)
 
-    def compose(self) -> ComposeResult:  # noqa: PLR6301
+    def compose(self) -> ComposeResult:
         with Horizontal():
             with Vertical(classes="left-panel"):
                 yield DayEditor()
 
             with Vertical(classes="right-panel"):
-                yield DayList()
+                if len(self.config.team) > 1:
+                    yield Select(
+                        [(worker_name, worker_name) for worker_name in self.config.team],
+                        value=self.planner_state.worker_name,
+                        id="worker-select",
+                        allow_blank=False,
+                    )
+                with ContentSwitcher(initial="day-list"):
+                    yield DayList(id="day-list")
+                    yield CalendarGrid(id="calendar-grid")
 
-        yield Footer()
+        with Horizontal(id="status-bar"):
+            yield Footer()
+            yield self.save_status
 
     def on_mount(self) -> None:
         day_editor = self.query_one(DayEditor)
@@ -75,18 +145,225 @@ class ShiftPlannerApp(App):
 
         day_editor.set_planner_state(self.planner_state)
         day_list.set_planner_state(self.planner_state)
+        self.query_one(CalendarGrid).set_planner_state(self.planner_state)
 
         for theme in themes:
             self.register_theme(theme)
 
         self.theme = "ayu_dark"
 
+        self.set_interval(DEFAULT_CONFIG_POLL_SECONDS, self._reload_config_if_changed)
+
+    def _reload_config_if_changed(self) -> None:
+        try:
+            config = ConfigSingleton().reload_if_changed()
+        except (OSError, tomllib.TOMLDecodeError, ValidationError) as e:
+            self.notify(f"Config not reloaded: {e}", severity="error")
+            return
+
+        if config is None:
+            return
+
+        self.config = config
+        for planner_state in self.planner_states.values():
+            planner_state.template_index = config.template_index
+            planner_state.rules = config.rules
+        self.query_one(DayEditor).refresh_templates()
+        self.notify("Config reloaded")
+
+    def on_select_changed(self, event: Select.Changed) -> None:
+        if event.control.id == "worker-select" and isinstance(event.value, str):
+            self.switch_worker(event.value)
+
+    def switch_worker(self, worker_name: str) -> None:
+        """Show another roster member's days, keeping the current day and the other members' unsaved edits."""
+        if worker_name == self.planner_state.worker_name:
+            return
+
+        planner_state = self.planner_states.get(worker_name)
+        if planner_state is None:
+            planner_state = self._new_planner_state(self.planner_state.dates, worker_name)
+            self.planner_states[worker_name] = planner_state
+        planner_state.current_day = self.planner_state.current_day
+        planner_state.attempt_shift_dump_load()
+
+        self.planner_state = planner_state
+        self.query_one(DayEditor).set_planner_state(planner_state)
+        self.query_one(DayList).set_planner_state(planner_state)
+        self.query_one(CalendarGrid).set_planner_state(planner_state)
+        self.sub_title = worker_name
+
+    def dump_shift_states(self) -> None:
+        if self._saving is not None:  # an autosave still writing, or cut off by the exit: write its months again
+            for planner_state, snapshot in self._saving:
+                planner_state.restore_snapshot(snapshot)
+            self._saving = None
+
+        for planner_state in self.planner_states.values():
+            planner_state.dump_shift_state()
+
+    def _set_save_status(self, status: str) -> None:
+        self.save_status.update(status)
+
+    def on_unmount(self) -> None:
+        if self._autosave_timer is not None:  # the exit writes whatever is left
+            self._autosave_timer.stop()
+
+    def schedule_autosave(self) -> None:
+        """Save once edits pause for ``autosave_delay_seconds``, restarting the wait with every edit."""
+        delay = self.config.autosave_delay_seconds
+        if not delay:
+            return
+
+        now = time.monotonic()
+        if self._first_unsaved_edit is None:
+            self._first_unsaved_edit = now
+        if self._autosave_timer is not None:
+            self._autosave_timer.stop()
+        wait = min(delay, self._first_unsaved_edit + delay * AUTOSAVE_MAX_DELAYS - now)
+        self._autosave_timer = self.set_timer(max(wait, 0), self.autosave)
+        if self._saving is None:
+            self._set_save_status("Unsaved changes")
+
+    def autosave(self) -> None:
+        """Snapshot the edited months here and write them in a worker thread, so the event loop never waits on disk."""
+        self._autosave_timer = None
+        if self._saving is not None:
+            self._save_again = True
+            return
+
+        self._first_unsaved_edit = None
+        snapshots = [
+            (planner_state, snapshot)
+            for planner_state in self.planner_states.values()
+            for snapshot in planner_state.take_snapshots()
+        ]
+        if not snapshots:
+            return
+
+        self._saving = snapshots
+        self._set_save_status("Saving…")
+        self.run_worker(
+            partial(self._write_snapshots, snapshots),
+            name="autosave",
+            group="autosave",
+            thread=True,
+            exit_on_error=False,
+        )
+
+    @staticmethod
+    def _write_snapshots(snapshots: PendingSnapshots) -> None:
+        by_state: dict[PlannerState, list[ShardSnapshot]] = {}
+        for planner_state, snapshot in snapshots:
+            by_state.setdefault(planner_state, []).append(snapshot)
+        for planner_state, state_snapshots in by_state.items():
+            planner_state.flush_snapshots(state_snapshots)  # one catalog write per dump directory
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        if event.worker.group != "autosave" or not event.worker.is_finished or self._saving is None:
+            return
+
+        snapshots, self._saving = self._saving, None
+        if event.state == WorkerState.SUCCESS:
+            for planner_state, snapshot in snapshots:
+                planner_state.finish_snapshot(snapshot)
+            self._set_save_status(f"Saved {datetime.now().astimezone():%H:%M:%S}")
+        else:
+            for planner_state, snapshot in snapshots:
+                planner_state.restore_snapshot(snapshot)
+            self._set_save_status("Save failed")
+            self.notify(f"Autosave failed, retrying with the next edit: {event.worker.error}", severity="error")
+
+        if self._save_again:
+            self._save_again = False
+            self.autosave()
+
+    def action_toggle_view(self) -> None:
+        switcher = self.query_one(ContentSwitcher)
+        if switcher.current == "day-list":
+            grid = self.query_one(CalendarGrid)
+            grid.refresh_all()  # the list may have pasted into days the grid has cached
+            grid.move_cursor_to(self.planner_state.current_day)
+            switcher.current = "calendar-grid"
+            grid.focus()
+        else:
+            day_list = self.query_one(DayList)
+            switcher.current = "day-list"
+            day_list.focus()
+
+    def select_day(self, day: date) -> None:
+        self.planner_state.current_day = day
+        self.query_one(DayEditor).reload_day()
+
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         if isinstance(event.item, DayListItem):
-            day_editor = self.query_one(DayEditor)
-            self.planner_state.current_day = event.item.day
-            day_editor.reload_day()
+            self.select_day(event.item.day)
+
+    def on_calendar_grid_day_selected(self, event: CalendarGrid.DaySelected) -> None:
+        self.select_day(event.day)
 
     def on_day_editor_shift_updated(self, _event: DayEditor.ShiftUpdated) -> None:
-        day_list = self.query_one(DayList)
-        day_list.refresh_item(self.planner_state.current_day)
+        self.refresh_days((self.planner_state.current_day,))
+        self.report_violations(self.planner_state.current_day)
+        self.schedule_autosave()
+
+    def on_day_list_days_changed(self, event: DayList.DaysChanged) -> None:
+        self.query_one(CalendarGrid).refresh_days(event.days)
+        if self.planner_state.current_day in event.days:
+            self.query_one(DayEditor).reload_day()
+        self.schedule_autosave()
+
+    def action_undo(self) -> None:
+        self._show_history_step(self.planner_state.undo(), "Undid", "Nothing to undo")
+
+    def action_redo(self) -> None:
+        self._show_history_step(self.planner_state.redo(), "Redid", "Nothing to redo")
+
+    def _show_history_step(self, days: list[date], done: str, nothing: str) -> None:
+        if not days:
+            self.notify(nothing, severity="warning")
+            return
+
+        self.refresh_days(days)
+        if self.planner_state.current_day in days:
+            self.query_one(DayEditor).reload_day()
+        self.schedule_autosave()
+        edited = f"{days[0]:%a %m/%d}" if len(days) == 1 else f"{len(days)} days"
+        self.notify(f"{done} the edit of {edited}")
+
+    def refresh_days(self, days: Iterable[date]) -> None:
+        days = list(days)
+        self.query_one(DayList).refresh_days(days)
+        self.query_one(CalendarGrid).refresh_days(days)
+
+    def report_violations(self, day: date) -> None:
+        violations = self.planner_state.check_day(day)
+        if violations:
+            message = "\n".join(f"{violation.rule}: {violation.message}" for violation in violations)
+            self.notify(message, title="Labour rules", severity="warning")
+
+    def on_day_list_rotation_fill_requested(self, event: DayList.RotationFillRequested) -> None:
+        if not self.config.rotations:
+            self.notify("No rotations configured, add [[rotations]] to the config", severity="warning")
+            return
+
+        dates = self.planner_state.dates
+        screen = RotationFillScreen(self.config.rotations, event.day, dates[-1], dates[0], dates[-1])
+        self.push_screen(screen, self.fill_rotation)
+
+    def fill_rotation(self, request: RotationRequest | None) -> None:
+        if request is None:
+            return
+
+        rotation = self.config.get_rotation(request.rotation)
+        if rotation is None:  # removed from the config while the dialog was open
+            return
+
+        fill = expand_rotation(rotation, self.config.template_index, request.start, request.end)
+        self.planner_state.set_shifts(fill.shifts)
+        self.refresh_days(fill.shifts)
+        self.query_one(DayEditor).reload_day()
+        self.schedule_autosave()
+
+        skipped = f", {len(fill.skipped)} days skipped (template not allowed that weekday)" if fill.skipped else ""
+        self.notify(f"Filled {len(fill.shifts)} days with {rotation.name}{skipped}")
@@ -1,17 +1,56 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
-from work_cal.config import get_config
+import calendar
+import threading
+from contextlib import closing
+from datetime import date
+from typing import TYPE_CHECKING, NamedTuple
+
+from work_cal.calendar.labour_rules import ShiftIntervals, bounds_to_minutes
+from work_cal.calendar.timezones import (
+    ONE_DAY,
+    AmbiguousLocalTimeError,
+    NonExistentLocalTimeError,
+    TimezoneResolver,
+)
 from work_cal.models import ShiftStateDump
+from work_cal.storage.catalog import load_cataloged_dump, make_catalog_entry, record_entries
+from work_cal.storage.dump_files import DUMP_SUFFIXES, JSON_DUMP_SUFFIX, save_dump
+from work_cal.storage.sqlite_store import SqliteShiftStore
+from work_cal.tui.history import EditHistory
+from work_cal.tui.journal import JournalRecord, ShiftJournal
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
-    from datetime import date
     from pathlib import Path
 
+    from work_cal.calendar.labour_rules import Violation
     from work_cal.config import ShiftType, WorkCalConfig
     from work_cal.models import Shift
+    from work_cal.tui.history import DayEntry
+
+type MonthKey = tuple[int, int]
+
+
+def determine_dump_filename(dates: Iterable[date], suffix: str = JSON_DUMP_SUFFIX) -> str:
+    year_to_month_map: dict[int, set[int]] = {}
+    for day in dates:
+        if day.year not in year_to_month_map:
+            year_to_month_map[day.year] = set()
+
+        year_to_month_map[day.year].add(day.month)
+
+    filename: str = "shift_dump_"
+
+    for year, months in year_to_month_map.items():
+        months_str = "_".join(str(month).rjust(2, "0") for month in sorted(months))
+        filename += f"{year}_{months_str}_"
+
+    return filename.strip("_") + suffix
+
+
+def month_key(day: date) -> MonthKey:
+    return day.year, day.month
 
 
 class DayState:  # noqa: B903
@@ -20,82 +59,328 @@ class DayState:  # noqa: B903
         self.shift: Shift | None = shift
 
 
-class PlannerState:
+class MonthShard:
 
-    def __init__(self, config: WorkCalConfig, dates: list[date], dump_location: Path | None = None) -> None:
+    """Every day of one month, backed by that month's dump file and journal."""
 
-        if dump_location is None:
-            dump_location = get_config().month_dump_location
-        self.dump_location: Path = dump_location
-        self.dump_location.mkdir(exist_ok=True)
+    def __init__(self, year: int, month: int, dump_path: Path, *, durable_journal: bool = True) -> None:
+        self.year = year
+        self.month = month
+        self.dump_path = dump_path
+        self.journal = ShiftJournal.for_dump(dump_path, durable=durable_journal)
+        days_in_month = calendar.monthrange(year, month)[1]
+        self.days: dict[date, DayState] = {
+            date(year, month, day): DayState(None, None) for day in range(1, days_in_month + 1)
+        }
+        self.loaded = False
+        self.dirty = False
+        self.version = 0  # bumped by every edit
+        self.written_version = 0  # the version that is on disk
 
-        self.templates = config.shift_types
-        self.dates = dates
-        self.date_to_shift: dict[date, DayState] = {dt: DayState(None, None) for dt in self.dates}
-        self.current_day = dates[0]
+    @property
+    def first_day(self) -> date:
+        return date(self.year, self.month, 1)
+
+    @property
+    def last_day(self) -> date:
+        return date(self.year, self.month, len(self.days))
+
+    def apply_shift_map(self, shift_map: dict[date, Shift]) -> None:
+        for day, shift in shift_map.items():
+            if day not in self.days:
+                continue
+
+            self.days[day].shift = shift
+            self.days[day].selected_template = shift.from_template
+
+    def shift_map(self) -> dict[date, Shift]:
+        return {day: day_state.shift for day, day_state in self.days.items() if day_state.shift is not None}
+
+    def unload(self) -> bool:
+        """Forget the days, they are read again when next used; False while edits are not fully in the dump yet."""  # noqa: DOC201
+        if not self.loaded or self.dirty or self.written_version != self.version or self.journal.record_count:
+            return False
 
-    def attempt_shift_dump_load(self, filename: str | None = None) -> None:
-        if filename is None:
-            filename = self._determine_dump_filename(self.date_to_shift)
+        for day_state in self.days.values():
+            day_state.shift = None
+            day_state.selected_template = None
+        self.loaded = False
+        return True
 
-        dump_path = self.dump_location / filename
 
-        if not dump_path.exists() or not dump_path.is_file():
+class ShardSnapshot(NamedTuple):
+    shard: MonthShard
+    shift_map: dict[date, Shift]
+    version: int
+    journal_records: int  # journal length when the snapshot was taken
+    dirty_days: frozenset[date]
+
+
+class PlannerState:
+
+    """Planner state for any span of days, split into month shards.
+
+    A shard is read from its per-month dump the first time one of its days is asked for, and only shards with edits
+    are written back, so a full year view costs about as much as the months actually visited.
+    """
+
+    def __init__(
+        self,
+        config: WorkCalConfig,
+        dates: list[date],
+        dump_location: Path | None = None,
+        worker_name: str | None = None,
+        *,
+        deferred_writes: bool = False,
+    ) -> None:
+        self.worker_name = worker_name if worker_name is not None else config.worker_name
+        if dump_location is None:
+            dump_location = config.dump_location_for(self.worker_name)
+        self.dump_location: Path = dump_location
+        self.dump_location.mkdir(parents=True, exist_ok=True)
+
+        self.template_index = config.template_index
+        self.dump_suffix = DUMP_SUFFIXES[config.dump_format]
+        self.sqlite_path = config.sqlite_path
+        self.store = SqliteShiftStore(config.sqlite_path) if config.storage_backend == "sqlite" else None
+        self.journal_compact_every = config.journal_compact_every
+        # edits are only journaled, rewriting the dumps is left to flush_snapshots, e.g. on a background thread; the
+        # journal is not fsynced then, the flushed dumps are
+        self.deferred_writes = deferred_writes
+        self.dirty_days: set[date] = set()  # edited since their month was last written
+        self.write_lock = threading.Lock()  # one dump or catalog write at a time, in whatever thread
+        self.dates = dates
+        self.current_day = dates[0]
+        self.shards: dict[MonthKey, MonthShard] = {}
+        self.dates_by_month: dict[MonthKey, list[date]] = {}
+        for day in dates:
+            key = month_key(day)
+            if key not in self.shards:
+                dump_path = self.dump_location / determine_dump_filename((day,), self.dump_suffix)
+                self.shards[key] = MonthShard(day.year, day.month, dump_path, durable_journal=not deferred_writes)
+            self.dates_by_month.setdefault(key, []).append(day)
+
+        self.rules = config.rules
+        self.history = EditHistory(config.undo_limit)
+        self.intervals = ShiftIntervals()  # shifts of the loaded months, for the labour rule checks
+        self.resolver = TimezoneResolver(
+            config.timezone,
+            min(shard.first_day for shard in self.shards.values()),
+            max(shard.last_day for shard in self.shards.values()) + ONE_DAY,
+            config.dst_gap_policy,
+            config.dst_fold_policy,
+        )
+
+    def attempt_shift_dump_load(self) -> None:
+        """Load the month of the current day up front, the other months load when they are first used."""
+        self.load_shard(self.shards[month_key(self.current_day)])
+
+    def load_shard(self, shard: MonthShard) -> None:
+        if shard.loaded:
             return
 
-        json_data = dump_path.read_text(encoding="utf-8")
+        shard.loaded = True
+        if self.store is not None:
+            shard.apply_shift_map(self.store.load_range(self.worker_name, shard.first_day, shard.last_day))
+        elif shard.dump_path.is_file():
+            shard.apply_shift_map(load_cataloged_dump(shard.dump_path).shift_map)
 
-        dump_data: ShiftStateDump = ShiftStateDump.model_validate_json(json_data)
+        # edits made after the last snapshot, e.g. before a crash
+        for record in shard.journal.replay():
+            if record.day not in shard.days:
+                continue
 
-        for date in dump_data.shift_map:
-            if date not in self.date_to_shift:
-                return  # if some date from dump is not in date range we skip the whole dump
+            day_state = shard.days[record.day]
+            day_state.shift = record.shift
+            day_state.selected_template = record.selected_template
 
-        for date, shift in dump_data.shift_map.items():
-            self.date_to_shift[date].shift = shift
-            self.date_to_shift[date].selected_template = shift.from_template
+        for day, shift in shard.shift_map().items():
+            self._index_shift(day, shift)
 
-    def get_day_state(self, day: date) -> DayState:
-        return self.date_to_shift[day]
+        if not shard.journal.path.exists():
+            return
 
-    def get_current_day_state(self) -> DayState:
-        return self.date_to_shift[self.current_day]
+        # fold the replayed edits (and any torn last line) into a fresh snapshot
+        if self.deferred_writes:
+            self._mark_dirty(shard, shard.days)
+        else:
+            self.dump_shards([shard])
 
-    def get_template_from_name(self, template_name: str) -> ShiftType | None:
-        for template in self.templates:
-            if template.name == template_name:
-                return template
+    def _index_shift(self, day: date, shift: Shift | None) -> None:
+        if shift is None:
+            self.intervals.remove(day)
+            return
 
-        return None
+        try:
+            self.intervals.set(day, *bounds_to_minutes(self.resolver.resolve_shift(day, shift)))
+        except (NonExistentLocalTimeError, AmbiguousLocalTimeError):
+            self.intervals.remove(day)  # the export reports these, the rule checks just skip the shift
 
-    @staticmethod
-    def _determine_dump_filename(dates: Iterable[date]) -> str:
-        year_to_month_map: dict[int, set[int]] = {}
-        for date in dates:
-            if date.year not in year_to_month_map:
-                year_to_month_map[date.year] = set()
+    def check_day(self, day: date) -> list[Violation]:
+        """Labour rule violations involving ``day``, from the months loaded so far."""  # noqa: DOC201
+        return self.intervals.check_day(day, self.rules)
 
-            year_to_month_map[date.year].add(date.month)
+    def is_loaded(self, day: date) -> bool:
+        return self.shards[month_key(day)].loaded
 
-        filename: str = "shift_dump_"
+    def month_days(self, day: date) -> list[date]:
+        """Days of ``day``'s month that are part of this planner session."""  # noqa: DOC201
+        return self.dates_by_month[month_key(day)]
 
-        for year, months in year_to_month_map.items():
-            months_str = "_".join(str(month).rjust(2, "0") for month in sorted(months))
-            filename += f"{year}_{months_str}_"
+    def get_day_state(self, day: date) -> DayState:
+        shard = self.shards[month_key(day)]
+        self.load_shard(shard)
+        return shard.days[day]
+
+    def set_shift(self, day: date, shift: Shift | None, selected_template: str | None = None) -> None:
+        """Apply an edit and append it to the month's journal, compacting it into the dump every so often."""
+        day_state = self.get_day_state(day)
+        self.history.record({day: (day_state.shift, day_state.selected_template)}, {day: (shift, selected_template)})
+        day_state.shift = shift
+        day_state.selected_template = selected_template
+
+        self._index_shift(day, shift)
+
+        shard = self.shards[month_key(day)]
+        self._mark_dirty(shard, (day,))
+        shard.journal.append(JournalRecord.for_edit(day, shift, selected_template))
+
+        if not self.deferred_writes and shard.journal.record_count >= self.journal_compact_every:
+            self.dump_shards([shard])
+
+    def set_shifts(self, shift_map: dict[date, Shift | None]) -> None:
+        """Apply many edits at once, None clears a day; every touched month is written once instead of journaled.
+
+        With deferred writes the edits are journaled instead, one append per month, and written by the next flush. The
+        whole batch is one step for ``undo``.
+        """
+        entries = {day: (shift, shift.from_template if shift is not None else None) for day, shift in shift_map.items()}
+        self.history.record({day: self._entry(day) for day in entries}, entries)
+        self._apply_entries(entries)
+
+    def undo(self) -> list[date]:
+        """Revert the last edit that is not undone yet, returning the days it changed; none with nothing to undo."""  # noqa: DOC201
+        entries = self.history.undo()
+        self._apply_entries(entries)
+        return list(entries)
+
+    def redo(self) -> list[date]:
+        """Apply the last undone edit again, returning the days it changed; none with nothing to redo."""  # noqa: DOC201
+        entries = self.history.redo()
+        self._apply_entries(entries)
+        return list(entries)
+
+    def _entry(self, day: date) -> DayEntry:
+        day_state = self.get_day_state(day)
+        return day_state.shift, day_state.selected_template
+
+    def _apply_entries(self, entries: dict[date, DayEntry]) -> None:
+        touched: dict[MonthKey, MonthShard] = {}
+        records: dict[MonthKey, list[JournalRecord]] = {}
+        for day, (shift, selected_template) in entries.items():
+            day_state = self.get_day_state(day)
+            day_state.shift = shift
+            day_state.selected_template = selected_template
+            self._index_shift(day, shift)
+            shard = touched[month_key(day)] = self.shards[month_key(day)]
+            self._mark_dirty(shard, (day,))
+            if self.deferred_writes:
+                records.setdefault(month_key(day), []).append(JournalRecord.for_edit(day, shift, selected_template))
+
+        if not self.deferred_writes:
+            self.dump_shards(list(touched.values()))
+            return
 
-        return filename.strip("_") + ".json"
+        for key, shard in touched.items():
+            shard.journal.append_many(records[key])
 
-    def dump_shift_state(self, filename: str | None = None) -> None:
-        if filename is None:
-            filename = self._determine_dump_filename(self.date_to_shift)
+    def _mark_dirty(self, shard: MonthShard, days: Iterable[date]) -> None:
+        shard.dirty = True
+        shard.version += 1
+        self.dirty_days.update(days)
 
-        date_to_shift: dict[date, Shift] = {}
-        for day, day_state in self.date_to_shift.items():
-            if day_state.shift is None:
-                continue
+    def clear_shift(self, day: date) -> None:
+        self.set_shift(day, None)
 
-            date_to_shift[day] = day_state.shift
+    def get_current_day_state(self) -> DayState:
+        return self.get_day_state(self.current_day)
 
-        json_data = ShiftStateDump(shift_map=date_to_shift).model_dump_json()
+    def get_template_from_name(self, template_name: str) -> ShiftType | None:
+        return self.template_index.get(template_name)
+
+    def dump_shards(self, shards: list[MonthShard]) -> None:
+        with self.write_lock:
+            if self.store is not None:
+                for shard in shards:
+                    self.store.save_days(self.worker_name, shard.days, shard.shift_map())
+            else:
+                self._write_dumps([(shard, shard.shift_map()) for shard in shards])
+            for shard in shards:
+                shard.written_version = shard.version
+
+        for shard in shards:
+            shard.journal.truncate()  # everything journaled is in the snapshot now
+            self._mark_clean(shard)
+
+    def _write_dumps(self, shift_maps: list[tuple[MonthShard, dict[date, Shift]]]) -> None:
+        """Write the dumps of several months, the catalog only once after all of them."""
+        entries = []
+        for shard, shift_map in shift_maps:
+            save_dump(shard.dump_path, ShiftStateDump(shift_map=shift_map))
+            entries.append(make_catalog_entry(shard.dump_path, shift_map, self.worker_name))
+        record_entries(self.dump_location, entries)
+
+    def _mark_clean(self, shard: MonthShard) -> None:
+        shard.dirty = False
+        self.dirty_days.difference_update(shard.days)
+
+    def take_snapshots(self) -> list[ShardSnapshot]:
+        """Copy the edited months for ``flush_snapshots`` and count them as clean; call from the thread editing."""  # noqa: DOC201
+        snapshots = [
+            ShardSnapshot(
+                shard,
+                shard.shift_map(),
+                shard.version,
+                shard.journal.record_count,
+                frozenset(self.dirty_days.intersection(shard.days)),
+            )
+            for shard in self.shards.values()
+            if shard.dirty
+        ]
+        for snapshot in snapshots:
+            self._mark_clean(snapshot.shard)
+        return snapshots
+
+    def flush_snapshots(self, snapshots: list[ShardSnapshot]) -> None:
+        """Write snapshots to disk atomically, safe to call off the thread editing the state.
+
+        A snapshot older than what is already on disk, e.g. from a flush overtaken by ``dump_shift_state``, is dropped.
+        """
+        with self.write_lock:
+            pending = [snapshot for snapshot in snapshots if snapshot.version > snapshot.shard.written_version]
+            if not pending:
+                return
+
+            if self.store is not None:  # sqlite connections stay in the thread that opened them
+                with closing(SqliteShiftStore(self.sqlite_path)) as store:
+                    for snapshot in pending:
+                        store.save_days(self.worker_name, snapshot.shard.days, snapshot.shift_map)
+            else:
+                self._write_dumps([(snapshot.shard, snapshot.shift_map) for snapshot in pending])
+            for snapshot in pending:
+                snapshot.shard.written_version = snapshot.version
 
-        (self.dump_location / filename).write_text(json_data, encoding="utf-8")
+    @staticmethod
+    def finish_snapshot(snapshot: ShardSnapshot) -> None:
+        """Empty the journal once a flushed snapshot covers all of it; call from the thread editing."""
+        if snapshot.shard.journal.record_count == snapshot.journal_records:
+            snapshot.shard.journal.truncate()
+        # otherwise edits came in during the write: the journal stays, replaying its older records is harmless
+
+    def restore_snapshot(self, snapshot: ShardSnapshot) -> None:
+        """Count a snapshot that failed to write as edited again, so the next flush retries it."""
+        self._mark_dirty(snapshot.shard, snapshot.dirty_days)
+
+    def dump_shift_state(self) -> None:
+        """Write back every month that was edited since it was loaded or last written."""
+        self.dump_shards([shard for shard in self.shards.values() if shard.dirty])
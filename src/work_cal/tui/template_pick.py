@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from textual.containers import Horizontal, Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Button, Select, Static
+
+if TYPE_CHECKING:
+    from textual import events
+    from textual.app import ComposeResult
+
+    from work_cal.config import ShiftType
+
+
+class TemplatePickScreen(ModalScreen[str | None]):
+
+    """Ask which shift template to put on the selected days; dismissed with the template name, or None."""
+
+    DEFAULT_CSS = """
+    TemplatePickScreen {
+        align: center middle;
+    }
+
+    TemplatePickScreen > Vertical {
+        width: 60;
+        height: auto;
+        border: solid $primary;
+        padding: 1 2;
+        background: $surface;
+    }
+    """
+
+    def __init__(self, templates: list[ShiftType], day_count: int) -> None:
+        super().__init__()
+        self.templates = templates
+        self.day_count = day_count
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Static(f"Template for {self.day_count} days:")
+            yield Select(
+                [(template.name, template.name) for template in self.templates],
+                id="template-pick-select",
+                allow_blank=False,
+            )
+            with Horizontal():
+                yield Button("Apply", id="template-pick-apply", variant="primary")
+                yield Button("Cancel", id="template-pick-cancel")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "template-pick-cancel":
+            self.dismiss(None)
+        elif event.button.id == "template-pick-apply":
+            template = self.query_one("#template-pick-select", Select).value
+            self.dismiss(template if isinstance(template, str) else None)
+
+    def on_key(self, event: events.Key) -> None:
+        if event.key == "escape":
+            self.dismiss(None)
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from work_cal.models import Shift
+from work_cal.storage.binary_dump import (
+    HEADER,
+    RECORD,
+    BinaryDump,
+    BinaryDumpError,
+    encode_shift_map,
+    read_binary_dump,
+    write_binary_dump,
+)
+
+START = date(2026, 1, 1)
+
+
+def make_shift(name: str, start: tuple[int, int], end: tuple[int, int], template: str | None) -> Shift:
+    return Shift(
+        name=name,
+        start_hour=start[0],
+        start_minute=start[1],
+        end_hour=end[0],
+        end_minute=end[1],
+        from_template=template,
+    )
+
+
+def make_shift_map() -> dict[date, Shift]:
+    # a gap of empty days, an overnight shift, a name outside ASCII and a shift not created from a template
+    return {
+        START: make_shift("Morning", (6, 0), (14, 0), "Morning"),
+        START + timedelta(days=1): make_shift("Night", (22, 30), (6, 30), "Night"),
+        START + timedelta(days=9): make_shift("Zażółć", (9, 15), (13, 45), None),
+        START + timedelta(days=10): make_shift("Morning", (6, 0), (14, 0), "Morning"),
+    }
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "shift_dump_2026_01.wcd"
+    shift_map = make_shift_map()
+    write_binary_dump(path, shift_map)
+
+    assert read_binary_dump(path) == shift_map
+    with BinaryDump(path) as binary_dump:
+        assert binary_dump.get(START + timedelta(days=1)) == shift_map[START + timedelta(days=1)]
+        assert binary_dump.get(START + timedelta(days=5)) is None
+        assert binary_dump.get(START - timedelta(days=1)) is None
+        in_range = dict(binary_dump.iter_range(START + timedelta(days=1), START + timedelta(days=9)))
+        assert list(in_range) == [START + timedelta(days=1), START + timedelta(days=9)]
+
+
+def test_round_trip_empty(tmp_path: Path) -> None:
+    path = tmp_path / "shift_dump_2026_01.wcd"
+    write_binary_dump(path, {})
+
+    assert read_binary_dump(path) == {}
+
+
+@pytest.mark.parametrize(
+    "cut",
+    [
+        0,
+        HEADER.size - 1,
+        HEADER.size,  # no records
+        HEADER.size + RECORD.size * 3,  # in the records
+        HEADER.size + RECORD.size * 11 + 2,  # in the string offsets
+        -1,  # in the last string
+    ],
+)
+def test_truncated_file(tmp_path: Path, cut: int) -> None:
+    path = tmp_path / "shift_dump_2026_01.wcd"
+    path.write_bytes(encode_shift_map(make_shift_map())[:cut])
+
+    with pytest.raises(BinaryDumpError):
+        read_binary_dump(path)
+
+
+def test_string_index_out_of_range(tmp_path: Path) -> None:
+    data = bytearray(encode_shift_map(make_shift_map()))
+    record = RECORD.unpack_from(data, HEADER.size)
+    RECORD.pack_into(data, HEADER.size, *record[:4], 500, record[5])
+    path = tmp_path / "shift_dump_2026_01.wcd"
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(BinaryDumpError):
+        read_binary_dump(path)
+
+
+def test_not_a_binary_dump(tmp_path: Path) -> None:
+    path = tmp_path / "shift_dump_2026_01.wcd"
+    path.write_bytes(b'{"schema_version":1,"shift_map":{}}')
+
+    with pytest.raises(BinaryDumpError):
+        read_binary_dump(path)
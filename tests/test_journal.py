@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from work_cal import files
+from work_cal.models import Shift
+from work_cal.tui.journal import JournalRecord, ShiftJournal
+
+START = date(2026, 1, 1)
+NIGHT = Shift(name="Night", start_hour=22, start_minute=0, end_hour=6, end_minute=0, from_template="Night")
+
+
+def make_records(days: int) -> list[JournalRecord]:
+    # every third day is cleared
+    return [
+        JournalRecord.for_edit(START + timedelta(days=offset), None if offset % 3 == 0 else NIGHT, "Night")
+        for offset in range(days)
+    ]
+
+
+def count_fsyncs(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    monkeypatch.setattr(files.os, "fsync", calls.append)
+    return calls
+
+
+def test_append_many_replays_in_order(tmp_path: Path) -> None:
+    journal = ShiftJournal.for_dump(tmp_path / "shift_dump_2026_1.json")
+    records = make_records(31)
+    journal.append(records[0])
+    journal.append_many(records[1:])
+
+    assert journal.record_count == len(records)
+    assert list(ShiftJournal(journal.path).replay()) == records
+    assert records[0].op == "clear"
+    assert records[0].shift is None
+    assert records[0].selected_template is None
+
+
+@pytest.mark.parametrize(("durable", "fsyncs"), [(True, 1), (False, 0)])
+def test_append_many_is_one_write(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, durable: bool, fsyncs: int) -> None:  # noqa: FBT001
+    calls = count_fsyncs(monkeypatch)
+    journal = ShiftJournal(tmp_path / "journal", durable=durable)
+    journal.append_many(make_records(31))
+    journal.append_many([])
+
+    assert len(calls) == fsyncs
+    assert len(journal.path.read_text(encoding="utf-8").splitlines()) == 31  # noqa: PLR2004